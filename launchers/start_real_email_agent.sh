@@ -0,0 +1,13 @@
+#!/usr/bin/env bash
+# Real Email Agent under gunicorn with uvicorn workers, one Python process per core.
+#
+# The app is built by a factory in each worker (no --preload), so SMTP
+# connection pools and HTTP sessions are per-process and never shared across fork.
+set -euo pipefail
+
+cd "$(dirname "$0")/.."
+
+exec gunicorn 'src.agents.real_email_agent:create_app()' \
+    -k uvicorn.workers.UvicornWorker \
+    -w "${WORKERS:-4}" \
+    --bind "0.0.0.0:${PORT:-8003}"
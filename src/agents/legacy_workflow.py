@@ -5,32 +5,124 @@ This module provides sophisticated workflows using LangGraph for complex
 multi-step database operations and analysis tasks.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
-from typing import Dict, List, Optional, Any, TypedDict, Annotated
+import operator
+import re
+from collections import OrderedDict
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Any, TypedDict, Annotated
 from datetime import datetime
 
-from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolExecutor
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage, SystemMessage
 from langchain_core.language_models import BaseLanguageModel
-from langchain_openai import ChatOpenAI
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel, Field
 
 from ..client.mcp_client import MCPToolboxClient
-from ..client.langchain_tools import create_langchain_tools_sync
-from .legacy_database_agent import DatabaseAgent
+
+# langgraph, langchain_openai, the LangChain tool wrappers and DatabaseAgent are imported
+# where first used, so importing this module stays cheap
+if TYPE_CHECKING:
+    from langgraph.graph import StateGraph
+    from langgraph.prebuilt import ToolInvocation
 
 
 logger = logging.getLogger(__name__)
 
+# Steps assumed when the model cannot return a structured plan (capped by max_steps)
+PLANNED_STEPS = 3
+
+# Short lookups ("how many rows in orders?") skip analysis and planning and run as one step
+DIRECT_QUERY_MAX_WORDS = 12
+DIRECT_QUERY_KEYWORDS = frozenset({"count", "list", "show", "get"})
+
+# LLM responses memoized by hash of (model, prompt), shared by all DatabaseWorkflow instances
+LLM_RESPONSE_CACHE_SIZE = 256
+_llm_response_cache: "OrderedDict[str, str]" = OrderedDict()
+
+# Loaded tools and their executor per (client, toolset), so new workflows skip the MCP round-trip
+TOOLS_CACHE_SIZE = 16
+_tools_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+# Static node instructions, sent as a leading system message so providers can cache the prefix;
+# only the per-query details go in the human message.
+ANALYZE_SYSTEM_PROMPT = """
+Analyze the user's database query and determine:
+1. What type of operation is needed (search, analytics, reporting, etc.)
+2. What data entities are involved
+3. What specific information is being requested
+4. If multiple steps are needed
+
+Provide a structured analysis.
+"""
+
+PLAN_SYSTEM_PROMPT = """
+Based on the given query analysis, create a step-by-step execution plan.
+Create a detailed plan with specific steps and tools to use, using as few steps as the query needs.
+"""
+
+STEP_SYSTEM_PROMPT = """
+Execute the given step of the plan. Determine the tool calls for this step, plus any
+later steps that do not depend on this step's output, so they can run in parallel.
+Reply with a JSON list only: [{"tool": "<tool name>", "args": {...}}, ...]
+"""
+
+RESPONSE_SYSTEM_PROMPT = """
+Consolidate the given execution results and use them to generate a comprehensive
+response to the user's original query. Create a clear, informative response that:
+1. Directly answers the user's question
+2. Provides the key data, insights and patterns found in the results
+3. Explains the methodology used
+4. Suggests follow-up actions if appropriate
+"""
+
+# InteractiveWorkflow sends this many recent messages verbatim; older ones are folded into a summary
+CONVERSATION_WINDOW = 8
+
+# Conversations shorter than this (in characters) are returned verbatim instead of summarized
+CONVERSATION_SUMMARY_MIN_CHARS = 800
+
+CONVERSATION_SUMMARY_PROMPT = """
+Update the running summary of a conversation with the messages given. Keep the key topics,
+data insights, actions taken and outstanding questions. Be concise.
+"""
+
+# Node name -> (system instructions, human message template)
+NODE_PROMPTS = {
+    "analyze": (ANALYZE_SYSTEM_PROMPT, "Query: {query}"),
+    "plan": (PLAN_SYSTEM_PROMPT, "Analysis: {analysis}\n\nAvailable tools: {tools}"),
+    "step": (STEP_SYSTEM_PROMPT, "Plan: {plan}\n\nAvailable tools: {tools}\n\nCurrent step: {step}"),
+    "respond": (RESPONSE_SYSTEM_PROMPT, "Original Query: {query}\n\nExecution Results: {results}"),
+}
+
+
+class PlanStep(BaseModel):
+    """One step of an execution plan."""
+    description: str = Field(description="What this step does")
+    tool: Optional[str] = Field(default=None, description="Tool the step uses, if any")
+
+
+class ExecutionPlan(BaseModel):
+    """Structured execution plan returned by the planning node."""
+    steps: List[PlanStep] = Field(description="Steps in execution order")
+
 
 class WorkflowState(TypedDict):
-    """State for workflow execution."""
-    messages: Annotated[List[BaseMessage], "The messages in the conversation"]
+    """
+    State for workflow execution.
+    
+    Nodes return only the keys they change: new messages are appended and
+    results / intermediate_data entries are merged into the existing dicts.
+    """
+    messages: Annotated[List[BaseMessage], operator.add]
     query: str
     current_step: str
-    results: Dict[str, Any]
+    results: Annotated[Dict[str, Any], operator.or_]
     error: Optional[str]
-    intermediate_data: Dict[str, Any]
+    intermediate_data: Annotated[Dict[str, Any], operator.or_]
 
 
 class DatabaseWorkflow:
@@ -45,7 +137,8 @@ class DatabaseWorkflow:
         self,
         mcp_client: MCPToolboxClient,
         llm: Optional[BaseLanguageModel] = None,
-        toolset_name: Optional[str] = None
+        toolset_name: Optional[str] = None,
+        cache: bool = True
     ):
         """
         Initialize the Database Workflow.
@@ -54,12 +147,15 @@ class DatabaseWorkflow:
             mcp_client: MCP Toolbox client instance
             llm: Language model to use
             toolset_name: Specific toolset to load
+            cache: Reuse LLM responses for identical prompts
         """
         self.mcp_client = mcp_client
         self.toolset_name = toolset_name
+        self.cache = cache
         
         # Initialize LLM
         if llm is None:
+            from langchain_openai import ChatOpenAI
             self.llm = ChatOpenAI(
                 model="gpt-3.5-turbo",
                 temperature=0.1
@@ -67,229 +163,498 @@ class DatabaseWorkflow:
         else:
             self.llm = llm
         
+        # Planner returning ExecutionPlan; models without structured output fall back to a text plan
+        try:
+            self._planner = self.llm.with_structured_output(ExecutionPlan)
+        except NotImplementedError:
+            self._planner = None
+        
         # Load tools
-        self.tools = create_langchain_tools_sync(mcp_client, toolset_name)
-        self.tool_executor = ToolExecutor(self.tools)
+        self.tools, self.tool_executor = self._load_tools(mcp_client, toolset_name)
+        
+        # Tools are fixed after init: format their names once so prompts are byte-identical across runs
+        self._tool_names = {tool.name for tool in self.tools}
+        self._tool_names_str = ", ".join(tool.name for tool in self.tools)
+        
+        # Background connection warm-up started alongside the first async planning call
+        self._prewarm_task: Optional[asyncio.Task] = None
+        
+        self._prompt_templates = self._build_prompt_templates()
         
         # Create the workflow graph
         self.workflow = self._create_workflow()
         
         logger.info("Initialized Database Workflow")
     
-    def _create_workflow(self) -> StateGraph:
-        """Create the LangGraph workflow."""
+    @staticmethod
+    def _load_tools(mcp_client: MCPToolboxClient, toolset_name: Optional[str]) -> tuple:
+        """Return (tools, ToolExecutor) for the toolset, reusing those loaded by an earlier workflow."""
+        key = (id(mcp_client), toolset_name)
+        entry = _tools_cache.get(key)
+        # The stored client guards against a new client reusing a collected client's id
+        if entry is not None and entry[0] is mcp_client:
+            _tools_cache.move_to_end(key)
+            return entry[1], entry[2]
+        
+        from langgraph.prebuilt import ToolExecutor
+        from ..client.langchain_tools import create_langchain_tools_sync
+        
+        tools = create_langchain_tools_sync(mcp_client, toolset_name)
+        tool_executor = ToolExecutor(tools)
+        _tools_cache[key] = (mcp_client, tools, tool_executor)
+        _tools_cache.move_to_end(key)
+        if len(_tools_cache) > TOOLS_CACHE_SIZE:
+            _tools_cache.popitem(last=False)
+        return tools, tool_executor
+    
+    def _create_workflow(self) -> "StateGraph":
+        """Create the LangGraph workflow (nodes run sync under invoke, async under ainvoke)."""
+        from langgraph.graph import StateGraph, END
+        
         workflow = StateGraph(WorkflowState)
         
         # Add nodes
-        workflow.add_node("analyze_query", self._analyze_query)
-        workflow.add_node("plan_execution", self._plan_execution)
-        workflow.add_node("execute_step", self._execute_step)
-        workflow.add_node("process_results", self._process_results)
-        workflow.add_node("generate_response", self._generate_response)
+        workflow.add_node("route_query", self._route_query)
+        workflow.add_node("analyze_query", RunnableLambda(self._analyze_query, afunc=self._aanalyze_query))
+        workflow.add_node("plan_execution", RunnableLambda(self._plan_execution, afunc=self._aplan_execution))
+        workflow.add_node("execute_step", RunnableLambda(self._execute_step, afunc=self._aexecute_step))
+        workflow.add_node("generate_response", RunnableLambda(self._generate_response, afunc=self._agenerate_response))
         
         # Add edges
-        workflow.set_entry_point("analyze_query")
+        workflow.set_entry_point("route_query")
+        workflow.add_conditional_edges(
+            "route_query",
+            self._entry_route,
+            {
+                "direct": "execute_step",
+                "analyze": "analyze_query"
+            }
+        )
         workflow.add_edge("analyze_query", "plan_execution")
-        workflow.add_edge("plan_execution", "execute_step")
+        workflow.add_conditional_edges(
+            "plan_execution",
+            self._should_continue_execution,
+            {
+                "continue": "execute_step",
+                "process": "generate_response"
+            }
+        )
         workflow.add_conditional_edges(
             "execute_step",
             self._should_continue_execution,
             {
                 "continue": "execute_step",
-                "process": "process_results"
+                "process": "generate_response"
             }
         )
-        workflow.add_edge("process_results", "generate_response")
         workflow.add_edge("generate_response", END)
         
         return workflow.compile()
     
-    def _analyze_query(self, state: WorkflowState) -> WorkflowState:
-        """Analyze the user query to understand intent."""
+    def _cache_key(self, messages: List[BaseMessage]) -> str:
+        model = getattr(self.llm, "model_name", None) or getattr(self.llm, "model", "")
+        prompt = json.dumps([message.content for message in messages], default=str)
+        return hashlib.sha256(f"{model}\x00{prompt}".encode("utf-8")).hexdigest()
+    
+    def _cached_response(self, key: str) -> Optional[BaseMessage]:
+        content = _llm_response_cache.get(key)
+        if content is None:
+            return None
+        _llm_response_cache.move_to_end(key)
+        return AIMessage(content=content)
+    
+    @staticmethod
+    def _cache_response(key: str, response: BaseMessage):
+        _llm_response_cache[key] = response.content
+        if len(_llm_response_cache) > LLM_RESPONSE_CACHE_SIZE:
+            _llm_response_cache.popitem(last=False)
+    
+    def _cached_invoke(self, messages: List[BaseMessage]) -> BaseMessage:
+        """Invoke the LLM, reusing the stored response for an identical prompt when caching is on."""
+        if not self.cache:
+            return self.llm.invoke(messages)
+        
+        key = self._cache_key(messages)
+        cached = self._cached_response(key)
+        if cached is not None:
+            return cached
+        
+        response = self.llm.invoke(messages)
+        self._cache_response(key, response)
+        return response
+    
+    async def _acached_invoke(self, messages: List[BaseMessage]) -> BaseMessage:
+        """Async counterpart of _cached_invoke."""
+        if not self.cache:
+            return await self.llm.ainvoke(messages)
+        
+        key = self._cache_key(messages)
+        cached = self._cached_response(key)
+        if cached is not None:
+            return cached
+        
+        response = await self.llm.ainvoke(messages)
+        self._cache_response(key, response)
+        return response
+    
+    async def _acached_stream(self, messages: List[BaseMessage]) -> BaseMessage:
+        """Like _acached_invoke, but streams the completion so callers of astream() see tokens as they arrive."""
+        key = self._cache_key(messages) if self.cache else None
+        if key is not None:
+            cached = self._cached_response(key)
+            if cached is not None:
+                return cached
+        
+        response = None
+        async for chunk in self.llm.astream(messages):
+            response = chunk if response is None else response + chunk
+        if response is None:
+            response = AIMessage(content="")
+        
+        if key is not None:
+            self._cache_response(key, response)
+        return response
+    
+    def _run_node(self, state: WorkflowState, name: str, build, update) -> Dict[str, Any]:
+        """Run one LLM node: build its prompt from state, invoke the LLM, return the state update."""
         try:
-            query = state["query"]
-            
-            # Use LLM to analyze the query
-            analysis_prompt = f"""
-            Analyze this database query and determine:
-            1. What type of operation is needed (search, analytics, reporting, etc.)
-            2. What data entities are involved
-            3. What specific information is being requested
-            4. If multiple steps are needed
-            
-            Query: {query}
-            
-            Provide a structured analysis.
-            """
-            
-            response = self.llm.invoke([HumanMessage(content=analysis_prompt)])
-            
-            state["current_step"] = "query_analyzed"
-            state["intermediate_data"]["analysis"] = response.content
-            state["messages"].append(response)
-            
-            logger.info("Query analysis completed")
-            
+            response = self._cached_invoke(build(state))
+            logger.info(f"{name[0].upper()}{name[1:]} completed")
+            return update(response)
+        except Exception as e:
+            logger.error(f"Error in {name}: {e}")
+            return {"error": str(e)}
+    
+    async def _arun_node(self, state: WorkflowState, name: str, build, update, stream: bool = False) -> Dict[str, Any]:
+        """Async counterpart of _run_node; with stream=True the LLM output is streamed token by token."""
+        try:
+            messages = build(state)
+            response = await (self._acached_stream(messages) if stream else self._acached_invoke(messages))
+            logger.info(f"{name[0].upper()}{name[1:]} completed")
+            return update(response)
         except Exception as e:
-            logger.error(f"Error in query analysis: {e}")
-            state["error"] = str(e)
+            logger.error(f"Error in {name}: {e}")
+            return {"error": str(e)}
+    
+    def _system_message(self, instructions: str) -> SystemMessage:
+        """Static instructions as a system message, flagged for caching where the provider needs it."""
+        if getattr(self.llm, "_llm_type", "") == "anthropic-chat":
+            return SystemMessage(content=[
+                {"type": "text", "text": instructions, "cache_control": {"type": "ephemeral"}}
+            ])
+        # OpenAI caches identical prompt prefixes automatically
+        return SystemMessage(content=instructions)
+    
+    def _build_prompt_templates(self) -> Dict[str, ChatPromptTemplate]:
+        """Compile each node's prompt once; the system message is a fixed message, not a template."""
+        return {
+            name: ChatPromptTemplate.from_messages([self._system_message(instructions), ("human", details)])
+            for name, (instructions, details) in NODE_PROMPTS.items()
+        }
+    
+    @staticmethod
+    def _is_direct_query(query: str) -> bool:
+        """Cheap check for a short lookup that a single tool call can answer."""
+        words = re.findall(r"[a-z]+", query.lower())
+        return len(words) < DIRECT_QUERY_MAX_WORDS and not DIRECT_QUERY_KEYWORDS.isdisjoint(words)
+    
+    def _route_query(self, state: WorkflowState) -> Dict[str, Any]:
+        """Give direct queries a one-step plan so they bypass analysis and planning."""
+        query = state["query"]
+        if not self._is_direct_query(query):
+            return {}
+        
+        logger.info("Direct query: skipping analysis and planning")
+        return {
+            "current_step": "execution_planned",
+            "intermediate_data": {
+                "execution_plan": f"Call the best-matching tool for: {query}",
+                "remaining_steps": [query],
+                "step_count": 0,
+                "max_steps": 1
+            }
+        }
+    
+    @staticmethod
+    def _entry_route(state: WorkflowState) -> str:
+        return "direct" if "execution_plan" in state["intermediate_data"] else "analyze"
+    
+    def _analysis_messages(self, state: WorkflowState) -> List[BaseMessage]:
+        """Prompt asking the LLM to analyze the user query."""
+        query = state["query"]
+        
+        return self._prompt_templates["analyze"].format_messages(query=query)
+    
+    @staticmethod
+    def _analysis_update(response: BaseMessage) -> Dict[str, Any]:
+        return {
+            "current_step": "query_analyzed",
+            "intermediate_data": {"analysis": response.content},
+            "messages": [response]
+        }
+    
+    def _analyze_query(self, state: WorkflowState) -> Dict[str, Any]:
+        """Analyze the user query to understand intent."""
+        return self._run_node(state, "query analysis", self._analysis_messages, self._analysis_update)
+    
+    async def _aanalyze_query(self, state: WorkflowState) -> Dict[str, Any]:
+        """Analyze the user query to understand intent."""
+        return await self._arun_node(state, "query analysis", self._analysis_messages, self._analysis_update)
+    
+    def _planning_messages(self, state: WorkflowState) -> List[BaseMessage]:
+        """Prompt asking the LLM for an execution plan based on the query analysis."""
+        analysis = state["intermediate_data"].get("analysis", "")
+        
+        return self._prompt_templates["plan"].format_messages(
+            analysis=analysis, tools=self._tool_names_str
+        )
+    
+    @staticmethod
+    def _plan_update(response: BaseMessage, steps: Optional[List[str]] = None) -> Dict[str, Any]:
+        max_steps = 5  # Configurable
+        if steps is None:
+            # Free-text plan: assume the default number of steps
+            steps = [f"Step {i + 1} of the plan" for i in range(PLANNED_STEPS)]
+        
+        return {
+            "current_step": "execution_planned",
+            "intermediate_data": {
+                "execution_plan": response.content,
+                "remaining_steps": steps[:max_steps],
+                "step_count": 0,
+                "max_steps": max_steps
+            },
+            "messages": [response]
+        }
+    
+    def _structured_plan_update(self, plan: ExecutionPlan) -> Dict[str, Any]:
+        descriptions = [
+            f"{step.description} (tool: {step.tool})" if step.tool else step.description
+            for step in plan.steps
+        ]
+        text = "\n".join(f"{i + 1}. {description}" for i, description in enumerate(descriptions))
+        return self._plan_update(AIMessage(content=text), descriptions)
+    
+    def _structured_plan(self, messages: List[BaseMessage]) -> ExecutionPlan:
+        """Ask the planner for an ExecutionPlan, reusing a stored plan for an identical prompt."""
+        key = self._cache_key(messages) + ":plan" if self.cache else None
+        cached = self._cached_response(key) if key else None
+        if cached is not None:
+            return ExecutionPlan.model_validate_json(cached.content)
+        
+        plan = self._planner.invoke(messages)
+        if key:
+            self._cache_response(key, AIMessage(content=plan.model_dump_json()))
+        return plan
+    
+    async def _astructured_plan(self, messages: List[BaseMessage]) -> ExecutionPlan:
+        """Async counterpart of _structured_plan."""
+        key = self._cache_key(messages) + ":plan" if self.cache else None
+        cached = self._cached_response(key) if key else None
+        if cached is not None:
+            return ExecutionPlan.model_validate_json(cached.content)
+        
+        plan = await self._planner.ainvoke(messages)
+        if key:
+            self._cache_response(key, AIMessage(content=plan.model_dump_json()))
+        return plan
+    
+    def _plan_execution(self, state: WorkflowState) -> Dict[str, Any]:
+        """Plan the execution steps based on the query analysis."""
+        if self._planner is not None:
+            try:
+                update = self._structured_plan_update(self._structured_plan(self._planning_messages(state)))
+                logger.info("Execution planning completed")
+                return update
+            except Exception as e:
+                logger.warning(f"Structured planning failed, falling back to a text plan: {e}")
         
-        return state
+        return self._run_node(state, "execution planning", self._planning_messages, self._plan_update)
+    
+    def _start_prewarm(self):
+        """Open the MCP server connection while the planner runs, so the first tool call finds it ready."""
+        # Once per event loop; a task from an earlier loop cannot be awaited here
+        if self._prewarm_task is None or self._prewarm_task.get_loop() is not asyncio.get_running_loop():
+            self._prewarm_task = asyncio.create_task(self.mcp_client.test_connection())
     
-    def _plan_execution(self, state: WorkflowState) -> WorkflowState:
+    async def _aplan_execution(self, state: WorkflowState) -> Dict[str, Any]:
         """Plan the execution steps based on the query analysis."""
+        self._start_prewarm()
+        if self._planner is not None:
+            try:
+                update = self._structured_plan_update(await self._astructured_plan(self._planning_messages(state)))
+                logger.info("Execution planning completed")
+                return update
+            except Exception as e:
+                logger.warning(f"Structured planning failed, falling back to a text plan: {e}")
+        
+        return await self._arun_node(state, "execution planning", self._planning_messages, self._plan_update)
+    
+    def _step_messages(self, execution_plan: str, step_count: int, description: str) -> List[BaseMessage]:
+        """Prompt for one step of the plan, asking for every tool call that can run now."""
+        return self._prompt_templates["step"].format_messages(
+            plan=execution_plan, tools=self._tool_names_str, step=f"{step_count + 1}. {description}"
+        )
+    
+    def _parse_tool_calls(self, content: str) -> List[Dict[str, Any]]:
+        """Extract the JSON list of tool calls from a step response (empty if there is none)."""
+        start, end = content.find("["), content.rfind("]")
+        if start == -1 or end <= start:
+            return []
         try:
-            analysis = state["intermediate_data"].get("analysis", "")
-            
-            # Create execution plan
-            planning_prompt = f"""
-            Based on this query analysis, create a step-by-step execution plan:
-            
-            Analysis: {analysis}
-            
-            Available tools: {[tool.name for tool in self.tools]}
-            
-            Create a detailed plan with specific steps and tools to use.
-            """
-            
-            response = self.llm.invoke([HumanMessage(content=planning_prompt)])
-            
-            state["current_step"] = "execution_planned"
-            state["intermediate_data"]["execution_plan"] = response.content
-            state["intermediate_data"]["step_count"] = 0
-            state["intermediate_data"]["max_steps"] = 5  # Configurable
-            state["messages"].append(response)
-            
-            logger.info("Execution planning completed")
-            
-        except Exception as e:
-            logger.error(f"Error in execution planning: {e}")
-            state["error"] = str(e)
+            calls = json.loads(content[start:end + 1])
+        except ValueError:
+            return []
+        if not isinstance(calls, list):
+            return []
         
-        return state
+        return [call for call in calls if isinstance(call, dict) and call.get("tool") in self._tool_names]
     
-    def _execute_step(self, state: WorkflowState) -> WorkflowState:
-        """Execute a single step of the plan."""
+    @staticmethod
+    def _tool_invocations(calls: List[Dict[str, Any]]) -> List["ToolInvocation"]:
+        from langgraph.prebuilt import ToolInvocation
+        
+        return [ToolInvocation(tool=call["tool"], tool_input=call.get("args", {})) for call in calls]
+    
+    @staticmethod
+    def _step_data(step_count: int, response: BaseMessage,
+                   calls: Optional[List[Dict[str, Any]]] = None, outputs: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """intermediate_data entries recorded for one executed step."""
+        data = {"step_count": step_count + 1, f"step_{step_count}_result": response.content}
+        if calls:
+            # The whole parallel call set ran in this step
+            data[f"step_{step_count}_results"] = [
+                {"tool": call["tool"], "output": str(output)} for call, output in zip(calls, outputs)
+            ]
+            data["tool_calls_done"] = True
+        logger.info(f"Executed step {step_count + 1} ({len(calls or [])} tool calls)")
+        return data
+    
+    def _execute_step(self, state: WorkflowState) -> Dict[str, Any]:
+        """Execute a step of the plan, running its tool calls as one batch."""
         try:
             step_count = state["intermediate_data"]["step_count"]
             execution_plan = state["intermediate_data"]["execution_plan"]
+            description, *remaining_steps = state["intermediate_data"]["remaining_steps"]
             
-            # Determine what to execute in this step
-            step_prompt = f"""
-            Execute step {step_count + 1} of this plan:
-            
-            Plan: {execution_plan}
-            
-            Based on the current step, determine:
-            1. Which tool to use
-            2. What parameters to pass
-            3. What specific action to take
+            response = self._cached_invoke(self._step_messages(execution_plan, step_count, description))
+            calls = self._parse_tool_calls(response.content)
+            outputs = self.tool_executor.batch(self._tool_invocations(calls), return_exceptions=True) if calls else []
             
-            Current step: {step_count + 1}
-            """
+            data = self._step_data(step_count, response, calls, outputs)
+            data["remaining_steps"] = remaining_steps
+            return {"intermediate_data": data, "messages": [response]}
             
-            response = self.llm.invoke([HumanMessage(content=step_prompt)])
-            
-            # This is a simplified execution - in a real implementation,
-            # you would parse the response and execute the appropriate tool
+        except Exception as e:
+            logger.error(f"Error in step execution: {e}")
+            return {"error": str(e)}
+    
+    async def _arun_tool_calls(self, calls: List[Dict[str, Any]]) -> List[Any]:
+        """Run a step's tool calls concurrently; a failed call yields its exception."""
+        if self._prewarm_task is not None and self._prewarm_task.get_loop() is asyncio.get_running_loop():
+            # Normally finished while the plan and step prompts were generated
+            await self._prewarm_task
+        return await asyncio.gather(
+            *(self.tool_executor.ainvoke(invocation) for invocation in self._tool_invocations(calls)),
+            return_exceptions=True
+        )
+    
+    async def _aexecute_step(self, state: WorkflowState) -> Dict[str, Any]:
+        """Execute a step of the plan, running its tool calls concurrently."""
+        try:
+            step_count = state["intermediate_data"]["step_count"]
+            execution_plan = state["intermediate_data"]["execution_plan"]
+            description, *remaining_steps = state["intermediate_data"]["remaining_steps"]
             
-            state["intermediate_data"]["step_count"] += 1
-            state["intermediate_data"][f"step_{step_count}_result"] = response.content
-            state["messages"].append(response)
+            response = await self._acached_invoke(self._step_messages(execution_plan, step_count, description))
+            calls = self._parse_tool_calls(response.content)
+            if calls:
+                data = self._step_data(step_count, response, calls, await self._arun_tool_calls(calls))
+                data["remaining_steps"] = remaining_steps
+                return {"intermediate_data": data, "messages": [response]}
             
-            logger.info(f"Executed step {step_count + 1}")
+            # No tool calls to run: the remaining step prompts are independent, so issue them together,
+            # then consume the responses in plan order like the sequential loop does - the first step
+            # asking for tools has its calls executed and ends execution, later responses are dropped
+            data = self._step_data(step_count, response)
+            data["remaining_steps"] = []
+            messages = [response]
+            pending = list(enumerate(remaining_steps, start=step_count + 1))
+            responses = await asyncio.gather(
+                *(self._acached_invoke(self._step_messages(execution_plan, step, desc)) for step, desc in pending)
+            )
+            for index, ((step, _), step_response) in enumerate(zip(pending, responses)):
+                messages.append(step_response)
+                calls = self._parse_tool_calls(step_response.content)
+                if calls:
+                    data.update(self._step_data(step, step_response, calls, await self._arun_tool_calls(calls)))
+                    data["remaining_steps"] = remaining_steps[index + 1:]
+                    break
+                data.update(self._step_data(step, step_response))
+            return {"intermediate_data": data, "messages": messages}
             
         except Exception as e:
             logger.error(f"Error in step execution: {e}")
-            state["error"] = str(e)
-        
-        return state
+            return {"error": str(e)}
     
     def _should_continue_execution(self, state: WorkflowState) -> str:
         """Determine whether to continue executing steps or process results."""
+        if state.get("error"):
+            return "process"
+        
         step_count = state["intermediate_data"]["step_count"]
         max_steps = state["intermediate_data"]["max_steps"]
+        if step_count >= max_steps:
+            return "process"
         
-        if state.get("error") or step_count >= max_steps:
+        # The plan's parallel tool-call set has been executed
+        if state["intermediate_data"].get("tool_calls_done"):
             return "process"
         
-        # Check if execution is complete based on some criteria
-        # This is simplified - you would implement more sophisticated logic
-        return "process" if step_count >= 3 else "continue"
+        # Continue while the plan still has steps to run
+        return "continue" if state["intermediate_data"].get("remaining_steps") else "process"
     
-    def _process_results(self, state: WorkflowState) -> WorkflowState:
-        """Process and consolidate results from all execution steps."""
-        try:
-            step_count = state["intermediate_data"]["step_count"]
-            
-            # Collect all step results
-            step_results = []
-            for i in range(step_count):
-                result = state["intermediate_data"].get(f"step_{i}_result")
-                if result:
-                    step_results.append(result)
-            
-            # Process results
-            processing_prompt = f"""
-            Consolidate and process these execution results:
-            
-            Results: {step_results}
-            
-            Provide:
-            1. A summary of what was accomplished
-            2. Key findings or data
-            3. Any insights or patterns discovered
-            4. Recommendations for next steps
-            """
-            
-            response = self.llm.invoke([HumanMessage(content=processing_prompt)])
-            
-            state["current_step"] = "results_processed"
-            state["results"]["processed_results"] = response.content
-            state["messages"].append(response)
-            
-            logger.info("Results processing completed")
-            
-        except Exception as e:
-            logger.error(f"Error in results processing: {e}")
-            state["error"] = str(e)
+    @staticmethod
+    def _step_results(state: WorkflowState) -> List[Any]:
+        """Collect the step responses and tool outputs of all executed steps."""
+        step_results = []
+        for i in range(state["intermediate_data"].get("step_count", 0)):
+            result = state["intermediate_data"].get(f"step_{i}_result")
+            if result:
+                step_results.append(result)
+            step_results.extend(state["intermediate_data"].get(f"step_{i}_results", []))
         
-        return state
+        return step_results
     
-    def _generate_response(self, state: WorkflowState) -> WorkflowState:
-        """Generate the final response to the user."""
-        try:
-            processed_results = state["results"].get("processed_results", "")
-            original_query = state["query"]
-            
-            # Generate final response
-            response_prompt = f"""
-            Generate a comprehensive response to the user's original query:
-            
-            Original Query: {original_query}
-            
-            Processed Results: {processed_results}
-            
-            Create a clear, informative response that:
-            1. Directly answers the user's question
-            2. Provides relevant data and insights
-            3. Explains the methodology used
-            4. Suggests follow-up actions if appropriate
-            """
-            
-            response = self.llm.invoke([HumanMessage(content=response_prompt)])
-            
-            state["current_step"] = "completed"
-            state["results"]["final_response"] = response.content
-            state["messages"].append(response)
-            
-            logger.info("Response generation completed")
-            
-        except Exception as e:
-            logger.error(f"Error in response generation: {e}")
-            state["error"] = str(e)
+    def _response_messages(self, state: WorkflowState) -> List[BaseMessage]:
+        """Prompt asking the LLM to consolidate the step results and answer the original query."""
+        original_query = state["query"]
         
-        return state
+        return self._prompt_templates["respond"].format_messages(
+            query=original_query, results=self._step_results(state)
+        )
+    
+    @staticmethod
+    def _response_update(response: BaseMessage) -> Dict[str, Any]:
+        return {
+            "current_step": "completed",
+            "results": {"final_response": response.content},
+            "messages": [response]
+        }
+    
+    def _generate_response(self, state: WorkflowState) -> Dict[str, Any]:
+        """Consolidate the step results and generate the final response in one LLM call."""
+        update = self._run_node(state, "response generation", self._response_messages, self._response_update)
+        update.setdefault("results", {})["processed_results"] = self._step_results(state)
+        return update
+    
+    async def _agenerate_response(self, state: WorkflowState) -> Dict[str, Any]:
+        """Consolidate the step results and generate the final response, streaming it from the LLM."""
+        update = await self._arun_node(
+            state, "response generation", self._response_messages, self._response_update, stream=True
+        )
+        update.setdefault("results", {})["processed_results"] = self._step_results(state)
+        return update
     
     def execute(self, query: str) -> Dict[str, Any]:
         """
@@ -301,7 +666,62 @@ class DatabaseWorkflow:
         Returns:
             Dict containing the workflow results
         """
-        initial_state: WorkflowState = {
+        try:
+            final_state = self.workflow.invoke(self._initial_state(query))
+            return self._workflow_result(final_state)
+            
+        except Exception as e:
+            logger.error(f"Workflow execution failed: {e}")
+            return self._workflow_failure(e)
+    
+    async def aexecute(self, query: str) -> Dict[str, Any]:
+        """
+        Execute the workflow asynchronously, running independent plan steps concurrently.
+        
+        Args:
+            query: Natural language query
+            
+        Returns:
+            Dict containing the workflow results
+        """
+        try:
+            final_state = await self.workflow.ainvoke(self._initial_state(query))
+            return self._workflow_result(final_state)
+            
+        except Exception as e:
+            logger.error(f"Workflow execution failed: {e}")
+            return self._workflow_failure(e)
+    
+    async def astream(self, query: str) -> AsyncIterator[str]:
+        """
+        Execute the workflow and yield the final response as it is generated.
+        
+        Args:
+            query: Natural language query
+            
+        Yields:
+            Text chunks of the final response
+        """
+        streamed = False
+        final_state = None
+        
+        async for event in self.workflow.astream_events(self._initial_state(query), version="v2"):
+            if (event["event"] == "on_chat_model_stream"
+                    and event.get("metadata", {}).get("langgraph_node") == "generate_response"):
+                content = event["data"]["chunk"].content
+                if content:
+                    streamed = True
+                    yield content
+            elif event["event"] == "on_chain_end" and not event.get("parent_ids"):
+                final_state = event["data"].get("output")
+        
+        # Cached or failed responses produce no token events; yield whatever the workflow ended with
+        if not streamed and isinstance(final_state, dict):
+            yield final_state.get("results", {}).get("final_response", "No response generated")
+    
+    @staticmethod
+    def _initial_state(query: str) -> WorkflowState:
+        return {
             "messages": [HumanMessage(content=query)],
             "query": query,
             "current_step": "initialized",
@@ -309,27 +729,26 @@ class DatabaseWorkflow:
             "error": None,
             "intermediate_data": {}
         }
-        
-        try:
-            final_state = self.workflow.invoke(initial_state)
-            
-            return {
-                "success": True,
-                "response": final_state["results"].get("final_response", "No response generated"),
-                "steps_executed": final_state["intermediate_data"].get("step_count", 0),
-                "error": final_state.get("error"),
-                "intermediate_data": final_state["intermediate_data"]
-            }
-            
-        except Exception as e:
-            logger.error(f"Workflow execution failed: {e}")
-            return {
-                "success": False,
-                "response": f"Workflow execution failed: {str(e)}",
-                "steps_executed": 0,
-                "error": str(e),
-                "intermediate_data": {}
-            }
+    
+    @staticmethod
+    def _workflow_result(final_state: WorkflowState) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "response": final_state["results"].get("final_response", "No response generated"),
+            "steps_executed": final_state["intermediate_data"].get("step_count", 0),
+            "error": final_state.get("error"),
+            "intermediate_data": final_state["intermediate_data"]
+        }
+    
+    @staticmethod
+    def _workflow_failure(error: Exception) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "response": f"Workflow execution failed: {str(error)}",
+            "steps_executed": 0,
+            "error": str(error),
+            "intermediate_data": {}
+        }
 
 
 class AnalyticsWorkflow:
@@ -351,6 +770,8 @@ class AnalyticsWorkflow:
             llm: Language model to use
             toolset_name: Toolset for analytics tools
         """
+        from .legacy_database_agent import DatabaseAgent
+        
         self.mcp_client = mcp_client
         self.database_agent = DatabaseAgent(mcp_client, llm, toolset_name)
         
@@ -373,7 +794,13 @@ class AnalyticsWorkflow:
         Returns:
             Dict containing analysis results
         """
-        query = f"""
+        return self.database_agent.analyze_data(
+            self._sales_analysis_request(start_date, end_date, include_trends), include_visualizations=True
+        )
+    
+    @staticmethod
+    def _sales_analysis_request(start_date: str, end_date: str, include_trends: bool) -> str:
+        return f"""
         Perform a comprehensive sales analysis for the period from {start_date} to {end_date}.
         
         Include:
@@ -383,8 +810,6 @@ class AnalyticsWorkflow:
         4. Daily/weekly trends if requested: {include_trends}
         5. Key insights and recommendations
         """
-        
-        return self.database_agent.analyze_data(query, include_visualizations=True)
     
     def run_customer_analysis(self, months_back: int = 12) -> Dict[str, Any]:
         """
@@ -396,7 +821,11 @@ class AnalyticsWorkflow:
         Returns:
             Dict containing customer analysis
         """
-        query = f"""
+        return self.database_agent.analyze_data(self._customer_analysis_request(months_back))
+    
+    @staticmethod
+    def _customer_analysis_request(months_back: int) -> str:
+        return f"""
         Analyze customer behavior and segments for the last {months_back} months.
         
         Include:
@@ -406,8 +835,6 @@ class AnalyticsWorkflow:
         4. Retention analysis
         5. Recommendations for customer engagement
         """
-        
-        return self.database_agent.analyze_data(query)
     
     def generate_executive_report(
         self,
@@ -422,7 +849,11 @@ class AnalyticsWorkflow:
         Returns:
             Dict containing executive report
         """
-        query = f"""
+        return self.database_agent.analyze_data(self._executive_report_request(time_period))
+    
+    @staticmethod
+    def _executive_report_request(time_period: str) -> str:
+        return f"""
         Generate an executive summary report for {time_period}.
         
         Include:
@@ -435,8 +866,57 @@ class AnalyticsWorkflow:
         
         Format this as an executive summary suitable for leadership review.
         """
+    
+    async def _aanalyze(self, request: str, include_visualizations: bool = False) -> Dict[str, Any]:
+        """Run a blocking analyze_data call in the default executor."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.database_agent.analyze_data, request, include_visualizations
+        )
+    
+    async def arun_sales_analysis(
+        self,
+        start_date: str,
+        end_date: str,
+        include_trends: bool = True
+    ) -> Dict[str, Any]:
+        """Async version of run_sales_analysis."""
+        return await self._aanalyze(
+            self._sales_analysis_request(start_date, end_date, include_trends), include_visualizations=True
+        )
+    
+    async def arun_customer_analysis(self, months_back: int = 12) -> Dict[str, Any]:
+        """Async version of run_customer_analysis."""
+        return await self._aanalyze(self._customer_analysis_request(months_back))
+    
+    async def agenerate_executive_report(self, time_period: str = "last 30 days") -> Dict[str, Any]:
+        """Async version of generate_executive_report."""
+        return await self._aanalyze(self._executive_report_request(time_period))
+    
+    async def arun_full_report(
+        self,
+        start_date: str,
+        end_date: str,
+        months_back: int = 12,
+        time_period: str = "last 30 days"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run the sales, customer and executive analyses concurrently.
         
-        return self.database_agent.analyze_data(query)
+        Args:
+            start_date: Sales analysis start date (YYYY-MM-DD)
+            end_date: Sales analysis end date (YYYY-MM-DD)
+            months_back: Number of months for the customer analysis
+            time_period: Time period for the executive report
+            
+        Returns:
+            Dict with "sales", "customer" and "executive" results
+        """
+        results = await asyncio.gather(
+            self.arun_sales_analysis(start_date, end_date),
+            self.arun_customer_analysis(months_back),
+            self.agenerate_executive_report(time_period)
+        )
+        return dict(zip(["sales", "customer", "executive"], results))
 
 
 class InteractiveWorkflow:
@@ -459,12 +939,50 @@ class InteractiveWorkflow:
             llm: Language model to use
             toolset_name: Toolset to load
         """
+        from .legacy_database_agent import DatabaseAgent
+        
         self.mcp_client = mcp_client
         self.database_agent = DatabaseAgent(mcp_client, llm, toolset_name)
         self.conversation_history = []
         
+        # Context sent with each turn: a running summary of older turns plus the recent window
+        self._summary = ""
+        self._recent: List[BaseMessage] = []
+        
         logger.info("Initialized Interactive Workflow")
     
+    @staticmethod
+    def _transcript(messages: List[BaseMessage]) -> str:
+        return "\n".join(
+            f"{'User' if isinstance(message, HumanMessage) else 'Assistant'}: {message.content}"
+            for message in messages
+        )
+    
+    def _compact_context(self):
+        """Fold the oldest half of a full window into the running summary."""
+        if len(self._recent) < CONVERSATION_WINDOW:
+            return
+        
+        transcript = self._transcript(self._recent[:CONVERSATION_WINDOW // 2])
+        try:
+            response = self.database_agent.llm.invoke([
+                SystemMessage(content=CONVERSATION_SUMMARY_PROMPT),
+                HumanMessage(content=f"Summary so far: {self._summary or 'None'}\n\nMessages:\n{transcript}")
+            ])
+        except Exception as e:
+            # Keep the messages verbatim and retry on the next turn
+            logger.warning(f"Could not summarize conversation: {e}")
+            return
+        
+        self._summary = response.content
+        del self._recent[:CONVERSATION_WINDOW // 2]
+    
+    def _context_messages(self) -> List[BaseMessage]:
+        """Chat history for the agent: summary of older turns followed by the recent messages."""
+        if not self._summary:
+            return list(self._recent)
+        return [SystemMessage(content=f"Summary of the earlier conversation: {self._summary}"), *self._recent]
+    
     def start_conversation(self, initial_query: str) -> Dict[str, Any]:
         """
         Start an interactive conversation.
@@ -475,7 +993,7 @@ class InteractiveWorkflow:
         Returns:
             Dict containing response and conversation state
         """
-        self.conversation_history = []
+        self.clear_conversation()
         return self.continue_conversation(initial_query)
     
     def continue_conversation(self, user_input: str) -> Dict[str, Any]:
@@ -488,17 +1006,20 @@ class InteractiveWorkflow:
         Returns:
             Dict containing response and conversation state
         """
+        # Get response from agent; the question itself is passed separately from the history
+        self._compact_context()
+        result = self.database_agent.query(user_input, self._context_messages())
+        
         # Add user input to history
         user_message = HumanMessage(content=user_input)
         self.conversation_history.append(user_message)
-        
-        # Get response from agent
-        result = self.database_agent.query(user_input, self.conversation_history)
+        self._recent.append(user_message)
         
         # Add assistant response to history
         if result["success"]:
             ai_message = AIMessage(content=result["answer"])
             self.conversation_history.append(ai_message)
+            self._recent.append(ai_message)
         
         return {
             "response": result["answer"],
@@ -518,6 +1039,10 @@ class InteractiveWorkflow:
         if not self.conversation_history:
             return "No conversation history."
         
+        # A short conversation is its own summary; skip the LLM round-trip
+        if sum(len(message.content) for message in self.conversation_history) < CONVERSATION_SUMMARY_MIN_CHARS:
+            return self._transcript(self.conversation_history)
+        
         summary_query = """
         Summarize this conversation, highlighting:
         1. Key topics discussed
@@ -526,10 +1051,12 @@ class InteractiveWorkflow:
         4. Outstanding questions or next steps
         """
         
-        result = self.database_agent.query(summary_query, self.conversation_history)
+        result = self.database_agent.query(summary_query, self._context_messages())
         return result["answer"]
     
     def clear_conversation(self):
         """Clear the conversation history."""
         self.conversation_history = []
+        self._summary = ""
+        self._recent = []
         logger.info("Conversation history cleared")
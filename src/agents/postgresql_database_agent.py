@@ -10,6 +10,8 @@ import asyncio
 import os
 import sys
 import json
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import uuid
@@ -27,11 +29,27 @@ load_dotenv()
 # Core imports
 from langchain_anthropic import ChatAnthropic
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import uvicorn
 import aiohttp
 import asyncpg
 
+# Optional SQLite fallback backend
+try:
+    import aiosqlite
+except ImportError:
+    aiosqlite = None
+
+# Hub registration: fail fast on an unreachable hub, retry with exponential backoff
+HUB_REGISTRATION_TIMEOUT = aiohttp.ClientTimeout(total=10, sock_connect=2, sock_read=5)
+HUB_REGISTRATION_ATTEMPTS = 3
+HUB_REGISTRATION_BACKOFF = 0.2
+HUB_REGISTRATION_MAX_BACKOFF = 2.0
+
+# LLM response cache for query_database
+QUERY_CACHE_MAX_SIZE = 512
+QUERY_CACHE_TTL_SECONDS = 600
+
 class PostgreSQLDatabaseAgent:
     """A real database agent using PostgreSQL for storage"""
     
@@ -42,6 +60,11 @@ class PostgreSQLDatabaseAgent:
         self.app = FastAPI()
         self.agent_id = f"postgresql_database_agent_{agent_port}"
         self.db_pool = None
+        self._query_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # Storage backend, resolved once by init_database / init_sqlite_fallback
+        self._store = self._store_pg
+        self._fetch_all = self._fetch_all_pg
+        self._fetch_all_json = self.get_all_extraction_data_json
         self.setup_routes()
     
     async def init_database(self):
@@ -65,6 +88,9 @@ class PostgreSQLDatabaseAgent:
             # Create connection pool
             db_config.update({'min_size': 2, 'max_size': 10})
             self.db_pool = await asyncpg.create_pool(**db_config)
+            self._store = self._store_pg
+            self._fetch_all = self._fetch_all_pg
+            self._fetch_all_json = self.get_all_extraction_data_json
             
             # Create tables for extracted data
             await self.create_extraction_tables()
@@ -80,7 +106,8 @@ class PostgreSQLDatabaseAgent:
     async def init_sqlite_fallback(self):
         """Initialize SQLite as fallback"""
         try:
-            import aiosqlite
+            if aiosqlite is None:
+                raise ImportError("aiosqlite is not installed")
             
             self.db_path = project_root / "data" / "extraction_data.db"
             self.db_path.parent.mkdir(exist_ok=True)
@@ -117,6 +144,10 @@ class PostgreSQLDatabaseAgent:
                 
                 await db.commit()
             
+            self._store = self._store_sqlite
+            self._fetch_all = self._fetch_all_sqlite
+            self._fetch_all_json = self._fetch_all_json_sqlite
+            
             print("✅ SQLite database initialized as fallback")
             return True
             
@@ -126,40 +157,60 @@ class PostgreSQLDatabaseAgent:
     
     async def create_extraction_tables(self):
         """Create tables for storing extraction data"""
+        # Single multi-statement DDL block: one round-trip instead of one per statement
+        ddl_block = """
+        -- Main extraction data table
+        CREATE TABLE IF NOT EXISTS extraction_data (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            source TEXT NOT NULL,
+            extraction_timestamp TIMESTAMP NOT NULL,
+            data_type TEXT,
+            raw_data JSONB NOT NULL,
+            processed_data JSONB,
+            metadata JSONB,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        -- Specific table for stock data
+        CREATE TABLE IF NOT EXISTS stock_data (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            symbol TEXT NOT NULL,
+            company TEXT,
+            price DECIMAL(10, 2),
+            change_value TEXT,
+            volume TEXT,
+            extraction_id UUID,
+            extracted_at TIMESTAMP NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (extraction_id) REFERENCES extraction_data (id)
+        );
+
+        -- Index for better performance
+        CREATE INDEX IF NOT EXISTS idx_extraction_source ON extraction_data (source);
+        CREATE INDEX IF NOT EXISTS idx_stock_symbol ON stock_data (symbol);
+
+        -- Hot filter fields lifted out of raw_data into BTREE-indexed generated columns (PostgreSQL 12+)
+        DO $$
+        BEGIN
+            ALTER TABLE extraction_data
+                ADD COLUMN symbol_gen TEXT GENERATED ALWAYS AS (raw_data->>'symbol') STORED;
+        EXCEPTION WHEN duplicate_column THEN NULL;
+        END $$;
+        CREATE INDEX IF NOT EXISTS idx_extraction_symbol_gen ON extraction_data (symbol_gen);
+
+        -- Idempotent ingestion: one row per (source, timestamp, payload)
+        DO $$
+        BEGIN
+            CREATE UNIQUE INDEX IF NOT EXISTS uniq_extraction
+                ON extraction_data (source, extraction_timestamp, md5(raw_data::text));
+        EXCEPTION WHEN unique_violation THEN
+            RAISE NOTICE 'extraction_data has duplicate rows; uniq_extraction not created';
+        END $$;
+        """
+
         async with self.db_pool.acquire() as conn:
-            # Main extraction data table
-            await conn.execute("""
-            CREATE TABLE IF NOT EXISTS extraction_data (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                source TEXT NOT NULL,
-                extraction_timestamp TIMESTAMP NOT NULL,
-                data_type TEXT,
-                raw_data JSONB NOT NULL,
-                processed_data JSONB,
-                metadata JSONB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """)
-            
-            # Specific table for stock data
-            await conn.execute("""
-            CREATE TABLE IF NOT EXISTS stock_data (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                symbol TEXT NOT NULL,
-                company TEXT,
-                price DECIMAL(10, 2),
-                change_value TEXT,
-                volume TEXT,
-                extraction_id UUID,
-                extracted_at TIMESTAMP NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (extraction_id) REFERENCES extraction_data (id)
-            )
-            """)
-            
-            # Index for better performance
-            await conn.execute("CREATE INDEX IF NOT EXISTS idx_extraction_source ON extraction_data (source)")
-            await conn.execute("CREATE INDEX IF NOT EXISTS idx_stock_symbol ON stock_data (symbol)")
+            # No bound parameters, so asyncpg sends this via the simple-query protocol
+            await conn.execute(ddl_block)
             
             print("✅ Database tables created/verified")
     
@@ -175,17 +226,27 @@ class PostgreSQLDatabaseAgent:
             except Exception as e:
                 return {"jsonrpc": "2.0", "error": {"code": -1, "message": str(e)}}
         
+        # Static health payload, encoded once for liveness/readiness probes
+        self._health_body = json.dumps(
+            {"status": "healthy", "agent_id": self.agent_id, "database": "postgresql"}
+        ).encode()
+        
         @self.app.get("/health")
         async def health_check():
             """Health check endpoint"""
-            return {"status": "healthy", "agent_id": self.agent_id, "database": "postgresql"}
+            return Response(
+                content=self._health_body,
+                media_type="application/json",
+                headers={"cache-control": "no-store"}
+            )
         
         @self.app.get("/data")
         async def get_all_data():
             """Get all stored extraction data"""
             try:
-                data = await self.get_all_extraction_data()
-                return {"data": data, "count": len(data)}
+                # The bound backend returns the encoded document; pass it through untouched
+                body = await self._fetch_all_json()
+                return Response(content=body, media_type="application/json")
             except Exception as e:
                 return {"error": str(e)}
         
@@ -265,69 +326,122 @@ class PostgreSQLDatabaseAgent:
             print(f"   Source: {source}")
             print(f"   Data items: {len(data) if isinstance(data, list) else 1}")
             
-            if self.db_pool:
-                # Use PostgreSQL - Store in main extraction_data table only
-                async with self.db_pool.acquire() as conn:
-                    # Store main extraction record
-                    await conn.execute("""
-                    INSERT INTO extraction_data (id, source, extraction_timestamp, data_type, raw_data, metadata)
-                    VALUES ($1, $2, $3, $4, $5, $6)
-                    """, extraction_id, source, extraction_timestamp, "web_data", json.dumps(data), json.dumps(metadata))
-                    
-                    print(f"✅ Stored extraction data in PostgreSQL")
-                    
-                    return {
-                        "status": "success",
-                        "extraction_id": extraction_id,
-                        "records_stored": 1,
-                        "data_type": "web_data"
-                    }
-            else:
-                # Fallback to SQLite
-                import aiosqlite
-                async with aiosqlite.connect(self.db_path) as db:
-                    await db.execute("""
-                    INSERT INTO extraction_data (id, source, extraction_timestamp, data_type, raw_data, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """, (extraction_id, source, extraction_timestamp.isoformat(), "web_data", json.dumps(data), json.dumps(metadata)))
-                    
-                    await db.commit()
-                
-                print(f"✅ Stored extraction data in SQLite (fallback)")
-                
-                return {
-                    "status": "success", 
-                    "extraction_id": extraction_id,
-                    "records_stored": 1,
-                    "summary": f"Stored extraction data from {source}",
-                    "database_type": "sqlite_fallback"
-                }
-                
+            return await self._store(extraction_id, source, extraction_timestamp, data, metadata)
+            
         except Exception as e:
             print(f"❌ Database storage failed: {e}")
             return {"status": "error", "message": str(e)}
     
+    async def _store_pg(self, extraction_id: str, source: str, extraction_timestamp: datetime,
+                        data: Any, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Store main extraction record in PostgreSQL"""
+        # Serialize before acquiring so the pooled connection is held only for the round-trips
+        raw_json = json.dumps(data)
+        meta_json = json.dumps(metadata)
+        async with self.db_pool.acquire() as conn:
+            stored_id = await conn.fetchval("""
+            INSERT INTO extraction_data (id, source, extraction_timestamp, data_type, raw_data, metadata)
+            VALUES ($1, $2, $3, $4, $5, $6)
+            ON CONFLICT DO NOTHING
+            RETURNING id
+            """, extraction_id, source, extraction_timestamp, "web_data", raw_json, meta_json)
+            
+            if stored_id is None:
+                # Duplicate payload: hand back the id of the row already stored
+                stored_id = await conn.fetchval("""
+                SELECT id FROM extraction_data
+                WHERE source = $1 AND extraction_timestamp = $2 AND md5(raw_data::text) = md5($3::jsonb::text)
+                """, source, extraction_timestamp, raw_json)
+                print(f"ℹ️  Extraction data already stored, skipping duplicate")
+                return {
+                    "status": "success",
+                    "extraction_id": str(stored_id) if stored_id is not None else extraction_id,
+                    "records_stored": 0,
+                    "data_type": "web_data",
+                    "duplicate": True
+                }
+            
+        print(f"✅ Stored extraction data in PostgreSQL")
+        
+        return {
+            "status": "success",
+            "extraction_id": extraction_id,
+            "records_stored": 1,
+            "data_type": "web_data"
+        }
+    
+    async def _store_sqlite(self, extraction_id: str, source: str, extraction_timestamp: datetime,
+                            data: Any, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Store main extraction record in the SQLite fallback"""
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("""
+            INSERT INTO extraction_data (id, source, extraction_timestamp, data_type, raw_data, metadata)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """, (extraction_id, source, extraction_timestamp.isoformat(), "web_data", json.dumps(data), json.dumps(metadata)))
+            
+            await db.commit()
+        
+        print(f"✅ Stored extraction data in SQLite (fallback)")
+        
+        return {
+            "status": "success", 
+            "extraction_id": extraction_id,
+            "records_stored": 1,
+            "summary": f"Stored extraction data from {source}",
+            "database_type": "sqlite_fallback"
+        }
+    
     async def get_all_extraction_data(self) -> List[Dict[str, Any]]:
         """Get all extraction data from database"""
         try:
-            if self.db_pool:
-                async with self.db_pool.acquire() as conn:
-                    rows = await conn.fetch("SELECT * FROM extraction_data ORDER BY created_at DESC")
-                    return [dict(row) for row in rows]
-            else:
-                import aiosqlite
-                async with aiosqlite.connect(self.db_path) as db:
-                    async with db.execute("SELECT * FROM extraction_data ORDER BY created_at DESC") as cursor:
-                        rows = await cursor.fetchall()
-                        columns = [desc[0] for desc in cursor.description]
-                        return [dict(zip(columns, row)) for row in rows]
+            return await self._fetch_all()
         except Exception as e:
             print(f"❌ Failed to fetch extraction data: {e}")
             return []
     
-    async def query_database(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Query database for information"""
-        query = params.get("query", "")
+    async def _fetch_all_pg(self) -> List[Dict[str, Any]]:
+        """Fetch all extraction records from PostgreSQL"""
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch("SELECT * FROM extraction_data ORDER BY created_at DESC")
+            return [dict(row) for row in rows]
+    
+    async def _fetch_all_sqlite(self) -> List[Dict[str, Any]]:
+        """Fetch all extraction records from the SQLite fallback"""
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute("SELECT * FROM extraction_data ORDER BY created_at DESC") as cursor:
+                rows = await cursor.fetchall()
+                columns = [desc[0] for desc in cursor.description]
+                return [dict(zip(columns, row)) for row in rows]
+    
+    async def _fetch_all_json_sqlite(self) -> str:
+        """Encode all extraction records from the SQLite fallback as the /data document"""
+        data = await self._fetch_all_sqlite()
+        return json.dumps({"data": data, "count": len(data)}, default=str)
+    
+    async def get_all_extraction_data_json(self, limit: Optional[int] = None) -> str:
+        """Get extraction data as a JSON document built server-side by PostgreSQL"""
+        async with self.db_pool.acquire() as conn:
+            # LIMIT NULL means no limit
+            return await conn.fetchval("""
+            SELECT jsonb_build_object(
+                'data', COALESCE(jsonb_agg(to_jsonb(e) ORDER BY e.created_at DESC), '[]'::jsonb),
+                'count', count(*)
+            )
+            FROM (SELECT * FROM extraction_data ORDER BY created_at DESC LIMIT $1) e
+            """, limit)
+    
+    async def _llm_query(self, query: str) -> str:
+        """Ask the LLM about a query, serving repeats from a TTL-bounded LRU cache"""
+        key = query.strip().lower()
+        now = time.monotonic()
+        
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            content, expires_at = cached
+            if expires_at > now:
+                self._query_cache.move_to_end(key)
+                return content
+            del self._query_cache[key]
         
         # Use Claude to understand the query and generate appropriate response
         prompt = f"""
@@ -343,9 +457,20 @@ class PostgreSQLDatabaseAgent:
         
         response = await self.llm.ainvoke(prompt)
         
+        self._query_cache[key] = (response.content, now + QUERY_CACHE_TTL_SECONDS)
+        if len(self._query_cache) > QUERY_CACHE_MAX_SIZE:
+            self._query_cache.popitem(last=False)
+        return response.content
+    
+    async def query_database(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Query database for information"""
+        query = params.get("query", "")
+        
+        response_content = await self._llm_query(query)
+        
         return {
             "query": query,
-            "response": response.content,
+            "response": response_content,
             "status": "processed",
             "available_endpoints": {
                 "all_extractions": "GET /data",
@@ -392,14 +517,23 @@ class PostgreSQLDatabaseAgent:
                 }
             }
             
-            async with aiohttp.ClientSession() as session:
-                hub_mcp_url = "http://localhost:5000/mcp"
-                async with session.post(hub_mcp_url, json=registration_request, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        if "result" in result:
-                            print(f"✅ Successfully registered PostgreSQL agent: {result['result']}")
-                            return True
+            hub_mcp_url = "http://localhost:5000/mcp"
+            async with aiohttp.ClientSession(timeout=HUB_REGISTRATION_TIMEOUT) as session:
+                for attempt in range(HUB_REGISTRATION_ATTEMPTS):
+                    try:
+                        async with session.post(hub_mcp_url, json=registration_request) as response:
+                            if response.status == 200:
+                                result = await response.json()
+                                if "result" in result:
+                                    print(f"✅ Successfully registered PostgreSQL agent: {result['result']}")
+                                    return True
+                            return False
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        if attempt == HUB_REGISTRATION_ATTEMPTS - 1:
+                            raise
+                        delay = min(HUB_REGISTRATION_BACKOFF * (2 ** attempt), HUB_REGISTRATION_MAX_BACKOFF)
+                        print(f"⚠️  Registration attempt {attempt + 1} failed ({e}), retrying in {delay:.1f}s")
+                        await asyncio.sleep(delay)
                     
             return False
             
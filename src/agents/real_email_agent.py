@@ -11,14 +11,18 @@ import asyncio
 import logging
 import os
 import sys
-import json
 import uuid
-import smtplib
+import hashlib
+import socket
 import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import time
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from email.message import EmailMessage
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 from datetime import datetime
 
 # Setup path
@@ -30,15 +34,412 @@ sys.path.append(str(project_root / "src"))
 from dotenv import load_dotenv
 load_dotenv()
 
-# Core imports
-from langchain_anthropic import ChatAnthropic
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
-import uvicorn
-import aiohttp
+# Core imports (langchain_anthropic, uvicorn and aiohttp are imported where used to keep import time low)
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+import aiosmtplib
+import jinja2
+from markupsafe import escape
+import orjson
+
+if TYPE_CHECKING:
+    import aiohttp
 
 logger = logging.getLogger(__name__)
 
+# SMTP connection reuse: idle connections kept per (host, port, user), recycled after N messages
+SMTP_POOL_MAX_IDLE = int(os.getenv("SMTP_POOL_SIZE", "5"))
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+
+# Hub registration retries (registration runs in the background at startup)
+HUB_REGISTRATION_ATTEMPTS = 3
+HUB_REGISTRATION_BACKOFF = 0.2
+HUB_REGISTRATION_MAX_BACKOFF = 2.0
+
+# Connections in use at once, kept under the provider's concurrency cap (Gmail ~15, Zoho 5-10)
+SMTP_MAX_ACTIVE_CONNECTIONS = int(os.getenv("SMTP_WORKERS", "5"))
+
+# A send that finds its pooled connection dropped by the server is retried on a fresh one
+SMTP_RECONNECT_ATTEMPTS = 3
+SMTP_RECONNECT_BACKOFF = 0.5
+SMTP_RECONNECT_MAX_BACKOFF = 4.0
+SMTP_RECONNECT_ERRORS = (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError)
+
+# Rejections of a single message (bad recipient, refused data); the connection stays usable
+SMTP_MESSAGE_ERRORS = (aiosmtplib.SMTPResponseException, aiosmtplib.SMTPRecipientsRefused)
+
+# TCP keepalive on SMTP sockets so silently dropped pooled connections fail fast (seconds)
+SMTP_KEEPALIVE_IDLE = 30
+SMTP_KEEPALIVE_INTERVAL = 10
+SMTP_KEEPALIVE_COUNT = 3
+
+# LLM-generated subjects/bodies cached by a fingerprint of the prompt inputs
+LLM_CONTENT_CACHE_SIZE = 256
+
+# Formatted "now" timestamps are reused for this long (seconds) across sends
+NOW_CACHE_TTL = 0.01
+
+# LLM prompt templates for generated email content
+SUBJECT_PROMPT_TEMPLATE = """
+            Generate a professional email subject line for a data extraction report.
+            
+            Extraction metadata: {metadata}
+            Number of data points: {data_count}
+            
+            Make it concise and informative. Include the source/target and data count.
+            Example: "Yahoo Finance Data Extraction Complete - 15 Stock Records"
+            
+            Return only the subject line, no quotes or extra text.
+            """
+
+BODY_PROMPT_TEMPLATE = """
+            Generate a clean, professional HTML email body for a data extraction report.
+            
+            Extraction metadata: {metadata}
+            Sample extracted data (first 3 items): {sample}
+            Total data points: {data_count}
+            
+            Create an HTML email that includes:
+            1. Professional greeting
+            2. Brief summary of the extraction (source, timestamp, data count)
+            3. Clean HTML table showing the first 5 data items with proper formatting
+            4. Summary statistics if applicable (stock prices, changes, etc.)
+            5. Professional closing
+            
+            Use clean, professional HTML styling with inline CSS.
+            Keep it concise and business-appropriate.
+            Make the table responsive and well-formatted.
+            
+            Return only the HTML body content, no extra text or markdown.
+            """
+
+# Fallback HTML report, compiled once at import; autoescape keeps extracted values out of the markup
+EMAIL_REPORT_TEMPLATE_SRC = """
+        <html>
+        <body style="font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5;">
+            <div style="max-width: 800px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                <h2 style="color: #2c3e50; margin-bottom: 20px; border-bottom: 2px solid #3498db; padding-bottom: 10px;">📊 Data Extraction Report</h2>
+                
+                <div style="background-color: #ecf0f1; padding: 15px; border-radius: 5px; margin: 20px 0;">
+                    <h3 style="color: #34495e; margin-top: 0; margin-bottom: 15px;">📋 Extraction Summary</h3>
+                    <ul style="margin: 0; padding-left: 20px;">
+                        <li><strong>Source:</strong> {{ metadata.get('source', 'Hub-mediated A2A Communication') }}</li>
+                        <li><strong>Data Count:</strong> {{ items|length }}</li>
+                        <li><strong>Method:</strong> {{ metadata.get('method', 'browserbase_hub') }}</li>
+                        <li><strong>Source URL:</strong> {{ metadata.get('source_url', 'Multiple Sources') }}</li>
+                        <li><strong>Extracted:</strong> {{ now.strftime('%Y-%m-%d %H:%M:%S') }}</li>
+                    </ul>
+                </div>
+                
+                <h3 style="color: #34495e; margin-bottom: 15px;">🌐 Extracted Data</h3>
+        {% for item in items %}
+            {% set url = item.get('url', 'N/A') %}
+            {% set detail = item.get('extracted_data', {}) %}
+                <div style="background-color: {{ loop.cycle('#f8f9fa', 'white') }}; border: 1px solid #ddd; border-radius: 8px; margin: 15px 0; padding: 20px;">
+                    <h4 style="color: #2c3e50; margin: 0 0 10px 0; border-bottom: 1px solid #bdc3c7; padding-bottom: 5px;">
+                        🔗 {{ item.get('name', 'Item ' ~ loop.index) }}
+                    </h4>
+                    <table style="width: 100%; border-collapse: collapse; margin: 10px 0;">
+                        <tr>
+                            <td style="padding: 8px; font-weight: bold; color: #34495e; width: 80px; vertical-align: top;">URL:</td>
+                            <td style="padding: 8px; color: #2c3e50;"><a href="{{ url }}" style="color: #3498db; text-decoration: none;">{{ url }}</a></td>
+                        </tr>
+                        <tr>
+                            <td style="padding: 8px; font-weight: bold; color: #34495e; width: 80px; vertical-align: top;">Title:</td>
+                            <td style="padding: 8px; color: #2c3e50; font-weight: 600;">{{ item.get('title', 'No Title') }}</td>
+                        </tr>
+                        <tr>
+                            <td style="padding: 8px; font-weight: bold; color: #34495e; width: 80px; vertical-align: top;">Content:</td>
+                            <td style="padding: 8px; color: #2c3e50;">{{ item.get('content', 'No content available') }}</td>
+                        </tr>
+            {% if detail %}
+                        <tr>
+                            <td style="padding: 8px; font-weight: bold; color: #34495e; width: 80px; vertical-align: top;">Details:</td>
+                            <td style="padding: 8px; color: #2c3e50;">
+                {% if 'repositories' in detail %}
+                    {% set repos = detail.get('repositories', []) %}
+                    {% set languages = detail.get('languages', []) %}
+                    {% set stats = detail.get('stats', {}) %}
+                                <div style="background: #e8f6fd; padding: 10px; border-radius: 4px; margin: 5px 0;">
+                                    <strong>📚 GitHub Profile Details:</strong><br>
+                    {% if repos %}• <strong>Repositories:</strong> {{ repos[:5]|join(', ') }}{% if repos|length > 5 %} (and {{ repos|length - 5 }} more){% endif %}<br>{% endif %}
+                    {% if languages %}• <strong>Languages:</strong> {{ languages|join(', ') }}<br>{% endif %}
+                    {% if stats %}
+                        • <strong>Public Repos:</strong> {{ stats.get('public_repos', 'N/A') }}<br>
+                        • <strong>Followers:</strong> {{ stats.get('followers', 'N/A') }}<br>
+                        • <strong>Following:</strong> {{ stats.get('following', 'N/A') }}<br>
+                    {% endif %}
+                                </div>
+                {% elif 'stock_data' in detail %}
+                    {% set stock_data = detail.get('stock_data', {}) %}
+                    {% set key_stats = detail.get('key_stats', {}) %}
+                                <div style="background: #e8f8f5; padding: 10px; border-radius: 4px; margin: 5px 0;">
+                                    <strong>📈 Financial Data:</strong><br>
+                    {% if stock_data %}
+                        • <strong>Symbol:</strong> {{ stock_data.get('symbol', 'N/A') }}<br>
+                        • <strong>Price:</strong> {{ stock_data.get('price', 'N/A') }}<br>
+                        • <strong>Change:</strong> {{ stock_data.get('change', 'N/A') }} ({{ stock_data.get('change_percent', 'N/A') }})<br>
+                        • <strong>Volume:</strong> {{ stock_data.get('volume', 'N/A') }}<br>
+                        • <strong>Market Cap:</strong> {{ stock_data.get('market_cap', 'N/A') }}<br>
+                    {% endif %}
+                    {% if key_stats %}
+                        • <strong>P/E Ratio:</strong> {{ key_stats.get('pe_ratio', 'N/A') }}<br>
+                        • <strong>Dividend Yield:</strong> {{ key_stats.get('dividend_yield', 'N/A') }}<br>
+                        • <strong>52W High:</strong> {{ key_stats.get('52_week_high', 'N/A') }}<br>
+                        • <strong>52W Low:</strong> {{ key_stats.get('52_week_low', 'N/A') }}<br>
+                    {% endif %}
+                                </div>
+                {% elif 'top_stories' in detail %}
+                    {% set stories = detail.get('top_stories', []) %}
+                                <div style="background: #fff4e6; padding: 10px; border-radius: 4px; margin: 5px 0;">
+                                    <strong>📰 Top Stories:</strong><br>
+                    {% for story in stories[:3] %}
+                        • <strong>{{ story.get('title', 'No title') }}</strong><br>
+                          Points: {{ story.get('points', 'N/A') }} | Comments: {{ story.get('comments', 'N/A') }}<br>
+                    {% endfor %}
+                    {% if stories|length > 3 %}... and {{ stories|length - 3 }} more stories<br>{% endif %}
+                                </div>
+                {% else %}
+                                <div style="background: #f0f0f0; padding: 10px; border-radius: 4px; margin: 5px 0;">
+                                    <strong>📋 Structured Data:</strong><br>
+                    {% for key, value in (detail.items()|list)[:5] %}
+                        {% if value is mapping or (value is sequence and value is not string) %}
+                        • <strong>{{ key.title() }}:</strong> {{ (value|string)[:100] }}{% if (value|string)|length > 100 %}...{% endif %}<br>
+                        {% else %}
+                        • <strong>{{ key.title() }}:</strong> {{ value }}<br>
+                        {% endif %}
+                    {% endfor %}
+                                </div>
+                {% endif %}
+                            </td>
+                        </tr>
+            {% endif %}
+                    </table>
+                </div>
+        {% endfor %}
+                <div style="margin: 30px 0; padding: 20px; background-color: #e8f6fd; border-left: 4px solid #3498db; border-radius: 0 5px 5px 0;">
+                    <p style="margin: 0; color: #2c3e50;">
+                        <strong>🎯 Report Summary:</strong><br>
+                        This automated extraction captured {{ items|length }} data records from multiple sources using hub-mediated A2A communication.
+                        The data includes detailed information from websites, financial data, GitHub repositories, and news sources.
+                    </p>
+                </div>
+                
+                <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #bdc3c7; text-align: center; color: #7f8c8d; font-size: 12px;">
+                    <p style="margin: 5px 0;">🤖 Generated by MCP Multi-Agent System with Hub Architecture</p>
+                    <p style="margin: 5px 0;">📅 {{ now.strftime('%Y-%m-%d %H:%M:%S UTC') }}</p>
+                </div>
+            </div>
+        </body>
+        </html>
+"""
+
+EMAIL_REPORT_TEMPLATE = jinja2.Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True).from_string(
+    EMAIL_REPORT_TEMPLATE_SRC
+)
+
+# Simple notification email, rendered once with sentinels that are str.replace()d per send
+NOTIFICATION_TEMPLATE_SRC = """
+            <html>
+            <body style="font-family: Arial, sans-serif; margin: 20px; background-color: #f9f9f9; padding: 30px;">
+                <div style="max-width: 500px; margin: 0 auto; background-color: white; padding: 25px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                    <h2 style="color: #2c3e50; margin-bottom: 20px; border-bottom: 2px solid #3498db; padding-bottom: 10px;">🔔 Notification</h2>
+                    <div style="background-color: #ecf0f1; padding: 20px; border-radius: 5px; border-left: 4px solid #3498db;">
+                        <p style="margin: 0; color: #2c3e50; font-size: 16px; line-height: 1.5;">{body}</p>
+                    </div>
+                    <div style="margin-top: 20px; padding-top: 15px; border-top: 1px solid #bdc3c7; font-size: 12px; color: #7f8c8d; text-align: center;">
+                        <p style="margin: 0;">Priority: {priority} | Sent: {now}</p>
+                    </div>
+                </div>
+            </body>
+            </html>
+            """
+NOTIFICATION_BODY, NOTIFICATION_PRIORITY, NOTIFICATION_SENT = "\x00B\x00", "\x00P\x00", "\x00T\x00"
+NOTIFICATION_TEMPLATE = NOTIFICATION_TEMPLATE_SRC.format_map({
+    "body": NOTIFICATION_BODY,
+    "priority": NOTIFICATION_PRIORITY,
+    "now": NOTIFICATION_SENT
+})
+
+# Rendered notifications reused for repeated (body, priority); long bodies bypass the cache
+NOTIFICATION_CACHE_SIZE = 256
+NOTIFICATION_CACHE_MAX_BODY = 512
+
+def _notification_text(value: str) -> str:
+    """HTML-escape a notification field, replacing NULs so it can never contain a sentinel"""
+    return str(escape(value)).replace("\x00", "\ufffd")
+
+@lru_cache(maxsize=NOTIFICATION_CACHE_SIZE)
+def _render_notification(body: str, priority: str) -> str:
+    """Notification HTML for (body, priority), with the send time left as NOTIFICATION_SENT"""
+    return (
+        NOTIFICATION_TEMPLATE
+        .replace(NOTIFICATION_PRIORITY, _notification_text(priority.upper()))
+        .replace(NOTIFICATION_BODY, _notification_text(body))
+    )
+
+# Mail spooler: bounded queue drained by one worker per SMTP connection, each coalescing bursts
+MAIL_SPOOL_MAX_QUEUED = 1000
+MAIL_SPOOL_BATCH_SIZE = 20
+MAIL_SPOOL_COALESCE_WINDOW = 0.05
+MAIL_SPOOL_WORKERS = SMTP_MAX_ACTIVE_CONNECTIONS
+
+# SMTP sends admitted at once (a full batch for every spooler worker); further callers wait for a slot
+SEND_MAX_IN_FLIGHT = MAIL_SPOOL_WORKERS * MAIL_SPOOL_BATCH_SIZE
+
+# Tools advertised to the hub on registration
+AGENT_CAPABILITIES = [
+    {
+        "name": "send_extraction_notification",
+        "description": "Send real email notification with extracted data via SMTP",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "extracted_data": {"type": "array", "description": "Extracted data to include"},
+                "extraction_metadata": {"type": "object", "description": "Extraction metadata"},
+                "recipient": {"type": "string", "description": "Email recipient"}
+            },
+            "required": ["extracted_data", "extraction_metadata"]
+        }
+    },
+    {
+        "name": "send_notification",
+        "description": "Send simple notification email via SMTP",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "recipient": {"type": "string", "description": "Email recipient"},
+                "subject": {"type": "string", "description": "Email subject"},
+                "body": {"type": "string", "description": "Email body"},
+                "priority": {"type": "string", "description": "Email priority"}
+            },
+            "required": ["recipient", "subject", "body"]
+        }
+    },
+    {
+        "name": "test_smtp",
+        "description": "Test SMTP connection and configuration",
+        "parameters": {"type": "object", "properties": {}}
+    }
+]
+
+# Simulated emails: log entries buffered in memory and appended in batches off the event loop
+SIM_LOG_PATH = project_root / "data" / "sent_emails.log"
+SIM_LOG_MAX_QUEUED = 10000
+SIM_LOG_FLUSH_BATCH = 100
+SIM_LOG_FLUSH_INTERVAL = 1.0
+SIM_LOG_OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+# Recipients per SMTP transaction (RFC 5321 guarantees servers accept at least 100 RCPT)
+SMTP_BULK_CHUNK_SIZE = 50
+# A bulk send whose connection drops mid-batch resumes once on a fresh connection
+SMTP_BULK_RECONNECTS = 1
+
+# Upper bound on JSON embedded in an LLM prompt
+PROMPT_JSON_MAX_BYTES = 4096
+
+def _compact_json(obj: Any, max_bytes: int = PROMPT_JSON_MAX_BYTES) -> str:
+    """Whitespace-free JSON for LLM prompts, truncated to max_bytes to bound token count"""
+    raw = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=str)
+    if len(raw) <= max_bytes:
+        return raw.decode()
+    return raw[:max_bytes].decode(errors="ignore") + "...[truncated]"
+
+@dataclass(frozen=True, slots=True)
+class SMTPConfig:
+    """SMTP settings resolved from the environment"""
+    provider: str
+    smtp_server: str
+    smtp_port: int
+    email_user: str
+    email_password: str
+    use_tls: bool
+    configured: bool
+    connect_timeout: float = 5.0
+    read_timeout: float = 10.0
+
+def _load_smtp_config() -> SMTPConfig:
+    """Configure SMTP settings from environment variables"""
+    
+    # Check for Gmail configuration
+    gmail_user = os.getenv("GMAIL_USER")
+    gmail_password = os.getenv("GMAIL_APP_PASSWORD")  # Gmail App Password
+    
+    # Check for Outlook configuration  
+    outlook_user = os.getenv("OUTLOOK_USER")
+    outlook_password = os.getenv("OUTLOOK_PASSWORD")
+    
+    # Check for custom SMTP configuration (both formats supported)
+    custom_smtp_server = os.getenv("SMTP_SERVER") or os.getenv("EMAIL_SMTP_SERVER")
+    custom_smtp_user = os.getenv("SMTP_USER") or os.getenv("EMAIL_USER")
+    custom_smtp_password = os.getenv("SMTP_PASSWORD") or os.getenv("EMAIL_PASSWORD")
+    custom_smtp_port = os.getenv("SMTP_PORT") or os.getenv("EMAIL_SMTP_PORT")
+    
+    # Bounded connect/command timeouts so a TLS/plaintext mismatch fails fast instead of hanging
+    timeouts = {
+        "connect_timeout": float(os.getenv("SMTP_TIMEOUT", "5")),
+        "read_timeout": float(os.getenv("SMTP_READ_TIMEOUT", "10"))
+    }
+    
+    # Priority: Custom SMTP > Gmail > Outlook > Simulation
+    if custom_smtp_server and custom_smtp_user and custom_smtp_password:
+        return SMTPConfig(
+            provider="custom",
+            smtp_server=custom_smtp_server,
+            smtp_port=int(custom_smtp_port or 587),
+            email_user=custom_smtp_user,
+            email_password=custom_smtp_password,
+            use_tls=os.getenv("SMTP_USE_TLS", "true").lower() == "true",
+            configured=True,
+            **timeouts
+        )
+    elif gmail_user and gmail_password:
+        return SMTPConfig(
+            provider="gmail",
+            smtp_server="smtp.gmail.com",
+            smtp_port=587,
+            email_user=gmail_user,
+            email_password=gmail_password,
+            use_tls=True,
+            configured=True,
+            **timeouts
+        )
+    elif outlook_user and outlook_password:
+        return SMTPConfig(
+            provider="outlook",
+            smtp_server="smtp-mail.outlook.com",
+            smtp_port=587,
+            email_user=outlook_user,
+            email_password=outlook_password,
+            use_tls=True,
+            configured=True,
+            **timeouts
+        )
+    else:
+        # Fallback to simulation
+        return SMTPConfig(
+            provider="simulation",
+            smtp_server="localhost",
+            smtp_port=25,
+            email_user="noreply@localhost",
+            email_password="",
+            use_tls=False,
+            configured=False,
+            **timeouts
+        )
+
+# Environment is read once per process and shared by every agent instance
+_SMTP_CONFIG = _load_smtp_config()
+_DEFAULT_RECIPIENT = os.getenv("EMAIL_TO") or os.getenv("EMAIL_USER") or "rajpraba_1986@yahoo.com.sg"
+# EMAIL_USE_LLM=false sends template subjects/bodies without calling the LLM
+_EMAIL_USE_LLM = os.getenv("EMAIL_USE_LLM", "true").lower() == "true"
+
+@dataclass
+class PooledSMTPConnection:
+    """An authenticated SMTP session plus the number of messages sent over it"""
+    server: aiosmtplib.SMTP
+    messages_sent: int = 0
+
 class RealEmailAgent:
     """Real email agent that sends actual emails via SMTP"""
     
@@ -46,91 +447,114 @@ class RealEmailAgent:
         self.llm = llm
         self.hub_url = hub_url
         self.agent_port = agent_port
-        self.app = FastAPI()
+        self.app = FastAPI(default_response_class=ORJSONResponse)
         self.agent_id = f"real_email_agent_{agent_port}"
         
         # Email configuration - check multiple providers
-        self.smtp_config = self._configure_smtp()
+        self.smtp_config = _SMTP_CONFIG
+        
+        # One SSL context per process: CA bundle is loaded once, not per STARTTLS
+        self._ssl_ctx = ssl.create_default_context() if self.smtp_config.use_tls else None
+        
+        # Persistent SMTP connections, keyed by (host, port, user)
+        self._smtp_pool: Dict[tuple, asyncio.Queue] = {}
+        self._smtp_slots = asyncio.Semaphore(SMTP_MAX_ACTIVE_CONNECTIONS)
+        self._smtp_prewarming = False
+        self._send_slots = asyncio.Semaphore(SEND_MAX_IN_FLIGHT)
+        self.sends_in_flight = 0
+        
+        # Mail spooler, started with the app (sends go direct when it isn't running)
+        self._mail_q: Optional[asyncio.Queue] = None
+        self._mail_workers: List[asyncio.Task] = []
+        
+        # Simulated-email log writer, started on the first simulated send
+        self._sim_log_q: Optional[asyncio.Queue] = None
+        self._sim_log_task: Optional[asyncio.Task] = None
+        
+        # Shared HTTP client for hub callbacks, created on first use / app startup
+        self.http: Optional["aiohttp.ClientSession"] = None
+        
+        # Generated email content, keyed by extraction fingerprint
+        self._llm_content_cache: "OrderedDict[str, str]" = OrderedDict()
+        
+        # (monotonic refresh time, ISO timestamp, display timestamp), see _now_strings
+        self._now_cache = (float("-inf"), "", "")
         
         # Default recipient configuration
-        self.default_recipient = os.getenv("EMAIL_TO") or os.getenv("EMAIL_USER") or "rajpraba_1986@yahoo.com.sg"
+        self.default_recipient = _DEFAULT_RECIPIENT
+        self._use_llm = _EMAIL_USE_LLM
         
         self.setup_routes()
         
         print(f"✅ Real Email Agent initialized")
         print(f"   Agent ID: {self.agent_id}")
         print(f"   Default recipient: {self.default_recipient}")
-        print(f"   SMTP Server: {self.smtp_config['smtp_server']}")
-        print(f"   SMTP Configured: {'✅ Yes' if self.smtp_config['configured'] else '❌ No (will simulate)'}")
+        print(f"   SMTP Server: {self.smtp_config.smtp_server}")
+        print(f"   SMTP Configured: {'✅ Yes' if self.smtp_config.configured else '❌ No (will simulate)'}")
     
-    def _configure_smtp(self) -> Dict[str, Any]:
-        """Configure SMTP settings from environment variables"""
-        
-        # Check for Gmail configuration
-        gmail_user = os.getenv("GMAIL_USER")
-        gmail_password = os.getenv("GMAIL_APP_PASSWORD")  # Gmail App Password
+    def _http_session(self) -> "aiohttp.ClientSession":
+        """Return the shared HTTP session, creating it on first use"""
+        import aiohttp
         
-        # Check for Outlook configuration  
-        outlook_user = os.getenv("OUTLOOK_USER")
-        outlook_password = os.getenv("OUTLOOK_PASSWORD")
-        
-        # Check for custom SMTP configuration (both formats supported)
-        custom_smtp_server = os.getenv("SMTP_SERVER") or os.getenv("EMAIL_SMTP_SERVER")
-        custom_smtp_user = os.getenv("SMTP_USER") or os.getenv("EMAIL_USER")
-        custom_smtp_password = os.getenv("SMTP_PASSWORD") or os.getenv("EMAIL_PASSWORD")
-        custom_smtp_port = os.getenv("SMTP_PORT") or os.getenv("EMAIL_SMTP_PORT")
-        
-        # Priority: Custom SMTP > Gmail > Outlook > Simulation
-        if custom_smtp_server and custom_smtp_user and custom_smtp_password:
-            return {
-                "provider": "custom",
-                "smtp_server": custom_smtp_server,
-                "smtp_port": int(custom_smtp_port or 587),
-                "email_user": custom_smtp_user,
-                "email_password": custom_smtp_password,
-                "use_tls": os.getenv("SMTP_USE_TLS", "true").lower() == "true",
-                "configured": True
-            }
-        elif gmail_user and gmail_password:
-            return {
-                "provider": "gmail",
-                "smtp_server": "smtp.gmail.com",
-                "smtp_port": 587,
-                "email_user": gmail_user,
-                "email_password": gmail_password,
-                "use_tls": True,
-                "configured": True
-            }
-        elif outlook_user and outlook_password:
-            return {
-                "provider": "outlook",
-                "smtp_server": "smtp-mail.outlook.com",
-                "smtp_port": 587,
-                "email_user": outlook_user,
-                "email_password": outlook_password,
-                "use_tls": True,
-                "configured": True
-            }
-        else:
-            # Fallback to simulation
-            return {
-                "provider": "simulation",
-                "smtp_server": "localhost",
-                "smtp_port": 25,
-                "email_user": "noreply@localhost",
-                "email_password": "",
-                "use_tls": False,
-                "configured": False
-            }
+        if self.http is None or self.http.closed:
+            # One timeout for all hub calls; connect/read caps bound the wait on an unreachable hub
+            self.http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=10, connect=3, sock_read=5)
+            )
+        return self.http
     
     def setup_routes(self):
         """Setup FastAPI routes for MCP protocol"""
         
+        @self.app.on_event("startup")
+        async def open_http_session():
+            """Create the shared outbound HTTP session"""
+            self._http_session()
+        
+        @self.app.on_event("startup")
+        async def start_mail_spooler():
+            """Start the background mail spooler"""
+            self._mail_q = asyncio.Queue(maxsize=MAIL_SPOOL_MAX_QUEUED)
+            self._mail_workers = [asyncio.create_task(self._mail_worker()) for _ in range(MAIL_SPOOL_WORKERS)]
+        
+        @self.app.on_event("shutdown")
+        async def close_http_session():
+            """Close the shared outbound HTTP session"""
+            if self.http is not None:
+                await self.http.close()
+        
+        @self.app.on_event("shutdown")
+        async def stop_mail_spooler():
+            """Stop the background mail spooler, failing sends still waiting in its queue"""
+            if self._mail_workers:
+                workers, self._mail_workers = self._mail_workers, []
+                queued = []
+                while not self._mail_q.empty():
+                    queued.append(self._mail_q.get_nowait())
+                    self._mail_q.task_done()
+                self._fail_spooled(queued)
+                for worker in workers:
+                    worker.cancel()
+                # Each worker fails its in-flight batch as it unwinds
+                await asyncio.gather(*workers, return_exceptions=True)
+        
+        @self.app.on_event("shutdown")
+        async def stop_sim_log_writer():
+            """Flush and stop the simulated-email log writer"""
+            if self._sim_log_task is not None:
+                self._sim_log_task.cancel()
+                self._sim_log_task = None
+        
         @self.app.post("/mcp/request")
         async def handle_mcp_request(request: Request):
-            """Handle MCP requests"""
+            """Handle MCP requests (a JSON-RPC batch array is processed concurrently)"""
             try:
-                data = await request.json()
+                data = orjson.loads(await request.body())
+                if isinstance(data, list):
+                    if not data:
+                        return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Empty batch"}}
+                    return list(await asyncio.gather(*(self.process_mcp_request(item) for item in data)))
                 return await self.process_mcp_request(data)
             except Exception as e:
                 return {"jsonrpc": "2.0", "error": {"code": -1, "message": str(e)}}
@@ -142,23 +566,33 @@ class RealEmailAgent:
                 "status": "healthy", 
                 "agent_id": self.agent_id, 
                 "service": "email",
-                "smtp_configured": self.smtp_config['configured'],
-                "smtp_provider": self.smtp_config['provider']
+                "smtp_configured": self.smtp_config.configured,
+                "smtp_provider": self.smtp_config.provider,
+                "sends_in_flight": self.sends_in_flight
             }
         
-        @self.app.post("/send-email")
-        async def send_email_endpoint(request: Request):
-            """Direct email sending endpoint"""
+        @self.app.post("/send-email", status_code=202)
+        async def send_email_endpoint(request: Request, background: BackgroundTasks):
+            """Direct email sending endpoint - queues the send and returns immediately"""
+            try:
+                data = orjson.loads(await request.body())
+            except orjson.JSONDecodeError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+            if not isinstance(data, dict):
+                raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+            
             try:
-                data = await request.json()
-                result = await self.send_extraction_notification(
+                notification_id = str(uuid.uuid4())
+                background.add_task(
+                    self.send_extraction_notification,
                     extracted_data=data.get("extracted_data", []),
                     extraction_metadata=data.get("extraction_metadata", {}),
-                    recipient=data.get("recipient", self.default_recipient)
+                    recipient=data.get("recipient", self.default_recipient),
+                    notification_id=notification_id
                 )
-                return {"status": "success", "result": result}
+                return {"status": "queued", "notification_id": notification_id}
             except Exception as e:
-                return {"status": "error", "error": str(e)}
+                raise HTTPException(status_code=500, detail=str(e))
         
         @self.app.get("/smtp-test")
         async def smtp_test():
@@ -241,7 +675,7 @@ class RealEmailAgent:
     
     async def test_smtp_connection(self) -> Dict[str, Any]:
         """Test SMTP connection with timeout"""
-        if not self.smtp_config['configured']:
+        if not self.smtp_config.configured:
             return {
                 "status": "not_configured",
                 "message": "SMTP not configured, using simulation mode"
@@ -249,10 +683,7 @@ class RealEmailAgent:
         
         try:
             # Test SMTP connection with timeout
-            result = await asyncio.wait_for(
-                asyncio.get_event_loop().run_in_executor(None, self._test_smtp_sync),
-                timeout=10  # 10 second timeout
-            )
+            result = await asyncio.wait_for(self._test_smtp(), timeout=10)  # 10 second timeout
             return result
         except asyncio.TimeoutError:
             return {
@@ -265,26 +696,26 @@ class RealEmailAgent:
                 "message": f"SMTP test failed: {str(e)}"
             }
     
-    def _test_smtp_sync(self) -> Dict[str, Any]:
-        """Synchronous SMTP connection test with timeout"""
+    async def _test_smtp(self) -> Dict[str, Any]:
+        """SMTP connection test on the event loop"""
+        cfg = self.smtp_config
         try:
-            print(f"🔧 Testing SMTP connection to {self.smtp_config['smtp_server']}...")
+            print(f"🔧 Testing SMTP connection to {cfg.smtp_server}...")
             
-            if self.smtp_config['use_tls']:
-                server = smtplib.SMTP(self.smtp_config['smtp_server'], self.smtp_config['smtp_port'], timeout=5)
-                server.starttls()
-            else:
-                server = smtplib.SMTP(self.smtp_config['smtp_server'], self.smtp_config['smtp_port'], timeout=5)
+            conn = await self._open_smtp_connection()
             
-            server.login(self.smtp_config['email_user'], self.smtp_config['email_password'])
-            server.quit()
+            # Keep the authenticated test connection for the first real send
+            try:
+                self._idle_smtp_pool().put_nowait(conn)
+            except asyncio.QueueFull:
+                await self._close_smtp_quietly(conn.server)
             
             print("✅ SMTP connection test successful!")
             return {
                 "status": "success",
-                "message": f"Successfully connected to {self.smtp_config['provider']} SMTP",
-                "server": self.smtp_config['smtp_server'],
-                "provider": self.smtp_config['provider']
+                "message": f"Successfully connected to {cfg.provider} SMTP",
+                "server": cfg.smtp_server,
+                "provider": cfg.provider
             }
             
         except Exception as e:
@@ -292,13 +723,14 @@ class RealEmailAgent:
             return {
                 "status": "failed",
                 "message": str(e),
-                "server": self.smtp_config['smtp_server'],
-                "provider": self.smtp_config['provider']
+                "server": cfg.smtp_server,
+                "provider": cfg.provider
             }
     
     async def send_extraction_notification(self, extracted_data: List[Dict], 
                                          extraction_metadata: Dict, 
-                                         recipient: Optional[str] = None) -> Dict[str, Any]:
+                                         recipient: Optional[str] = None,
+                                         notification_id: Optional[str] = None) -> Dict[str, Any]:
         """Send email notification with extracted data"""
         try:
             recipient_email = recipient or self.default_recipient
@@ -307,27 +739,37 @@ class RealEmailAgent:
             print(f"   Recipient: {recipient_email}")
             print(f"   Data points: {len(extracted_data)}")
             
-            # Generate email content using Claude
-            subject = await self.generate_email_subject(extraction_metadata, len(extracted_data))
-            html_body = await self.generate_email_body(extracted_data, extraction_metadata)
+            # Generate subject and body using Claude while the SMTP handshake happens
+            if isinstance(extracted_data, list) and len(extracted_data) > 0:
+                subject, html_body, _ = await asyncio.gather(
+                    self.generate_email_subject(extraction_metadata, len(extracted_data)),
+                    self.generate_email_body(extracted_data, extraction_metadata),
+                    self._prewarm_smtp()
+                )
+            else:
+                # An empty extraction goes straight to the template body
+                html_body = self.generate_fallback_email_body(extracted_data or [], extraction_metadata)
+                subject, _ = await asyncio.gather(
+                    self.generate_email_subject(extraction_metadata, len(extracted_data)),
+                    self._prewarm_smtp()
+                )
             
             # Send email
             result = await self.send_email_smtp(
                 recipient=recipient_email,
                 subject=subject,
-                extracted_data=extracted_data,
-                metadata=extraction_metadata
+                html_body=html_body
             )
             
             return {
                 "status": "success" if result.get("sent") else "failed",
-                "notification_id": str(uuid.uuid4()),
+                "notification_id": notification_id or str(uuid.uuid4()),
                 "recipient": recipient_email,
                 "subject": subject,
                 "data_points": len(extracted_data),
-                "sent_at": datetime.now().isoformat(),
+                "sent_at": self._now_iso(),
                 "email_sent": result.get("sent", False),
-                "smtp_provider": self.smtp_config['provider'],
+                "smtp_provider": self.smtp_config.provider,
                 "method": result.get("method", "unknown"),
                 "error": result.get("error") if not result.get("sent") else None
             }
@@ -340,24 +782,54 @@ class RealEmailAgent:
                 "recipient": recipient_email if 'recipient_email' in locals() else "unknown"
             }
     
+    def _now_strings(self) -> tuple:
+        """Current time as (ISO, display) strings, refreshed at most every NOW_CACHE_TTL"""
+        t = time.monotonic()
+        if t - self._now_cache[0] > NOW_CACHE_TTL:
+            now = datetime.now()
+            self._now_cache = (t, now.isoformat(), now.strftime('%Y-%m-%d %H:%M:%S'))
+        return self._now_cache[1:]
+    
+    def _now_iso(self) -> str:
+        """Current time in ISO format for result dicts and logs"""
+        return self._now_strings()[0]
+    
+    @staticmethod
+    def _content_fingerprint(kind: str, *parts: Any) -> str:
+        """Stable hash of the inputs that determine a generated subject/body"""
+        payload = orjson.dumps([kind, *parts], option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _cache_llm_content(self, key: str, content: str) -> str:
+        """Remember generated content, evicting the least recently used entry"""
+        self._llm_content_cache[key] = content
+        if len(self._llm_content_cache) > LLM_CONTENT_CACHE_SIZE:
+            self._llm_content_cache.popitem(last=False)
+        return content
+    
+    def _cached_llm_content(self, key: str) -> Optional[str]:
+        """Return cached generated content, if any"""
+        content = self._llm_content_cache.get(key)
+        if content is not None:
+            self._llm_content_cache.move_to_end(key)
+        return content
+    
     async def generate_email_subject(self, metadata: Dict, data_count: int) -> str:
         """Generate email subject using Claude"""
+        if not self._use_llm:
+            return f"Data Extraction Report - {data_count} Records"
+        
+        key = self._content_fingerprint("subject", metadata, data_count)
+        cached = self._cached_llm_content(key)
+        if cached is not None:
+            return cached
+        
         try:
-            prompt = f"""
-            Generate a professional email subject line for a data extraction report.
-            
-            Extraction metadata: {json.dumps(metadata, indent=2)}
-            Number of data points: {data_count}
-            
-            Make it concise and informative. Include the source/target and data count.
-            Example: "Yahoo Finance Data Extraction Complete - 15 Stock Records"
-            
-            Return only the subject line, no quotes or extra text.
-            """
+            prompt = SUBJECT_PROMPT_TEMPLATE.format(metadata=_compact_json(metadata), data_count=data_count)
             
             response = await self.llm.ainvoke(prompt)
             subject = response.content.strip().strip('"').strip("'")
-            return subject[:100]  # Limit subject length
+            return self._cache_llm_content(key, subject[:100])  # Limit subject length
             
         except Exception as e:
             print(f"⚠️  Failed to generate subject, using default: {e}")
@@ -365,30 +837,24 @@ class RealEmailAgent:
     
     async def generate_email_body(self, extracted_data: List[Dict], metadata: Dict) -> str:
         """Generate HTML email body using Claude"""
+        if not self._use_llm:
+            return self.generate_fallback_email_body(extracted_data, metadata)
+        
+        # The body quotes the sample items, so they are part of the key, not just their schema
+        key = self._content_fingerprint("body", metadata, extracted_data[:3], len(extracted_data))
+        cached = self._cached_llm_content(key)
+        if cached is not None:
+            return cached
+        
         try:
-            prompt = f"""
-            Generate a clean, professional HTML email body for a data extraction report.
-            
-            Extraction metadata: {json.dumps(metadata, indent=2)}
-            Sample extracted data (first 3 items): {json.dumps(extracted_data[:3], indent=2)}
-            Total data points: {len(extracted_data)}
-            
-            Create an HTML email that includes:
-            1. Professional greeting
-            2. Brief summary of the extraction (source, timestamp, data count)
-            3. Clean HTML table showing the first 5 data items with proper formatting
-            4. Summary statistics if applicable (stock prices, changes, etc.)
-            5. Professional closing
-            
-            Use clean, professional HTML styling with inline CSS.
-            Keep it concise and business-appropriate.
-            Make the table responsive and well-formatted.
-            
-            Return only the HTML body content, no extra text or markdown.
-            """
+            prompt = BODY_PROMPT_TEMPLATE.format(
+                metadata=_compact_json(metadata),
+                sample=_compact_json(extracted_data[:3]),
+                data_count=len(extracted_data)
+            )
             
             response = await self.llm.ainvoke(prompt)
-            return response.content
+            return self._cache_llm_content(key, response.content)
             
         except Exception as e:
             print(f"⚠️  Failed to generate email body: {e}")
@@ -396,195 +862,18 @@ class RealEmailAgent:
     
     def generate_fallback_email_body(self, extracted_data: List[Dict], metadata: Dict) -> str:
         """Generate enhanced HTML email body with detailed extracted information"""
-        html_body = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; margin: 0; padding: 20px; background-color: #f5f5f5;">
-            <div style="max-width: 800px; margin: 0 auto; background-color: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                <h2 style="color: #2c3e50; margin-bottom: 20px; border-bottom: 2px solid #3498db; padding-bottom: 10px;">📊 Data Extraction Report</h2>
-                
-                <div style="background-color: #ecf0f1; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                    <h3 style="color: #34495e; margin-top: 0; margin-bottom: 15px;">📋 Extraction Summary</h3>
-                    <ul style="margin: 0; padding-left: 20px;">
-                        <li><strong>Source:</strong> {metadata.get('source', 'Hub-mediated A2A Communication')}</li>
-                        <li><strong>Data Count:</strong> {len(extracted_data)}</li>
-                        <li><strong>Method:</strong> {metadata.get('method', 'browserbase_hub')}</li>
-                        <li><strong>Source URL:</strong> {metadata.get('source_url', 'Multiple Sources')}</li>
-                        <li><strong>Extracted:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</li>
-                    </ul>
-                </div>
-                
-                <h3 style="color: #34495e; margin-bottom: 15px;">🌐 Extracted Data</h3>
-        """
-        
-        # Process each extracted item with detailed information
-        for i, item in enumerate(extracted_data):
-            url = item.get('url', 'N/A')
-            name = item.get('name', f'Item {i+1}')
-            title = item.get('title', 'No Title')
-            content = item.get('content', 'No content available')
-            extracted_data_detail = item.get('extracted_data', {})
-            
-            # Determine background color alternating
-            bg_color = "#f8f9fa" if i % 2 == 0 else "white"
-            
-            html_body += f"""
-                <div style="background-color: {bg_color}; border: 1px solid #ddd; border-radius: 8px; margin: 15px 0; padding: 20px;">
-                    <h4 style="color: #2c3e50; margin: 0 0 10px 0; border-bottom: 1px solid #bdc3c7; padding-bottom: 5px;">
-                        🔗 {name}
-                    </h4>
-                    <table style="width: 100%; border-collapse: collapse; margin: 10px 0;">
-                        <tr>
-                            <td style="padding: 8px; font-weight: bold; color: #34495e; width: 80px; vertical-align: top;">URL:</td>
-                            <td style="padding: 8px; color: #2c3e50;"><a href="{url}" style="color: #3498db; text-decoration: none;">{url}</a></td>
-                        </tr>
-                        <tr>
-                            <td style="padding: 8px; font-weight: bold; color: #34495e; width: 80px; vertical-align: top;">Title:</td>
-                            <td style="padding: 8px; color: #2c3e50; font-weight: 600;">{title}</td>
-                        </tr>
-                        <tr>
-                            <td style="padding: 8px; font-weight: bold; color: #34495e; width: 80px; vertical-align: top;">Content:</td>
-                            <td style="padding: 8px; color: #2c3e50;">{content}</td>
-                        </tr>
-            """
-            
-            # Add detailed extracted data based on type
-            if extracted_data_detail:
-                html_body += """
-                        <tr>
-                            <td style="padding: 8px; font-weight: bold; color: #34495e; width: 80px; vertical-align: top;">Details:</td>
-                            <td style="padding: 8px; color: #2c3e50;">
-                """
-                
-                # Format different types of extracted data
-                if 'repositories' in extracted_data_detail:
-                    # GitHub repositories
-                    repos = extracted_data_detail.get('repositories', [])
-                    languages = extracted_data_detail.get('languages', [])
-                    stats = extracted_data_detail.get('stats', {})
-                    
-                    html_body += """
-                                <div style="background: #e8f6fd; padding: 10px; border-radius: 4px; margin: 5px 0;">
-                                    <strong>📚 GitHub Profile Details:</strong><br>
-                    """
-                    if repos:
-                        html_body += f"• <strong>Repositories:</strong> {', '.join(repos[:5])}"
-                        if len(repos) > 5:
-                            html_body += f" (and {len(repos) - 5} more)"
-                        html_body += "<br>"
-                    
-                    if languages:
-                        html_body += f"• <strong>Languages:</strong> {', '.join(languages)}<br>"
-                    
-                    if stats:
-                        html_body += f"• <strong>Public Repos:</strong> {stats.get('public_repos', 'N/A')}<br>"
-                        html_body += f"• <strong>Followers:</strong> {stats.get('followers', 'N/A')}<br>"
-                        html_body += f"• <strong>Following:</strong> {stats.get('following', 'N/A')}<br>"
-                    
-                    html_body += "</div>"
-                
-                elif 'stock_data' in extracted_data_detail:
-                    # Stock/Financial data
-                    stock_data = extracted_data_detail.get('stock_data', {})
-                    key_stats = extracted_data_detail.get('key_stats', {})
-                    
-                    html_body += """
-                                <div style="background: #e8f8f5; padding: 10px; border-radius: 4px; margin: 5px 0;">
-                                    <strong>📈 Financial Data:</strong><br>
-                    """
-                    if stock_data:
-                        html_body += f"• <strong>Symbol:</strong> {stock_data.get('symbol', 'N/A')}<br>"
-                        html_body += f"• <strong>Price:</strong> {stock_data.get('price', 'N/A')}<br>"
-                        html_body += f"• <strong>Change:</strong> {stock_data.get('change', 'N/A')} ({stock_data.get('change_percent', 'N/A')})<br>"
-                        html_body += f"• <strong>Volume:</strong> {stock_data.get('volume', 'N/A')}<br>"
-                        html_body += f"• <strong>Market Cap:</strong> {stock_data.get('market_cap', 'N/A')}<br>"
-                    
-                    if key_stats:
-                        html_body += f"• <strong>P/E Ratio:</strong> {key_stats.get('pe_ratio', 'N/A')}<br>"
-                        html_body += f"• <strong>Dividend Yield:</strong> {key_stats.get('dividend_yield', 'N/A')}<br>"
-                        html_body += f"• <strong>52W High:</strong> {key_stats.get('52_week_high', 'N/A')}<br>"
-                        html_body += f"• <strong>52W Low:</strong> {key_stats.get('52_week_low', 'N/A')}<br>"
-                    
-                    html_body += "</div>"
-                
-                elif 'top_stories' in extracted_data_detail:
-                    # News/Hacker News stories
-                    stories = extracted_data_detail.get('top_stories', [])
-                    
-                    html_body += """
-                                <div style="background: #fff4e6; padding: 10px; border-radius: 4px; margin: 5px 0;">
-                                    <strong>📰 Top Stories:</strong><br>
-                    """
-                    for j, story in enumerate(stories[:3]):
-                        html_body += f"• <strong>{story.get('title', 'No title')}</strong><br>"
-                        html_body += f"  Points: {story.get('points', 'N/A')} | Comments: {story.get('comments', 'N/A')}<br>"
-                    
-                    if len(stories) > 3:
-                        html_body += f"... and {len(stories) - 3} more stories<br>"
-                    
-                    html_body += "</div>"
-                
-                else:
-                    # Generic structured data
-                    html_body += """
-                                <div style="background: #f0f0f0; padding: 10px; border-radius: 4px; margin: 5px 0;">
-                                    <strong>📋 Structured Data:</strong><br>
-                    """
-                    for key, value in list(extracted_data_detail.items())[:5]:
-                        if isinstance(value, (list, dict)):
-                            html_body += f"• <strong>{key.title()}:</strong> {str(value)[:100]}{'...' if len(str(value)) > 100 else ''}<br>"
-                        else:
-                            html_body += f"• <strong>{key.title()}:</strong> {value}<br>"
-                    html_body += "</div>"
-                
-                html_body += """
-                            </td>
-                        </tr>
-                """
-            
-            html_body += """
-                    </table>
-                </div>
-            """
-        
-        html_body += f"""
-                <div style="margin: 30px 0; padding: 20px; background-color: #e8f6fd; border-left: 4px solid #3498db; border-radius: 0 5px 5px 0;">
-                    <p style="margin: 0; color: #2c3e50;">
-                        <strong>🎯 Report Summary:</strong><br>
-                        This automated extraction captured {len(extracted_data)} data records from multiple sources using hub-mediated A2A communication.
-                        The data includes detailed information from websites, financial data, GitHub repositories, and news sources.
-                    </p>
-                </div>
-                
-                <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #bdc3c7; text-align: center; color: #7f8c8d; font-size: 12px;">
-                    <p style="margin: 5px 0;">🤖 Generated by MCP Multi-Agent System with Hub Architecture</p>
-                    <p style="margin: 5px 0;">📅 {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html_body
+        return EMAIL_REPORT_TEMPLATE.render(items=extracted_data, metadata=metadata, now=datetime.now())
     
-    async def send_email_smtp(self, recipient: str, subject: str, extracted_data: List[Dict], 
-                             metadata: Dict) -> Dict[str, Any]:
-        """Send email via SMTP with extraction data"""
+    async def send_email_smtp(self, recipient: str, subject: str, html_body: str) -> Dict[str, Any]:
+        """Send email via SMTP with a pre-rendered HTML body"""
         try:
             print(f"📤 Sending email to {recipient}")
             print(f"   Subject: {subject}")
-            print(f"   SMTP Provider: {self.smtp_config['provider']}")
-            
-            # Generate HTML body from the data
-            if isinstance(extracted_data, list) and len(extracted_data) > 0:
-                html_body = await self.generate_email_body(extracted_data, metadata)
-            else:
-                html_body = self.generate_fallback_email_body(extracted_data or [], metadata)
+            print(f"   SMTP Provider: {self.smtp_config.provider}")
             
-            if self.smtp_config['configured']:
+            if self.smtp_config.configured:
                 # Send real email via SMTP
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(None, self._send_email_smtp_sync, recipient, subject, html_body)
-                return result
+                return await self._send_email_smtp_async(recipient, subject, html_body)
             else:
                 # Fallback to simulation
                 return await self._send_email_simulation(recipient, subject, html_body)
@@ -598,51 +887,333 @@ class RealEmailAgent:
                 "method": "failed"
             }
     
-    def _send_email_smtp_sync(self, recipient: str, subject: str, html_body: str) -> Dict[str, Any]:
-        """Send email synchronously via SMTP"""
+    async def _open_smtp_connection(self) -> PooledSMTPConnection:
+        """Open and authenticate a new SMTP connection"""
+        cfg = self.smtp_config
+        print(f"🔗 Connecting to SMTP server: {cfg.smtp_server}:{cfg.smtp_port}")
+        
+        server = aiosmtplib.SMTP(
+            hostname=cfg.smtp_server,
+            port=cfg.smtp_port,
+            start_tls=cfg.use_tls,
+            tls_context=self._ssl_ctx,
+            timeout=cfg.read_timeout
+        )
+        await server.connect(timeout=cfg.connect_timeout)
+        self._enable_tcp_keepalive(server)
         try:
-            print(f"🔗 Connecting to SMTP server: {self.smtp_config['smtp_server']}:{self.smtp_config['smtp_port']}")
-            
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["From"] = self.smtp_config['email_user']
-            message["To"] = recipient
-            message["Subject"] = subject
-            
-            # Add HTML body
-            html_part = MIMEText(html_body, "html")
-            message.attach(html_part)
-            
-            # Connect and send
-            if self.smtp_config['use_tls']:
-                server = smtplib.SMTP(self.smtp_config['smtp_server'], self.smtp_config['smtp_port'])
-                server.starttls()
-            else:
-                server = smtplib.SMTP(self.smtp_config['smtp_server'], self.smtp_config['smtp_port'])
+            await server.login(cfg.email_user, cfg.email_password)
+        except Exception:
+            await self._close_smtp_quietly(server)
+            raise
+        return PooledSMTPConnection(server)
+    
+    @staticmethod
+    def _enable_tcp_keepalive(server: aiosmtplib.SMTP):
+        """Turn on TCP keepalive for an SMTP connection (options missing on this OS are skipped)"""
+        sock = server.transport.get_extra_info("socket") if server.transport else None
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for option, value in (
+                ("TCP_KEEPIDLE", SMTP_KEEPALIVE_IDLE),
+                ("TCP_KEEPINTVL", SMTP_KEEPALIVE_INTERVAL),
+                ("TCP_KEEPCNT", SMTP_KEEPALIVE_COUNT),
+            ):
+                if hasattr(socket, option):
+                    sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+        except OSError as e:
+            print(f"⚠️  Could not enable TCP keepalive on SMTP socket: {e}")
+    
+    @staticmethod
+    async def _close_smtp_quietly(server: aiosmtplib.SMTP):
+        """Close an SMTP connection, ignoring errors from an already-dead socket"""
+        try:
+            await server.quit()
+        except Exception:
+            server.close()
+    
+    def _idle_smtp_pool(self) -> asyncio.Queue:
+        """Idle connection queue for the configured (host, port, user)"""
+        cfg = self.smtp_config
+        key = (cfg.smtp_server, cfg.smtp_port, cfg.email_user)
+        pool = self._smtp_pool.get(key)
+        if pool is None:
+            pool = self._smtp_pool[key] = asyncio.Queue(maxsize=SMTP_POOL_MAX_IDLE)
+        return pool
+    
+    async def _prewarm_smtp(self):
+        """Open an SMTP connection ahead of a send so the handshake overlaps other work
+        
+        Skipped when a connection is idle, another prewarm is in flight or every
+        SMTP_WORKERS slot is busy, so a burst of notifications opens at most one.
+        """
+        if not self.smtp_config.configured or self._smtp_prewarming or self._smtp_slots.locked():
+            return
+        pool = self._idle_smtp_pool()
+        if not pool.empty():
+            return
+        self._smtp_prewarming = True
+        try:
+            async with self._smtp_slots:
+                conn = await self._open_smtp_connection()
+        except Exception as e:
+            print(f"⚠️  SMTP prewarm failed: {e}")
+            return
+        finally:
+            self._smtp_prewarming = False
+        try:
+            pool.put_nowait(conn)
+        except asyncio.QueueFull:
+            await self._close_smtp_quietly(conn.server)
+    
+    @asynccontextmanager
+    async def _acquire_smtp(self, messages: int = 1):
+        """Borrow an authenticated SMTP connection from the pool, opening one if none is idle"""
+        async with self._smtp_slots:
+            async with self._pooled_smtp(messages) as server:
+                yield server
+    
+    @asynccontextmanager
+    async def _pooled_smtp(self, messages: int):
+        """Take a live connection from the idle pool (or open one) and return it afterwards"""
+        pool = self._idle_smtp_pool()
+        
+        conn = None
+        while conn is None:
+            try:
+                conn = pool.get_nowait()
+            except asyncio.QueueEmpty:
+                conn = await self._open_smtp_connection()
+                break
+            # Verify an idle connection is still alive before reusing it
+            try:
+                await conn.server.noop()
+            except (aiosmtplib.SMTPException, OSError):
+                await self._close_smtp_quietly(conn.server)
+                conn = None
+        
+        try:
+            yield conn.server
+        except Exception:
+            await self._close_smtp_quietly(conn.server)
+            raise
+        
+        conn.messages_sent += messages
+        if conn.messages_sent >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+            await self._close_smtp_quietly(conn.server)
+            return
+        try:
+            await conn.server.rset()
+            pool.put_nowait(conn)
+        except (asyncio.QueueFull, aiosmtplib.SMTPException, OSError):
+            await self._close_smtp_quietly(conn.server)
+    
+    @staticmethod
+    def _smtp_reconnect_delay(attempt: int) -> float:
+        """Exponential backoff before retrying a send on a fresh SMTP connection"""
+        return min(SMTP_RECONNECT_BACKOFF * (2 ** attempt), SMTP_RECONNECT_MAX_BACKOFF)
+    
+    def _build_message(self, recipient: str, subject: str, html_body: str) -> EmailMessage:
+        """Build the HTML email message (sent as bytes, no intermediate string copy)"""
+        message = EmailMessage()
+        message["From"] = self.smtp_config.email_user
+        message["To"] = recipient
+        message["Subject"] = subject
+        
+        # Plain-text part for clients without HTML support, then the HTML body
+        message.set_content("HTML email", subtype="plain")
+        message.add_alternative(html_body, subtype="html")
+        return message
+    
+    def _smtp_sent_result(self, recipient: str, subject: str) -> Dict[str, Any]:
+        """Result for a message accepted by the SMTP server"""
+        return {
+            "sent": True,
+            "recipient": recipient,
+            "subject": subject,
+            "method": f"{self.smtp_config.provider}_smtp",
+            "smtp_server": self.smtp_config.smtp_server,
+            "timestamp": self._now_iso()
+        }
+    
+    @staticmethod
+    def _smtp_failed_result(recipient: str, error: Exception) -> Dict[str, Any]:
+        """Result for a message the SMTP server did not accept"""
+        return {
+            "sent": False,
+            "error": str(error),
+            "recipient": recipient,
+            "method": "smtp_failed"
+        }
+    
+    async def _send_email_smtp_async(self, recipient: str, subject: str, html_body: str) -> Dict[str, Any]:
+        """Send email via SMTP, waiting for a free slot when SEND_MAX_IN_FLIGHT sends are pending"""
+        async with self._send_slots:
+            self.sends_in_flight += 1
+            try:
+                return await self._send_email_smtp_now(recipient, subject, html_body)
+            finally:
+                self.sends_in_flight -= 1
+    
+    async def _send_email_smtp_now(self, recipient: str, subject: str, html_body: str) -> Dict[str, Any]:
+        """Send email via SMTP without leaving the event loop"""
+        if self._mail_workers:
+            return await self._spool_email(recipient, subject, html_body)
+        
+        try:
+            message = self._build_message(recipient, subject, html_body)
             
-            # Login and send
-            server.login(self.smtp_config['email_user'], self.smtp_config['email_password'])
-            text = message.as_string()
-            server.sendmail(self.smtp_config['email_user'], recipient, text)
-            server.quit()
+            # Send over a pooled, already-authenticated connection
+            for attempt in range(SMTP_RECONNECT_ATTEMPTS):
+                try:
+                    async with self._acquire_smtp() as server:
+                        await server.send_message(message)
+                    break
+                except SMTP_RECONNECT_ERRORS:
+                    if attempt == SMTP_RECONNECT_ATTEMPTS - 1:
+                        raise
+                    await asyncio.sleep(self._smtp_reconnect_delay(attempt))
             
-            print(f"✅ Email sent successfully via {self.smtp_config['provider']} SMTP!")
+            print(f"✅ Email sent successfully via {self.smtp_config.provider} SMTP!")
+            return self._smtp_sent_result(recipient, subject)
+            
+        except Exception as e:
+            print(f"❌ SMTP sending failed: {e}")
+            return self._smtp_failed_result(recipient, e)
+    
+    async def _spool_email(self, recipient: str, subject: str, html_body: str) -> Dict[str, Any]:
+        """Queue a message for the spooler and wait for its delivery result"""
+        # Build the MIME message here so the worker holds a connection only while sending
+        message = self._build_message(recipient, subject, html_body)
+        result = asyncio.get_running_loop().create_future()
+        await self._mail_q.put((recipient, subject, message, result))
+        return await result
+    
+    async def _mail_worker(self):
+        """Drain the mail queue, coalescing bursts into batches each sent over one connection"""
+        while True:
+            batch = [await self._mail_q.get()]
+            try:
+                try:
+                    while len(batch) < MAIL_SPOOL_BATCH_SIZE:
+                        batch.append(await asyncio.wait_for(self._mail_q.get(), MAIL_SPOOL_COALESCE_WINDOW))
+                except asyncio.TimeoutError:
+                    pass
+                
+                await self._deliver_batch(batch)
+            except asyncio.CancelledError:
+                self._fail_spooled(batch)
+                raise
+            finally:
+                for _ in batch:
+                    self._mail_q.task_done()
+    
+    @staticmethod
+    def _fail_spooled(items: List[tuple]):
+        """Fail the callers of spooled messages that will not be sent"""
+        for _, _, _, result in items:
+            if not result.done():
+                result.set_exception(RuntimeError("Mail spooler stopped before the message was sent"))
+    
+    async def _deliver_batch(self, batch: List[tuple]):
+        """Send a batch of spooled messages over a single pooled SMTP connection"""
+        pending = list(batch)
+        try:
+            for attempt in range(SMTP_RECONNECT_ATTEMPTS):
+                try:
+                    async with self._acquire_smtp(messages=len(pending)) as server:
+                        while pending:
+                            recipient, subject, message, result = pending[0]
+                            try:
+                                await server.send_message(message)
+                            except SMTP_RECONNECT_ERRORS:
+                                raise
+                            except SMTP_MESSAGE_ERRORS as e:
+                                # Only this message failed; the rest of the batch still goes out
+                                print(f"❌ SMTP rejected spooled email to {recipient}: {e}")
+                                outcome = self._smtp_failed_result(recipient, e)
+                            else:
+                                outcome = self._smtp_sent_result(recipient, subject)
+                            pending.pop(0)
+                            if not result.done():
+                                result.set_result(outcome)
+                    break
+                except SMTP_RECONNECT_ERRORS:
+                    # Messages already accepted stay sent; the rest go out on a fresh connection
+                    if attempt == SMTP_RECONNECT_ATTEMPTS - 1:
+                        raise
+                    await asyncio.sleep(self._smtp_reconnect_delay(attempt))
+            
+            print(f"✅ Spooled batch of {len(batch)} email(s) sent via {self.smtp_config.provider} SMTP!")
+            
+        except Exception as e:
+            # Connection-level failure: nothing left in the batch can be sent
+            print(f"❌ SMTP sending failed for {len(pending)} spooled email(s): {e}")
+            for recipient, _, _, result in pending:
+                if not result.done():
+                    result.set_result(self._smtp_failed_result(recipient, e))
+    
+    async def send_bulk(self, recipients: List[str], subject: str, html_body: str) -> Dict[str, Any]:
+        """Send the same email to many recipients (BCC) over one pooled SMTP session"""
+        if not recipients:
+            return {
+                "sent": False,
+                "error": "No recipients",
+                "recipients": 0,
+                "method": "smtp_failed"
+            }
+        
+        cfg = self.smtp_config
+        if not cfg.configured:
+            return await self._send_email_simulation(", ".join(recipients), subject, html_body)
+        
+        async with self._send_slots:
+            self.sends_in_flight += 1
+            try:
+                return await self._send_bulk_now(recipients, subject, html_body)
+            finally:
+                self.sends_in_flight -= 1
+    
+    async def _send_bulk_now(self, recipients: List[str], subject: str, html_body: str) -> Dict[str, Any]:
+        """Send a bulk email in recipient chunks, resuming on a fresh connection if one drops"""
+        cfg = self.smtp_config
+        try:
+            # Recipients go in the envelope only; the visible To is the sender
+            message = self._build_message(cfg.email_user, subject, html_body)
+            
+            pending = [recipients[i:i + SMTP_BULK_CHUNK_SIZE] for i in range(0, len(recipients), SMTP_BULK_CHUNK_SIZE)]
+            for attempt in range(SMTP_BULK_RECONNECTS + 1):
+                try:
+                    async with self._acquire_smtp(messages=len(pending)) as server:
+                        while pending:
+                            await server.send_message(message, recipients=pending[0])
+                            pending.pop(0)
+                    break
+                except SMTP_RECONNECT_ERRORS:
+                    # Chunks already accepted stay sent; the rest go out on a fresh connection
+                    if attempt == SMTP_BULK_RECONNECTS:
+                        raise
+                    await asyncio.sleep(self._smtp_reconnect_delay(attempt))
+            
+            print(f"✅ Bulk email sent to {len(recipients)} recipients via {cfg.provider} SMTP!")
             
             return {
                 "sent": True,
-                "recipient": recipient,
+                "recipients": len(recipients),
                 "subject": subject,
-                "method": f"{self.smtp_config['provider']}_smtp",
-                "smtp_server": self.smtp_config['smtp_server'],
-                "timestamp": datetime.now().isoformat()
+                "method": f"{cfg.provider}_smtp_bulk",
+                "smtp_server": cfg.smtp_server,
+                "timestamp": self._now_iso()
             }
             
         except Exception as e:
-            print(f"❌ SMTP sending failed: {e}")
+            print(f"❌ Bulk SMTP sending failed: {e}")
             return {
                 "sent": False,
                 "error": str(e),
-                "recipient": recipient,
+                "recipients": len(recipients),
                 "method": "smtp_failed"
             }
     
@@ -653,39 +1224,119 @@ class RealEmailAgent:
         # Simulate email sending delay
         await asyncio.sleep(1)
         
-        # Save email to file for demonstration
-        email_log_path = project_root / "data" / "sent_emails.log"
-        email_log_path.parent.mkdir(exist_ok=True)
-        
-        with open(email_log_path, "a", encoding="utf-8") as f:
-            f.write(f"\n{'='*80}\n")
-            f.write(f"SIMULATED EMAIL\n")
-            f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-            f.write(f"To: {recipient}\n")
-            f.write(f"Subject: {subject}\n")
-            f.write(f"Body:\n{html_body}\n")
-            f.write(f"{'='*80}\n")
-        
-        print(f"📝 Email simulated and logged to: {email_log_path}")
+        # Save email to file for demonstration (written in batches by the log writer)
+        timestamp = self._now_iso()
+        entry = (
+            f"\n{'='*80}\n"
+            f"SIMULATED EMAIL\n"
+            f"Timestamp: {timestamp}\n"
+            f"To: {recipient}\n"
+            f"Subject: {subject}\n"
+            f"Body:\n{html_body}\n"
+            f"{'='*80}\n"
+        )
+        # Identical consecutive emails are written once, followed by a repeat count
+        key = (recipient, subject, hashlib.blake2b(html_body.encode("utf-8"), digest_size=8).digest())
+        try:
+            self._sim_log_queue().put_nowait((key, entry.encode("utf-8")))
+            print(f"📝 Email simulated and logged to: {SIM_LOG_PATH}")
+        except asyncio.QueueFull:
+            print("⚠️  Simulated email log backlog full, entry dropped")
         
         return {
             "sent": False,
             "recipient": recipient,
             "subject": subject,
             "method": "simulated",
-            "log_file": str(email_log_path),
-            "timestamp": datetime.now().isoformat(),
+            "log_file": str(SIM_LOG_PATH),
+            "timestamp": timestamp,
             "note": "SMTP not configured - email was simulated"
         }
     
+    def _sim_log_queue(self) -> asyncio.Queue:
+        """Return the simulated-email log queue, starting its writer task on first use"""
+        if self._sim_log_task is None or self._sim_log_task.done():
+            self._sim_log_q = asyncio.Queue(maxsize=SIM_LOG_MAX_QUEUED)
+            self._sim_log_task = asyncio.create_task(self._sim_log_writer(self._sim_log_q))
+        return self._sim_log_q
+    
+    async def _sim_log_writer(self, queue: asyncio.Queue):
+        """Buffer simulated-email log entries and append them in batches"""
+        loop = asyncio.get_running_loop()
+        buffer: List[bytes] = []
+        deadline = None
+        last_key, repeats = None, 0
+        
+        def add(item: tuple):
+            """Buffer an entry, or count it if it repeats the previous one"""
+            nonlocal last_key, repeats
+            key, data = item
+            if key == last_key:
+                repeats += 1
+                return
+            close_repeats()
+            buffer.append(data)
+            last_key = key
+        
+        def close_repeats():
+            """Record how often the previous entry repeated since it was last written"""
+            nonlocal repeats
+            if repeats:
+                buffer.append(f"Repeated: {repeats}x\n".encode("utf-8"))
+                repeats = 0
+        
+        # One append-only descriptor for the writer's lifetime; O_APPEND keeps writes atomic
+        SIM_LOG_PATH.parent.mkdir(exist_ok=True)
+        fd = os.open(SIM_LOG_PATH, SIM_LOG_OPEN_FLAGS, 0o644)
+        flush = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(deadline - loop.time(), 0)
+                try:
+                    add(await asyncio.wait_for(queue.get(), timeout))
+                    if deadline is None:
+                        deadline = loop.time() + SIM_LOG_FLUSH_INTERVAL
+                    if len(buffer) < SIM_LOG_FLUSH_BATCH:
+                        continue
+                except asyncio.TimeoutError:
+                    pass
+                
+                close_repeats()
+                entries, buffer, deadline = buffer, [], None
+                if entries:
+                    flush = loop.run_in_executor(None, self._append_sim_log, fd, entries)
+                    await asyncio.shield(flush)
+        except asyncio.CancelledError:
+            # Shutdown: let an in-flight flush finish, then write out whatever is still buffered or queued
+            if flush is not None and not flush.done():
+                await flush
+            while not queue.empty():
+                add(queue.get_nowait())
+            close_repeats()
+            if buffer:
+                self._append_sim_log(fd, buffer)
+            raise
+        finally:
+            os.close(fd)
+    
+    @staticmethod
+    def _append_sim_log(fd: int, entries: List[bytes]):
+        """Append encoded entries to the simulated-email log, one gather-write per batch"""
+        for i in range(0, len(entries), SIM_LOG_FLUSH_BATCH):
+            chunk = entries[i:i + SIM_LOG_FLUSH_BATCH]
+            if not hasattr(os, "writev"):
+                os.write(fd, b"".join(chunk))
+                continue
+            written = os.writev(fd, chunk)
+            if written < sum(map(len, chunk)):
+                os.write(fd, b"".join(chunk)[written:])
+    
     async def send_simple_email(self, recipient: str, subject: str, html_body: str) -> Dict[str, Any]:
-        """Send simple email with pre-formatted HTML body"""
+        """Send simple email with pre-formatted HTML body over the pooled SMTP connections"""
         try:
-            if self.smtp_config['configured']:
+            if self.smtp_config.configured:
                 # Send real email via SMTP
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(None, self._send_email_smtp_sync, recipient, subject, html_body)
-                return result
+                return await self._send_email_smtp_async(recipient, subject, html_body)
             else:
                 # Fallback to simulation
                 return await self._send_email_simulation(recipient, subject, html_body)
@@ -702,21 +1353,8 @@ class RealEmailAgent:
                                body: str, priority: str = "normal") -> Dict[str, Any]:
         """Send simple notification email"""
         try:
-            simple_html = f"""
-            <html>
-            <body style="font-family: Arial, sans-serif; margin: 20px; background-color: #f9f9f9; padding: 30px;">
-                <div style="max-width: 500px; margin: 0 auto; background-color: white; padding: 25px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                    <h2 style="color: #2c3e50; margin-bottom: 20px; border-bottom: 2px solid #3498db; padding-bottom: 10px;">🔔 Notification</h2>
-                    <div style="background-color: #ecf0f1; padding: 20px; border-radius: 5px; border-left: 4px solid #3498db;">
-                        <p style="margin: 0; color: #2c3e50; font-size: 16px; line-height: 1.5;">{body}</p>
-                    </div>
-                    <div style="margin-top: 20px; padding-top: 15px; border-top: 1px solid #bdc3c7; font-size: 12px; color: #7f8c8d; text-align: center;">
-                        <p style="margin: 0;">Priority: {priority.upper()} | Sent: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
+            render = _render_notification if len(body) <= NOTIFICATION_CACHE_MAX_BODY else _render_notification.__wrapped__
+            simple_html = render(body, priority).replace(NOTIFICATION_SENT, self._now_strings()[1])
             
             result = await self.send_simple_email(recipient, subject, simple_html)
             
@@ -726,9 +1364,9 @@ class RealEmailAgent:
                 "recipient": recipient,
                 "subject": subject,
                 "priority": priority,
-                "sent_at": datetime.now().isoformat(),
+                "sent_at": self._now_iso(),
                 "method": result.get("method"),
-                "smtp_provider": self.smtp_config['provider']
+                "smtp_provider": self.smtp_config.provider
             }
             
         except Exception as e:
@@ -739,6 +1377,8 @@ class RealEmailAgent:
     
     async def register_with_hub(self):
         """Register this agent with the MCP hub"""
+        import aiohttp
+        
         try:
             registration_request = {
                 "jsonrpc": "2.0",
@@ -751,56 +1391,37 @@ class RealEmailAgent:
                     "host": "localhost",
                     "port": self.agent_port,
                     "endpoint_url": f"http://localhost:{self.agent_port}/mcp/request",
-                    "capabilities": [
-                        {
-                            "name": "send_extraction_notification",
-                            "description": "Send real email notification with extracted data via SMTP",
-                            "parameters": {
-                                "type": "object",
-                                "properties": {
-                                    "extracted_data": {"type": "array", "description": "Extracted data to include"},
-                                    "extraction_metadata": {"type": "object", "description": "Extraction metadata"},
-                                    "recipient": {"type": "string", "description": "Email recipient"}
-                                },
-                                "required": ["extracted_data", "extraction_metadata"]
-                            }
-                        },
-                        {
-                            "name": "send_notification",
-                            "description": "Send simple notification email via SMTP",
-                            "parameters": {
-                                "type": "object",
-                                "properties": {
-                                    "recipient": {"type": "string", "description": "Email recipient"},
-                                    "subject": {"type": "string", "description": "Email subject"},
-                                    "body": {"type": "string", "description": "Email body"},
-                                    "priority": {"type": "string", "description": "Email priority"}
-                                },
-                                "required": ["recipient", "subject", "body"]
-                            }
-                        },
-                        {
-                            "name": "test_smtp",
-                            "description": "Test SMTP connection and configuration",
-                            "parameters": {"type": "object", "properties": {}}
-                        }
-                    ],
+                    "capabilities": AGENT_CAPABILITIES,
                     "status": "active",
                     "metadata": {
-                        "smtp_provider": self.smtp_config['provider'],
-                        "smtp_configured": self.smtp_config['configured']
+                        "smtp_provider": self.smtp_config.provider,
+                        "smtp_configured": self.smtp_config.configured
                     }
                 }
             }
             
-            async with aiohttp.ClientSession() as session:
-                hub_mcp_url = "http://localhost:5000/mcp"
-                async with session.post(hub_mcp_url, json=registration_request, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        if "result" in result:
-                            print(f"✅ Successfully registered Real Email Agent: {result['result']}")
-                            return True
+            hub_mcp_url = "http://localhost:5000/mcp"
+            body = orjson.dumps(registration_request)
+            session = self._http_session()
+            for attempt in range(HUB_REGISTRATION_ATTEMPTS):
+                try:
+                    async with session.post(
+                        hub_mcp_url,
+                        data=body,
+                        headers={"Content-Type": "application/json"}
+                    ) as response:
+                        if response.status == 200:
+                            result = orjson.loads(await response.read())
+                            if "result" in result:
+                                print(f"✅ Successfully registered Real Email Agent: {result['result']}")
+                                return True
+                        return False
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt == HUB_REGISTRATION_ATTEMPTS - 1:
+                        raise
+                    delay = min(HUB_REGISTRATION_BACKOFF * (2 ** attempt), HUB_REGISTRATION_MAX_BACKOFF)
+                    print(f"⚠️  Registration attempt {attempt + 1} failed ({e}), retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
                     
             return False
             
@@ -808,43 +1429,121 @@ class RealEmailAgent:
             print(f"⚠️  Registration failed: {e}")
             return False
     
+    async def _preflight_smtp_and_log(self):
+        """Test the SMTP connection and report whether real emails will be sent"""
+        try:
+            smtp_test_result = await self.test_smtp_connection()
+            if smtp_test_result['status'] == 'success':
+                print(f"✅ SMTP connection verified - real emails will be sent!")
+            elif smtp_test_result['status'] == 'timeout':
+                print(f"⚠️  SMTP connection timed out - will use simulation mode")
+                print(f"   Message: {smtp_test_result.get('message')}")
+            else:
+                print(f"⚠️  SMTP connection failed - will use simulation mode")
+                print(f"   Error: {smtp_test_result.get('message')}")
+        except Exception as e:
+            print(f"⚠️  SMTP test error - will use simulation mode: {e}")
+    
     async def start_agent_server(self):
         """Start the agent server"""
+        import uvicorn
+        
         print(f"🚀 Starting Real Email Agent on port {self.agent_port}")
         
-        # Test SMTP connection on startup (non-blocking)
-        if self.smtp_config['configured']:
-            try:
-                smtp_test_result = await self.test_smtp_connection()
-                if smtp_test_result['status'] == 'success':
-                    print(f"✅ SMTP connection verified - real emails will be sent!")
-                elif smtp_test_result['status'] == 'timeout':
-                    print(f"⚠️  SMTP connection timed out - will use simulation mode")
-                    print(f"   Message: {smtp_test_result.get('message')}")
-                else:
-                    print(f"⚠️  SMTP connection failed - will use simulation mode")
-                    print(f"   Error: {smtp_test_result.get('message')}")
-            except Exception as e:
-                print(f"⚠️  SMTP test error - will use simulation mode: {e}")
+        # SMTP preflight and hub registration run alongside the server instead of delaying it
+        startup_tasks = []
+        if self.smtp_config.configured:
+            startup_tasks.append(asyncio.create_task(self._preflight_smtp_and_log()))
         else:
             print("ℹ️  SMTP not configured - using simulation mode")
             print("   To send real emails, configure SMTP settings in .env file")
         
         # Register with hub (continue even if SMTP failed)
-        try:
-            await self.register_with_hub()
-        except Exception as e:
-            print(f"⚠️  Hub registration failed: {e}")
+        startup_tasks.append(asyncio.create_task(self.register_with_hub()))
         
-        # Start server
+        # Start server (uvloop/httptools are picked up automatically when installed)
         config = uvicorn.Config(
             self.app,
             host="localhost",
             port=self.agent_port,
-            log_level="info"
+            loop="auto",
+            http="auto",
+            log_level="warning",
+            access_log=False
         )
         server = uvicorn.Server(config)
-        await server.serve()
+        try:
+            await server.serve()
+        finally:
+            for task in startup_tasks:
+                task.cancel()
+            if self.http is not None and not self.http.closed:
+                await self.http.close()
+
+def _create_llm(api_key: Optional[str] = None):
+    """Single construction point for the email agent's LLM client.
+    
+    Prompt payloads are already compact (see _compact_json); responses are
+    gzip-negotiated by the underlying httpx client, so only the transport
+    options the Anthropic API accepts are set here.
+    """
+    from langchain_anthropic import ChatAnthropic
+    
+    return ChatAnthropic(
+        model=os.getenv('LLM_MODEL', 'claude-3-haiku-20240307'),
+        temperature=0.1,
+        api_key=api_key or os.getenv('ANTHROPIC_API_KEY'),
+        default_headers={"accept-encoding": "gzip"}
+    )
+
+def create_app() -> FastAPI:
+    """Build the agent's ASGI app for multi-process serving (see launchers/start_real_email_agent.sh)"""
+    llm = _create_llm()
+    agent = RealEmailAgent(llm, "http://localhost:5000/mcp", int(os.getenv("PORT", 8003)))
+    
+    registration: List[asyncio.Task] = []
+    
+    @agent.app.on_event("startup")
+    async def register():
+        """Register with the hub in the background so worker boot is not blocked on it"""
+        registration.append(asyncio.create_task(agent.register_with_hub()))
+    
+    @agent.app.on_event("shutdown")
+    async def cancel_registration():
+        """Stop a registration still retrying when the worker exits"""
+        for task in registration:
+            task.cancel()
+        registration.clear()
+    
+    return agent.app
+
+# SMTP setup guide printed by main() before the server starts
+STARTUP_BANNER = "\n".join([
+    "",
+    "=" * 60,
+    "📧 SMTP CONFIGURATION GUIDE",
+    "=" * 60,
+    "To send real emails, add to your .env file:",
+    "",
+    "# Gmail (recommended)",
+    "GMAIL_USER=your-email@gmail.com",
+    "GMAIL_APP_PASSWORD=your-16-char-app-password",
+    "",
+    "# Or Outlook",
+    "OUTLOOK_USER=your-email@outlook.com",
+    "OUTLOOK_PASSWORD=your-password",
+    "",
+    "# Or custom SMTP",
+    "SMTP_SERVER=smtp.yourdomain.com",
+    "SMTP_USER=your-email@yourdomain.com",
+    "SMTP_PASSWORD=your-password",
+    "SMTP_PORT=587",
+    "=" * 60,
+    "🚀 Real Email Agent configured, starting server...",
+    "   Press Ctrl+C to stop",
+    "=" * 60,
+    "",
+])
 
 async def main():
     """Main function to start the real email agent"""
@@ -861,11 +1560,7 @@ async def main():
     
     # Create LLM
     try:
-        llm = ChatAnthropic(
-            model=os.getenv('LLM_MODEL', 'claude-3-haiku-20240307'),
-            temperature=0.1,
-            api_key=api_key
-        )
+        llm = _create_llm(api_key)
         print("✅ Anthropic LLM configured")
     except Exception as e:
         print(f"❌ Failed to create LLM: {e}")
@@ -877,29 +1572,8 @@ async def main():
     
     agent = RealEmailAgent(llm, hub_url, agent_port)
     
-    print("\n" + "=" * 60)
-    print("📧 SMTP CONFIGURATION GUIDE")
-    print("=" * 60)
-    print("To send real emails, add to your .env file:")
-    print("")
-    print("# Gmail (recommended)")
-    print("GMAIL_USER=your-email@gmail.com")
-    print("GMAIL_APP_PASSWORD=your-16-char-app-password")
-    print("")
-    print("# Or Outlook")  
-    print("OUTLOOK_USER=your-email@outlook.com")
-    print("OUTLOOK_PASSWORD=your-password")
-    print("")
-    print("# Or custom SMTP")
-    print("SMTP_SERVER=smtp.yourdomain.com")
-    print("SMTP_USER=your-email@yourdomain.com") 
-    print("SMTP_PASSWORD=your-password")
-    print("SMTP_PORT=587")
-    print("=" * 60)
-    
-    print("🚀 Real Email Agent configured, starting server...")
-    print("   Press Ctrl+C to stop")
-    print("=" * 60)
+    sys.stdout.write(STARTUP_BANNER)
+    sys.stdout.flush()
     
     try:
         await agent.start_agent_server()
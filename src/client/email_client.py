@@ -4,46 +4,131 @@ Custom email client for the email agent with different protocol
 """
 
 import aiohttp
-import json
-import uuid
-from typing import Dict, Any, Optional
+import asyncio
+import itertools
+import orjson
+import random
+from typing import Dict, List, Any, Optional
+
+# Keep-alive connections to the email agent, reused across notifications
+EMAIL_CLIENT_CONNECTION_LIMIT = 32
+EMAIL_CLIENT_KEEPALIVE_TIMEOUT = 60
+EMAIL_CLIENT_TIMEOUT = 30
+
+# Concurrent requests per client. Email sends are not idempotent, so a request is only
+# retried when it never reached the server: a failed connect, or an explicit 429/503
+EMAIL_CLIENT_MAX_CONCURRENCY = 8
+EMAIL_CLIENT_MAX_RETRIES = 3
+EMAIL_CLIENT_RETRY_BACKOFF = 0.1
+EMAIL_CLIENT_RETRY_STATUSES = frozenset({429, 503})
 
 class EmailAgentClient:
     """Custom client for email agent with /mcp/request endpoint"""
     
-    def __init__(self, server_url: str):
+    def __init__(self, server_url: str, max_concurrency: int = EMAIL_CLIENT_MAX_CONCURRENCY,
+                 max_retries: int = EMAIL_CLIENT_MAX_RETRIES):
         self.server_url = server_url
+        self.max_retries = max(1, max_retries)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
         self._session: Optional[aiohttp.ClientSession] = None
+        # JSON-RPC ids only need to be unique per client
+        self._next_id = itertools.count(1)
     
-    async def send_extraction_notification(self, extracted_data: list, total_extractions: int, extraction_summary: str) -> Any:
-        """Send extraction notification email"""
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-        
-        request_data = {
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the pooled session (normally done by `async with EmailAgentClient(...)`)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=EMAIL_CLIENT_CONNECTION_LIMIT,
+                    limit_per_host=EMAIL_CLIENT_CONNECTION_LIMIT // 2,
+                    keepalive_timeout=EMAIL_CLIENT_KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=EMAIL_CLIENT_TIMEOUT)
+            )
+        return self._session
+    
+    async def _post(self, session: aiohttp.ClientSession, body: bytes) -> Any:
+        """POST a JSON-RPC payload, retrying requests the server did not process with exponential backoff"""
+        error = "No attempts made"
+        async with self._semaphore:
+            for attempt in range(self.max_retries):
+                if attempt:
+                    await asyncio.sleep(EMAIL_CLIENT_RETRY_BACKOFF * 2 ** (attempt - 1) + random.random() * 0.05)
+                try:
+                    async with session.post(
+                        f"{self.server_url}/mcp/request",
+                        data=body,
+                        headers={"Content-Type": "application/json"}
+                    ) as response:
+                        if response.status == 200:
+                            return orjson.loads(await response.read())
+                        error = f"HTTP {response.status}"
+                        if response.status not in EMAIL_CLIENT_RETRY_STATUSES:
+                            break
+                except aiohttp.ClientConnectorError as e:
+                    # No connection was established, so nothing was sent; timeouts and
+                    # disconnects after the body went out propagate instead of being replayed
+                    error = str(e) or type(e).__name__
+        raise RuntimeError(error)
+    
+    def _request(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """JSON-RPC request for one extraction notification"""
+        return {
             "jsonrpc": "2.0",
-            "id": str(uuid.uuid4()),
+            "id": str(next(self._next_id)),
             "method": "send_extraction_notification",
-            "params": {
-                "extracted_data": extracted_data,
-                "total_extractions": total_extractions,
-                "extraction_summary": extraction_summary
-            }
+            "params": params
         }
+    
+    async def send_extraction_notification(self, extracted_data: list, total_extractions: int, extraction_summary: str) -> Any:
+        """Send extraction notification email"""
+        # A single request is a plain JSON-RPC object: not every email agent accepts batch arrays
+        request = self._request({
+            "extracted_data": extracted_data,
+            "total_extractions": total_extractions,
+            "extraction_summary": extraction_summary
+        })
         
         try:
-            async with self._session.post(
-                f"{self.server_url}/mcp/request",
-                json=request_data,
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result.get("result", {})
-                else:
-                    return {"status": "error", "message": f"HTTP {response.status}"}
+            reply = await self._post(self._ensure_session(), orjson.dumps(request))
         except Exception as e:
             return {"status": "error", "message": str(e)}
+        
+        if not isinstance(reply, dict):
+            return {"status": "error", "message": "Unexpected response to request"}
+        return reply.get("result", {})
+    
+    async def send_batch(self, items: List[Dict[str, Any]]) -> List[Any]:
+        """Send several extraction notifications in one JSON-RPC batch request.
+        
+        Each item holds the params of one send_extraction_notification call; results
+        are returned in the same order as the items. The email agent must accept
+        JSON-RPC batch arrays (RealEmailAgent does).
+        """
+        if not items:
+            return []
+        session = self._ensure_session()
+        
+        requests = [self._request(params) for params in items]
+        
+        try:
+            replies = await self._post(session, orjson.dumps(requests))
+        except Exception as e:
+            return [{"status": "error", "message": str(e)} for _ in requests]
+        
+        # A single error object answers the whole batch (e.g. the request could not be parsed)
+        if not isinstance(replies, list):
+            error = replies.get("error") if isinstance(replies, dict) else None
+            message = error.get("message") if isinstance(error, dict) else (error or "Unexpected response to batch request")
+            return [{"status": "error", "message": str(message)} for _ in requests]
+        
+        by_id = {reply.get("id"): reply for reply in replies if isinstance(reply, dict)}
+        return [
+            by_id[request["id"]].get("result", {}) if request["id"] in by_id
+            else {"status": "error", "message": "No response for request"}
+            for request in requests
+        ]
     
     async def close(self):
         """Close the session"""
@@ -52,6 +137,7 @@ class EmailAgentClient:
             self._session = None
     
     async def __aenter__(self):
+        self._ensure_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
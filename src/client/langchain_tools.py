@@ -5,19 +5,79 @@ This module provides LangChain-specific implementations and utilities
 for working with MCP Toolbox tools in the LangChain ecosystem.
 """
 
+import asyncio
+import functools
+import json
 import logging
-from typing import Dict, List, Optional, Any, Type, Callable
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Type, Callable, Coroutine
 from abc import ABC, abstractmethod
 
 from langchain_core.tools import BaseTool
 from langchain_core.callbacks import CallbackManagerForToolRun
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from .mcp_client import MCPToolboxClient
 
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
+
 
 logger = logging.getLogger(__name__)
 
+# Results of idempotent tools keyed by (tool, toolset, arguments), shared by all tool instances
+TOOL_RESULT_CACHE_SIZE = 256
+_tool_result_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+# Tool constructions in flight at once while building a toolset
+TOOL_BUILD_CONCURRENCY = 32
+
+# Tool kinds whose calls are read-only and safe to memoize
+IDEMPOTENT_TOOL_KINDS = frozenset({"search"})
+
+# Input schemas inferred from _run, per (tool class, tool name); inference runs once per tool
+_input_schema_cache: Dict[tuple, Type[BaseModel]] = {}
+
+# Event loop shared by all sync entry points, so the MCP client's HTTP session survives between calls
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+# Factories used by create_langchain_tools_sync, per client id with the client to rule out a reused id
+_sync_factories: Dict[int, tuple] = {}
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared loop, starting its daemon thread on first use."""
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            # uvloop only for this private loop; the process-wide loop policy is left alone
+            loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="mcp-tools-loop", daemon=True).start()
+            _sync_loop = loop
+    return _sync_loop
+
+
+def _run_sync(coro: Coroutine) -> Any:
+    """Run a coroutine to completion from synchronous code on the shared loop."""
+    loop = _get_sync_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    
+    if running is loop:
+        # Called from a coroutine on the shared loop itself: blocking on it would deadlock
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+    
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
 
 class MCPToolSchema(BaseModel):
     """Schema for MCP tool parameters."""
@@ -29,18 +89,39 @@ class MCPBaseTool(BaseTool, ABC):
     Base class for MCP Toolbox tools integrated with LangChain.
     
     This class wraps MCP Toolbox tools to make them compatible with
-    the LangChain BaseTool interface.
+    the LangChain BaseTool interface. From async code use ``await tool.ainvoke(args)``
+    or ``await tool.abatch([...])``, which run the calls as coroutines on the caller's
+    loop; ``invoke`` blocks the calling thread until the shared loop finishes the call.
     """
     
     mcp_client: MCPToolboxClient = Field(exclude=True)
     tool_name: str = Field(description="Name of the MCP tool")
     toolset_name: Optional[str] = Field(default=None, description="Toolset containing this tool")
+    idempotent: bool = Field(default=False, description="Reuse results of identical calls", exclude=True)
+    cache_ttl: float = Field(default=60.0, description="Seconds an idempotent result is reused", exclude=True)
+    
+    # Bound client method and fixed call arguments, resolved once per tool instead of per call
+    _execute: Optional[Callable] = PrivateAttr(default=None)
+    _call_kwargs: Dict[str, Any] = PrivateAttr(default_factory=dict)
     
     class Config:
         arbitrary_types_allowed = True
     
     def __init__(self, mcp_client: MCPToolboxClient, tool_name: str, **data):
         super().__init__(mcp_client=mcp_client, tool_name=tool_name, **data)
+        self._execute = getattr(mcp_client, "execute_tool", None)
+        self._call_kwargs = {"tool_name": tool_name, "toolset_name": self.toolset_name}
+    
+    def get_input_schema(self, config: Optional[Any] = None) -> Type[BaseModel]:
+        """Input schema, inferred from _run once per tool rather than on every call."""
+        if self.args_schema is not None:
+            return super().get_input_schema(config)
+        
+        key = (type(self), self.name)
+        schema = _input_schema_cache.get(key)
+        if schema is None:
+            schema = _input_schema_cache[key] = super().get_input_schema(config)
+        return schema
     
     @abstractmethod
     def _run(
@@ -57,70 +138,128 @@ class MCPBaseTool(BaseTool, ABC):
         **kwargs: Any,
     ) -> Any:
         """Execute the tool asynchronously."""
+        key = None
+        if self.idempotent:
+            key = (self.tool_name, self.toolset_name, json.dumps(kwargs, sort_keys=True, default=repr))
+            entry = _tool_result_cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                _tool_result_cache.move_to_end(key)
+                return entry[1]
+        
         try:
-            result = await self.mcp_client.execute_tool(
-                tool_name=self.tool_name,
-                parameters=kwargs,
-                toolset_name=self.toolset_name
-            )
-            return result
+            result = await self._execute(parameters=kwargs, **self._call_kwargs)
         except Exception as e:
-            logger.error(f"Error executing MCP tool '{self.tool_name}': {e}")
+            logger.error("Error executing MCP tool '%s': %s", self.tool_name, e)
+            raise
+        
+        if key is not None:
+            _tool_result_cache[key] = (time.monotonic() + self.cache_ttl, result)
+            _tool_result_cache.move_to_end(key)
+            if len(_tool_result_cache) > TOOL_RESULT_CACHE_SIZE:
+                _tool_result_cache.popitem(last=False)
+        return result
+    
+    async def abatch(
+        self,
+        inputs: List[Any],
+        config: Optional[Any] = None,
+        *,
+        return_exceptions: bool = False,
+        **kwargs: Any,
+    ) -> List[Any]:
+        """
+        Run several calls of this tool concurrently.
+        
+        When the MCP client provides ``execute_tools_batch``, calls with dict
+        arguments are sent as a single request; otherwise each input runs as
+        its own coroutine via ``ainvoke``.
+        """
+        execute_batch = getattr(self.mcp_client, "execute_tools_batch", None)
+        if execute_batch is None or not inputs or not all(isinstance(args, dict) for args in inputs):
+            return await super().abatch(inputs, config, return_exceptions=return_exceptions, **kwargs)
+        
+        try:
+            return await execute_batch(batch=inputs, **self._call_kwargs)
+        except Exception as e:
+            logger.error("Error executing MCP tool batch '%s': %s", self.tool_name, e)
+            if return_exceptions:
+                return [e] * len(inputs)
             raise
 
 
-class MCPSQLTool(MCPBaseTool):
+class MCPToolboxTool(MCPBaseTool):
     """
-    LangChain tool for SQL-based MCP Toolbox tools.
+    LangChain tool for MCP Toolbox tools of any kind (SQL, search, analytics).
     """
     
-    name: str = "mcp_sql_tool"
-    description: str = "Execute SQL queries through MCP Toolbox"
+    name: str = "mcp_toolbox_tool"
+    description: str = "Execute a tool through MCP Toolbox"
+    kind: str = Field(default="sql", description="Tool kind, used for logging", exclude=True)
     
     def _run(
         self,
         run_manager: Optional[CallbackManagerForToolRun] = None,
         **kwargs: Any,
     ) -> Any:
-        """Execute the SQL tool synchronously."""
-        import asyncio
-        return asyncio.run(self._arun(run_manager, **kwargs))
+        """Execute the tool synchronously on the shared loop (prefer ainvoke from async code)."""
+        return _run_sync(self._arun(run_manager, **kwargs))
 
 
-class MCPSearchTool(MCPBaseTool):
+class WrappedMCPTool(MCPBaseTool):
     """
-    LangChain tool for search-based MCP Toolbox tools.
+    LangChain tool wrapping a tool object returned by MCP Toolbox.
     """
     
-    name: str = "mcp_search_tool"
-    description: str = "Search data through MCP Toolbox"
+    _target: Any = PrivateAttr(default=None)
+    
+    def __init__(self, mcp_client: MCPToolboxClient, tool_name: str, target: Any = None, **data):
+        super().__init__(mcp_client=mcp_client, tool_name=tool_name, **data)
+        self._target = target
     
     def _run(
         self,
         run_manager: Optional[CallbackManagerForToolRun] = None,
         **kwargs: Any,
     ) -> Any:
-        """Execute the search tool synchronously."""
-        import asyncio
-        return asyncio.run(self._arun(run_manager, **kwargs))
+        """Call the original tool object."""
+        if callable(self._target):
+            return self._target(**kwargs)
+        raise ValueError(f"Tool object {self.tool_name} is not callable")
 
 
-class MCPAnalyticsTool(MCPBaseTool):
+class CustomMCPTool(MCPBaseTool):
     """
-    LangChain tool for analytics-based MCP Toolbox tools.
+    LangChain tool running a user-provided function.
     """
     
-    name: str = "mcp_analytics_tool"
-    description: str = "Perform analytics through MCP Toolbox"
+    _func: Optional[Callable] = PrivateAttr(default=None)
+    
+    def __init__(self, mcp_client: MCPToolboxClient, tool_name: str, func: Callable, **data):
+        super().__init__(mcp_client=mcp_client, tool_name=tool_name, **data)
+        self._func = func
     
     def _run(
         self,
         run_manager: Optional[CallbackManagerForToolRun] = None,
         **kwargs: Any,
     ) -> Any:
-        """Execute the analytics tool synchronously."""
-        import asyncio
-        return asyncio.run(self._arun(run_manager, **kwargs))
+        """Execute the provided function."""
+        return self._func(**kwargs)
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_tool_kind(tool_kind: str) -> str:
+    """Normalize a server-reported tool kind; memoized since servers report few distinct kinds."""
+    kind = tool_kind.lower()
+    if 'sql' in kind:
+        return 'sql'
+    elif 'search' in kind:
+        return 'search'
+    elif 'analytics' in kind:
+        return 'analytics'
+    else:
+        # Default to SQL tool for unknown types
+        return 'sql'
 
 
 class MCPLangChainTools:
@@ -140,11 +279,18 @@ class MCPLangChainTools:
         """
         self.mcp_client = mcp_client
         self._tool_mapping = {
-            'sql': MCPSQLTool,
-            'search': MCPSearchTool,
-            'analytics': MCPAnalyticsTool,
+            'sql': MCPToolboxTool,
+            'search': MCPToolboxTool,
+            'analytics': MCPToolboxTool,
         }
         
+        # Tools already built per toolset; a lock per toolset keeps concurrent callers to one load
+        self._toolset_cache: Dict[Optional[str], List[BaseTool]] = {}
+        self._toolset_locks: Dict[Optional[str], asyncio.Lock] = {}
+        
+        # Wrapped tool per tool object id, stored with the object to rule out a reused id
+        self._wrapped_cache: Dict[int, tuple] = {}
+        
         logger.info("Initialized MCP LangChain tools factory")
     
     def create_tool_from_definition(
@@ -167,7 +313,8 @@ class MCPLangChainTools:
         tool_kind = tool_definition.get('kind', 'sql')
         
         # Determine the appropriate tool class based on the tool kind
-        tool_class = self._get_tool_class(tool_kind)
+        kind = _resolve_tool_kind(tool_kind)
+        tool_class = self._tool_mapping[kind]
         
         # Create the tool instance
         tool = tool_class(
@@ -175,10 +322,12 @@ class MCPLangChainTools:
             tool_name=tool_name,
             toolset_name=toolset_name,
             name=tool_name,
-            description=tool_description
+            description=tool_description,
+            kind=kind,
+            idempotent=kind in IDEMPOTENT_TOOL_KINDS
         )
         
-        logger.info(f"Created LangChain tool '{tool_name}' of type {tool_class.__name__}")
+        logger.info("Created LangChain tool '%s' of kind %s", tool_name, kind)
         return tool
     
     def _get_tool_class(self, tool_kind: str) -> Type[MCPBaseTool]:
@@ -191,16 +340,7 @@ class MCPLangChainTools:
         Returns:
             Type[MCPBaseTool]: Appropriate tool class
         """
-        # Map tool kinds to tool classes
-        if 'sql' in tool_kind.lower():
-            return MCPSQLTool
-        elif 'search' in tool_kind.lower():
-            return MCPSearchTool
-        elif 'analytics' in tool_kind.lower():
-            return MCPAnalyticsTool
-        else:
-            # Default to SQL tool for unknown types
-            return MCPSQLTool
+        return self._tool_mapping[_resolve_tool_kind(tool_kind)]
     
     async def create_tools_from_toolset(
         self,
@@ -215,36 +355,116 @@ class MCPLangChainTools:
         Returns:
             List[BaseTool]: List of LangChain-compatible tools
         """
-        try:
-            # Load tools using the LangChain client
-            langchain_tools = await self.mcp_client.load_langchain_tools(toolset_name)
-            
-            # If the MCP client returns LangChain tools directly, use them
-            if langchain_tools and all(isinstance(tool, BaseTool) for tool in langchain_tools):
-                logger.info(f"Loaded {len(langchain_tools)} LangChain tools from MCP Toolbox")
-                return langchain_tools
-            
-            # Otherwise, create tools from definitions
-            tools = []
-            core_tools = await self.mcp_client.load_toolset(toolset_name)
+        lock = self._toolset_locks.setdefault(toolset_name, asyncio.Lock())
+        async with lock:
+            tools = self._toolset_cache.get(toolset_name)
+            if tools is None:
+                tools = await self._load_tools(toolset_name)
+                # An empty result usually means loading failed, so don't pin it
+                if tools:
+                    self._toolset_cache[toolset_name] = tools
+            return list(tools)
+    
+    def invalidate(self, toolset_name: Optional[str] = None):
+        """
+        Drop the cached tools of a toolset so the next request reloads them.
+        
+        Args:
+            toolset_name: Toolset to invalidate (None is the unfiltered toolset)
+        """
+        self._toolset_cache.pop(toolset_name, None)
+    
+    async def iter_tools_from_toolset(
+        self,
+        toolset_name: Optional[str] = None
+    ) -> AsyncIterator[BaseTool]:
+        """
+        Yield LangChain tools from an MCP toolset as each one is built.
+        
+        Tools arrive in completion order, so callers can start using the first
+        tools before a large toolset is fully built. The toolset's lock is held
+        until a load finishes, and a fully consumed load is cached like one from
+        create_tools_from_toolset.
+        
+        Args:
+            toolset_name: Name of the toolset to load
             
-            for tool_def in core_tools:
-                if isinstance(tool_def, dict):
-                    tool = self.create_tool_from_definition(tool_def, toolset_name)
-                    tools.append(tool)
-                else:
-                    # If it's already a tool object, try to wrap it
-                    wrapped_tool = self._wrap_tool_object(tool_def, toolset_name)
-                    if wrapped_tool:
-                        tools.append(wrapped_tool)
+        Yields:
+            BaseTool: LangChain-compatible tools
+        """
+        lock = self._toolset_locks.setdefault(toolset_name, asyncio.Lock())
+        async with lock:
+            cached = self._toolset_cache.get(toolset_name)
+            if cached is None:
+                indexed = []
+                async for index, tool in self._iter_indexed_tools(toolset_name):
+                    indexed.append((index, tool))
+                    yield tool
+                
+                # Reached only if the consumer did not stop early; cached in toolset order
+                tools = [tool for _, tool in sorted(indexed, key=lambda item: item[0])]
+                if tools:
+                    self._toolset_cache[toolset_name] = tools
+                return
+        
+        for tool in cached:
+            yield tool
+    
+    async def _iter_indexed_tools(self, toolset_name: Optional[str]) -> AsyncIterator[Tuple[int, BaseTool]]:
+        """Yield (position in toolset, tool) pairs as the tools are built."""
+        # Load tools using the LangChain client
+        langchain_tools = await self.mcp_client.load_langchain_tools(toolset_name)
+        
+        # If the MCP client returns LangChain tools directly, use them
+        if langchain_tools and all(isinstance(tool, BaseTool) for tool in langchain_tools):
+            logger.info("Loaded %d LangChain tools from MCP Toolbox", len(langchain_tools))
+            for item in enumerate(langchain_tools):
+                yield item
+            return
+        
+        # Otherwise, create tools from definitions; each construction is independent
+        core_tools = await self.mcp_client.load_toolset(toolset_name)
+        
+        semaphore = asyncio.Semaphore(TOOL_BUILD_CONCURRENCY)
+        tasks = [
+            asyncio.ensure_future(self._acreate_tool(semaphore, index, tool_def, toolset_name))
+            for index, tool_def in enumerate(core_tools)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, tool = await next_done
+                if tool is not None:
+                    yield index, tool
+        finally:
+            # The consumer may stop early
+            for task in tasks:
+                task.cancel()
+    
+    async def _acreate_tool(self, semaphore: asyncio.Semaphore, index: int, tool_def: Any,
+                            toolset_name: Optional[str]) -> Tuple[int, Optional[BaseTool]]:
+        async with semaphore:
+            return index, await asyncio.to_thread(self._create_tool, tool_def, toolset_name)
+    
+    async def _load_tools(self, toolset_name: Optional[str]) -> List[BaseTool]:
+        """Load a toolset from the MCP client and convert it to LangChain tools, in toolset order."""
+        try:
+            indexed = [item async for item in self._iter_indexed_tools(toolset_name)]
+            tools = [tool for _, tool in sorted(indexed, key=lambda item: item[0])]
             
-            logger.info(f"Created {len(tools)} LangChain tools from toolset '{toolset_name}'")
+            logger.info("Created %d LangChain tools from toolset '%s'", len(tools), toolset_name)
             return tools
             
         except Exception as e:
-            logger.error(f"Failed to create tools from toolset '{toolset_name}': {e}")
+            logger.error("Failed to create tools from toolset '%s': %s", toolset_name, e)
             raise
     
+    def _create_tool(self, tool_def: Any, toolset_name: Optional[str] = None) -> Optional[BaseTool]:
+        """Build a tool from a definition dict, or wrap an existing tool object."""
+        if isinstance(tool_def, dict):
+            return self.create_tool_from_definition(tool_def, toolset_name)
+        # If it's already a tool object, try to wrap it
+        return self._wrap_tool_object(tool_def, toolset_name)
+    
     def _wrap_tool_object(
         self,
         tool_obj: Any,
@@ -260,30 +480,28 @@ class MCPLangChainTools:
         Returns:
             Optional[BaseTool]: Wrapped tool or None if wrapping failed
         """
+        entry = self._wrapped_cache.get(id(tool_obj))
+        if entry is not None and entry[0] is tool_obj and entry[1] == toolset_name:
+            return entry[2]
+        
         try:
             # Extract tool information
-            tool_name = getattr(tool_obj, 'name', 'wrapped_tool')
-            tool_description = getattr(tool_obj, 'description', f"Wrapped MCP tool: {tool_name}")
+            tool_name = getattr(tool_obj, 'name', None) or 'wrapped_tool'
+            tool_description = getattr(tool_obj, 'description', None) or f"Wrapped MCP tool: {tool_name}"
             
-            class WrappedMCPTool(MCPBaseTool):
-                name = tool_name
-                description = tool_description
-                
-                def _run(self, run_manager=None, **kwargs):
-                    # Call the original tool
-                    if callable(tool_obj):
-                        return tool_obj(**kwargs)
-                    else:
-                        raise ValueError(f"Tool object {tool_name} is not callable")
-            
-            return WrappedMCPTool(
+            wrapped_tool = WrappedMCPTool(
                 mcp_client=self.mcp_client,
                 tool_name=tool_name,
-                toolset_name=toolset_name
+                target=tool_obj,
+                toolset_name=toolset_name,
+                name=tool_name,
+                description=tool_description
             )
+            self._wrapped_cache[id(tool_obj)] = (tool_obj, toolset_name, wrapped_tool)
+            return wrapped_tool
             
         except Exception as e:
-            logger.warning(f"Failed to wrap tool object: {e}")
+            logger.warning("Failed to wrap tool object: %s", e)
             return None
     
     def create_custom_tool(
@@ -305,19 +523,16 @@ class MCPLangChainTools:
         Returns:
             BaseTool: Custom LangChain tool
         """
-        class CustomMCPTool(MCPBaseTool):
-            def _run(self, run_manager=None, **kwargs):
-                return func(**kwargs)
-        
         tool = CustomMCPTool(
             mcp_client=self.mcp_client,
             tool_name=name,
+            func=func,
             toolset_name=toolset_name,
             name=name,
             description=description
         )
         
-        logger.info(f"Created custom tool '{name}'")
+        logger.info("Created custom tool '%s'", name)
         return tool
 
 
@@ -335,7 +550,10 @@ def create_langchain_tools_sync(
     Returns:
         List[BaseTool]: List of LangChain tools
     """
-    import asyncio
-    
-    factory = MCPLangChainTools(mcp_client)
-    return asyncio.run(factory.create_tools_from_toolset(toolset_name))
+    with _sync_loop_lock:
+        entry = _sync_factories.get(id(mcp_client))
+        if entry is None or entry[0] is not mcp_client:
+            # One factory per client, so repeated calls share its toolset cache
+            entry = (mcp_client, MCPLangChainTools(mcp_client))
+            _sync_factories[id(mcp_client)] = entry
+    return _run_sync(entry[1].create_tools_from_toolset(toolset_name))
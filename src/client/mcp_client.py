@@ -8,21 +8,40 @@ and enables Agent-to-Agent (A2A) communication following JSON-RPC standards.
 import asyncio
 import json
 import logging
+import threading
 import uuid
-from typing import Dict, List, Optional, Any, Union, Callable
+from typing import Dict, List, Optional, Any, Union, Callable, Tuple
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, asdict
 from enum import Enum
 
 import aiohttp
+import orjson
 import websockets
 from toolbox_core import ToolboxClient
+
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
 # Temporarily comment out problematic import
 # from toolbox_langchain import ToolboxLangChain
 
 
 logger = logging.getLogger(__name__)
 
+# MCP messages are encoded/decoded with orjson and posted as raw bytes
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Connection pool shared by all requests of a client (one MCP server plus A2A peers)
+MCP_CONNECTION_LIMIT = 256
+MCP_CONNECTION_LIMIT_PER_HOST = 64
+MCP_KEEPALIVE_TIMEOUT = 75
+MCP_DNS_CACHE_TTL = 300
+
+# Opt-in persistent WebSocket transport for JSON-RPC frames (HTTP is the fallback)
+WEBSOCKET_PATH = "/mcp/ws"
+
 
 # MCP Protocol Data Classes
 @dataclass
@@ -108,7 +127,8 @@ class MCPProtocolClient:
         agent_name: str = "DatabaseAgent",
         capabilities: Optional[List[str]] = None,
         timeout: int = 30,
-        retry_attempts: int = 3
+        retry_attempts: int = 3,
+        use_websocket: bool = False
     ):
         """
         Initialize the MCP Protocol client with A2A support.
@@ -120,6 +140,7 @@ class MCPProtocolClient:
             capabilities: List of capabilities this agent provides
             timeout: Request timeout in seconds
             retry_attempts: Number of retry attempts for failed requests
+            use_websocket: Send requests over a persistent WebSocket when the server supports it
         """
         self.server_url = server_url
         self.agent_id = agent_id or str(uuid.uuid4())
@@ -127,19 +148,37 @@ class MCPProtocolClient:
         self.capabilities = capabilities or ["database_query", "data_analysis", "reporting"]
         self.timeout = timeout
         self.retry_attempts = retry_attempts
+        self.use_websocket = use_websocket
         
         # Connection management
-        self._session: Optional[aiohttp.ClientSession] = None
-        self._websocket: Optional[websockets.WebSocketServerProtocol] = None
+        # aiohttp binds a session to the loop it was created on, so each loop gets its own
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._websocket: Optional[websockets.WebSocketClientProtocol] = None
+        self._websocket_lock: Optional[asyncio.Lock] = None
+        self._websocket_unavailable = False
+        self._reader_task: Optional[asyncio.Task] = None
         self._message_handlers: Dict[str, Callable] = {}
         self._pending_requests: Dict[str, asyncio.Future] = {}
+        self._notification_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
         
         # Agent registry for A2A communication
         self._registered_agents: Dict[str, MCPAgent] = {}
+        self._agents_payload_cache: Optional[List[Dict[str, Any]]] = None
         
         # Tool management
         self._available_tools: Dict[str, MCPTool] = {}
         self._tool_handlers: Dict[str, Callable] = {}
+        self._tools_payload_cache: Optional[List[Dict[str, Any]]] = None
+        
+        # Registration payload never changes for the lifetime of the client
+        self._agent_register_payload = asdict(MCPAgent(
+            id=self.agent_id,
+            name=self.agent_name,
+            description=f"Database agent with capabilities: {', '.join(self.capabilities)}",
+            capabilities=self.capabilities,
+            endpoint=f"http://localhost:8000/agents/{self.agent_id}"  # This agent's endpoint
+        ))
         
         # Legacy client support
         self._core_client: Optional[ToolboxClient] = None
@@ -169,9 +208,9 @@ class MCPProtocolClient:
 
     async def _handle_list_tools(self, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Handle tools listing request."""
-        return {
-            "tools": [asdict(tool) for tool in self._available_tools.values()]
-        }
+        if self._tools_payload_cache is None:
+            self._tools_payload_cache = [asdict(tool) for tool in self._available_tools.values()]
+        return {"tools": self._tools_payload_cache}
 
     async def _handle_call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle tool execution request."""
@@ -190,14 +229,15 @@ class MCPProtocolClient:
         """Handle agent registration for A2A communication."""
         agent_info = MCPAgent(**params)
         self._registered_agents[agent_info.id] = agent_info
+        self._agents_payload_cache = None
         logger.info(f"Registered agent: {agent_info.name} ({agent_info.id})")
         return {"status": "registered", "agent_id": agent_info.id}
 
     async def _handle_list_agents(self, params: Optional[Dict] = None) -> Dict[str, Any]:
         """Handle agent listing request."""
-        return {
-            "agents": [asdict(agent) for agent in self._registered_agents.values()]
-        }
+        if self._agents_payload_cache is None:
+            self._agents_payload_cache = [asdict(agent) for agent in self._registered_agents.values()]
+        return {"agents": self._agents_payload_cache}
 
     async def _handle_agent_call(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle agent-to-agent communication request."""
@@ -222,24 +262,100 @@ class MCPProtocolClient:
         """Handle resource reading request."""
         return {"contents": []}  # Placeholder for resource management
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the pooled HTTP session of the running loop, creating it on first use.
+        
+        The session is created lazily because aiohttp binds it to the running
+        event loop; a client used from several loops keeps one session per loop.
+        """
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            # Sessions of loops that have since closed can neither be used nor closed
+            for stale in [other for other in self._sessions if other.is_closed()]:
+                del self._sessions[stale]
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=MCP_CONNECTION_LIMIT,
+                    limit_per_host=MCP_CONNECTION_LIMIT_PER_HOST,
+                    ttl_dns_cache=MCP_DNS_CACHE_TTL,
+                    keepalive_timeout=MCP_KEEPALIVE_TIMEOUT
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._sessions[loop] = session
+        return session
+
+    async def _ensure_ws(self) -> Optional[websockets.WebSocketClientProtocol]:
+        """
+        Get the WebSocket connection to the MCP server, opening it on first use.
+        
+        Returns None when the WebSocket transport is disabled or the server does
+        not accept it, in which case callers use HTTP.
+        """
+        if not self.use_websocket or self._websocket_unavailable:
+            return None
+        if self._websocket is not None:
+            return self._websocket
+        
+        if self._websocket_lock is None:
+            self._websocket_lock = asyncio.Lock()
+        async with self._websocket_lock:
+            if self._websocket is None and not self._websocket_unavailable:
+                url = self.server_url.replace("http", "ws", 1) + WEBSOCKET_PATH
+                try:
+                    websocket = await websockets.connect(
+                        url, compression=None, max_queue=None, open_timeout=self.timeout
+                    )
+                except Exception as e:
+                    logger.warning(f"WebSocket transport unavailable at {url}, using HTTP: {e}")
+                    self._websocket_unavailable = True
+                    return None
+                self._websocket = websocket
+                self._reader_task = asyncio.get_running_loop().create_task(self._ws_reader(websocket))
+        return self._websocket
+
+    async def _ws_reader(self, websocket: websockets.WebSocketClientProtocol):
+        """Resolve pending requests with the responses read from the WebSocket."""
+        try:
+            async for message in websocket:
+                reply = orjson.loads(message)
+                future = self._pending_requests.pop(reply.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        except Exception as e:
+            logger.warning(f"WebSocket connection lost: {e}")
+        finally:
+            if self._websocket is websocket:
+                self._websocket = None
+            # Requests still waiting will never get a reply on this connection
+            for future in self._pending_requests.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("WebSocket connection closed"))
+            self._pending_requests.clear()
+
+    async def _ws_request(self, websocket: websockets.WebSocketClientProtocol, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a request frame and wait for the response with the same id."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending_requests[request["id"]] = future
+        try:
+            await websocket.send(orjson.dumps(request).decode())
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            self._pending_requests.pop(request["id"], None)
+
     async def _send_agent_request(self, endpoint: str, method: str, params: Dict[str, Any]) -> Any:
         """Send request to another agent."""
-        request = MCPRequest(
-            id=str(uuid.uuid4()),
-            method=method,
-            params=params
-        )
+        request = {"jsonrpc": "2.0", "id": str(uuid.uuid4()), "method": method, "params": params}
         
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-        
-        async with self._session.post(
+        async with self._get_session().post(
             f"{endpoint}/mcp",
-            json=asdict(request),
-            timeout=aiohttp.ClientTimeout(total=self.timeout)
+            data=orjson.dumps(request),
+            headers=JSON_HEADERS
         ) as response:
-            result = await response.json()
-            if "error" in result:
+            result = orjson.loads(await response.read())
+            if result.get("error"):
                 raise Exception(f"Agent call failed: {result['error']}")
             return result.get("result")
 
@@ -254,31 +370,28 @@ class MCPProtocolClient:
         Returns:
             Response result or raises exception on error
         """
-        request = MCPRequest(
-            id=str(uuid.uuid4()),
-            method=method,
-            params=params
-        )
-        
-        if not self._session:
-            self._session = aiohttp.ClientSession()
+        request = {"jsonrpc": "2.0", "id": str(uuid.uuid4()), "method": method, "params": params}
         
         try:
-            async with self._session.post(
-                f"{self.server_url}/mcp",
-                json=asdict(request),
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
-            ) as response:
-                if response.status != 200:
-                    raise Exception(f"HTTP {response.status}: {await response.text()}")
-                
-                result = await response.json()
-                
-                if "error" in result:
-                    error = result["error"]
-                    raise Exception(f"MCP Error {error.get('code')}: {error.get('message')}")
-                
-                return result.get("result")
+            websocket = await self._ensure_ws()
+            if websocket is not None:
+                result = await self._ws_request(websocket, request)
+            else:
+                async with self._get_session().post(
+                    f"{self.server_url}/mcp",
+                    data=orjson.dumps(request),
+                    headers=JSON_HEADERS
+                ) as response:
+                    if response.status != 200:
+                        raise Exception(f"HTTP {response.status}: {await response.text()}")
+                    
+                    result = orjson.loads(await response.read())
+            
+            if result.get("error"):
+                error = result["error"]
+                raise Exception(f"MCP Error {error.get('code')}: {error.get('message')}")
+            
+            return result.get("result")
                 
         except Exception as e:
             logger.error(f"MCP request failed: {e}")
@@ -288,20 +401,44 @@ class MCPProtocolClient:
         """
         Send MCP notification (no response expected).
         
+        The notification is queued and posted by a background writer, so this
+        returns without waiting for the round-trip.
+        
         Args:
             method: MCP method name
             params: Optional parameters
         """
-        notification = MCPNotification(method=method, params=params)
-        
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-        
+        self._ensure_writer().put_nowait({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def _ensure_writer(self) -> asyncio.Queue:
+        """Get the notification queue, starting its writer task on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._writer_task is None or self._writer_task.done() or self._writer_task.get_loop() is not loop:
+            self._notification_queue = asyncio.Queue()
+            self._writer_task = loop.create_task(self._notification_writer(self._notification_queue))
+        return self._notification_queue
+
+    async def _notification_writer(self, queue: asyncio.Queue):
+        """Drain queued notifications, posting them one at a time in the order they were sent."""
+        while True:
+            notification = await queue.get()
+            try:
+                await self._post_notification(notification)
+            finally:
+                queue.task_done()
+
+    async def _post_notification(self, notification: Dict[str, Any]):
+        """Post a single notification to the MCP server."""
         try:
-            async with self._session.post(
+            websocket = await self._ensure_ws()
+            if websocket is not None:
+                await websocket.send(orjson.dumps(notification).decode())
+                return
+            
+            async with self._get_session().post(
                 f"{self.server_url}/mcp",
-                json=asdict(notification),
-                timeout=aiohttp.ClientTimeout(total=self.timeout)
+                data=orjson.dumps(notification),
+                headers=JSON_HEADERS
             ) as response:
                 pass  # Notifications don't expect responses
                 
@@ -318,6 +455,7 @@ class MCPProtocolClient:
         """
         self._available_tools[tool.name] = tool
         self._tool_handlers[tool.name] = handler
+        self._tools_payload_cache = None
         logger.info(f"Registered tool: {tool.name}")
 
     async def register_with_server(self) -> bool:
@@ -328,15 +466,7 @@ class MCPProtocolClient:
             bool: True if registration successful
         """
         try:
-            agent_info = MCPAgent(
-                id=self.agent_id,
-                name=self.agent_name,
-                description=f"Database agent with capabilities: {', '.join(self.capabilities)}",
-                capabilities=self.capabilities,
-                endpoint=f"http://localhost:8000/agents/{self.agent_id}"  # This agent's endpoint
-            )
-            
-            result = await self.send_mcp_request("agents/register", asdict(agent_info))
+            result = await self.send_mcp_request("agents/register", self._agent_register_payload)
             logger.info(f"Successfully registered agent with server: {result}")
             return True
             
@@ -357,6 +487,7 @@ class MCPProtocolClient:
             
             for agent in agents:
                 self._registered_agents[agent.id] = agent
+            self._agents_payload_cache = None
             
             logger.info(f"Discovered {len(agents)} agents")
             return agents
@@ -391,6 +522,21 @@ class MCPProtocolClient:
             logger.error(f"Failed to call agent {agent_id}: {e}")
             raise
 
+    async def call_agents_batch(self, calls: List[Tuple[str, str, Optional[Dict[str, Any]]]]) -> List[Any]:
+        """
+        Call several agents concurrently over the pooled connection.
+        
+        Args:
+            calls: (agent_id, method, params) tuples
+            
+        Returns:
+            Results in the order of `calls`; a failed call yields its exception
+        """
+        return await asyncio.gather(
+            *(self.call_agent(agent_id, method, params) for agent_id, method, params in calls),
+            return_exceptions=True
+        )
+
     async def list_tools(self) -> List[MCPTool]:
         """
         List available tools from the MCP server.
@@ -457,10 +603,14 @@ class MCPProtocolClient:
         """
         from aiohttp import web
         
+        def json_response(payload: Dict[str, Any], status: int = 200):
+            return web.Response(body=orjson.dumps(payload), status=status, content_type="application/json")
+        
         async def handle_mcp_request(request):
             """Handle incoming MCP requests from other agents."""
+            data = {}
             try:
-                data = await request.json()
+                data = orjson.loads(await request.read())
                 
                 # Parse MCP message
                 method = data.get("method")
@@ -472,8 +622,7 @@ class MCPProtocolClient:
                     result = await self._message_handlers[method](params)
                     
                     if message_id:  # Request expects response
-                        response = MCPResponse(id=message_id, result=result)
-                        return web.json_response(asdict(response))
+                        return json_response({"jsonrpc": "2.0", "result": result, "error": None, "id": message_id})
                     else:  # Notification
                         return web.Response(status=200)
                 else:
@@ -482,7 +631,7 @@ class MCPProtocolClient:
                         message=f"Method '{method}' not found"
                     )
                     response = MCPResponse(id=message_id, error=asdict(error))
-                    return web.json_response(asdict(response), status=400)
+                    return json_response(asdict(response), status=400)
                     
             except Exception as e:
                 error = MCPError(
@@ -490,7 +639,7 @@ class MCPProtocolClient:
                     message=str(e)
                 )
                 response = MCPResponse(id=data.get("id"), error=asdict(error))
-                return web.json_response(asdict(response), status=500)
+                return json_response(asdict(response), status=500)
         
         app = web.Application()
         app.router.add_post('/mcp', handle_mcp_request)
@@ -569,14 +718,37 @@ class MCPProtocolClient:
 
     async def close(self):
         """Close the client connections."""
-        if self._session:
-            await self._session.close()
-            self._session = None
+        if self._writer_task is not None:
+            if not self._writer_task.done() and self._writer_task.get_loop() is asyncio.get_running_loop():
+                # Deliver queued notifications before the session goes away
+                await self._notification_queue.join()
+                self._writer_task.cancel()
+            self._writer_task = None
+            self._notification_queue = None
+        
+        loop = asyncio.get_running_loop()
+        sessions, self._sessions = self._sessions, {}
+        for session_loop, session in sessions.items():
+            if session_loop is loop:
+                await session.close()
+            elif session_loop.is_running():
+                # A session has to be closed on the loop that created it
+                try:
+                    await asyncio.wait_for(
+                        asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), session_loop)),
+                        self.timeout
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to close HTTP session of another event loop: {e}")
         
         if self._websocket:
             await self._websocket.close()
             self._websocket = None
         
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        
         if self._core_client and hasattr(self._core_client, 'close'):
             await self._core_client.close()
             self._core_client = None
@@ -604,42 +776,64 @@ class MCPToolboxClient(MCPProtocolClient):
 class SyncMCPToolboxClient:
     """
     Synchronous wrapper around MCPProtocolClient for non-async environments.
+    
+    Calls run on a private event loop in a daemon thread, so the HTTP session
+    and its keep-alive connections are reused across calls.
     """
     
     def __init__(self, *args, **kwargs):
         self._async_client = MCPProtocolClient(*args, **kwargs)
+        # uvloop only for this private loop; the process-wide loop policy is left alone
+        self._loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="mcp-sync-client", daemon=True)
+        self._thread.start()
+    
+    def _run(self, coro) -> Any:
+        """Run a coroutine on the client loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
     
     def test_connection(self) -> bool:
         """Test connection to the MCP server."""
-        return asyncio.run(self._async_client.test_connection())
+        return self._run(self._async_client.test_connection())
     
     def register_with_server(self) -> bool:
         """Register this agent with the MCP server."""
-        return asyncio.run(self._async_client.register_with_server())
+        return self._run(self._async_client.register_with_server())
     
     def discover_agents(self) -> List[MCPAgent]:
         """Discover other agents for A2A communication."""
-        return asyncio.run(self._async_client.discover_agents())
+        return self._run(self._async_client.discover_agents())
     
     def call_agent(self, agent_id: str, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
         """Call another agent."""
-        return asyncio.run(self._async_client.call_agent(agent_id, method, params))
+        return self._run(self._async_client.call_agent(agent_id, method, params))
+    
+    def call_agents_batch(self, calls: List[Tuple[str, str, Optional[Dict[str, Any]]]]) -> List[Any]:
+        """Call several agents concurrently."""
+        return self._run(self._async_client.call_agents_batch(calls))
     
     def load_toolset(self, toolset_name: Optional[str] = None) -> List[Any]:
         """Load tools from a toolset."""
-        return asyncio.run(self._async_client.load_toolset(toolset_name))
+        return self._run(self._async_client.load_toolset(toolset_name))
     
     def load_langchain_tools(self, toolset_name: Optional[str] = None) -> List[Any]:
         """Load LangChain-compatible tools."""
-        return asyncio.run(self._async_client.load_langchain_tools(toolset_name))
+        return self._run(self._async_client.load_langchain_tools(toolset_name))
     
     def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
         """Call a tool using MCP protocol."""
-        return asyncio.run(self._async_client.call_tool(tool_name, arguments))
+        return self._run(self._async_client.call_tool(tool_name, arguments))
     
     def close(self):
-        """Close the client connections."""
-        asyncio.run(self._async_client.close())
+        """Close the client connections and stop the client loop."""
+        if self._loop.is_closed():
+            return
+        try:
+            self._run(self._async_client.close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
     
     def __enter__(self):
         """Context manager entry."""
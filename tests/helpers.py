@@ -0,0 +1,75 @@
+"""
+Shared test helpers.
+
+In-memory stand-ins for aiohttp client sessions and a route lookup for the
+agents' FastAPI apps, used by the client and agent test suites.
+"""
+
+import asyncio
+import json
+
+
+def get_route(app, path):
+    """Return the endpoint function registered for a path."""
+    for route in app.routes:
+        if getattr(route, "path", None) == path:
+            return route.endpoint
+    raise LookupError(path)
+
+
+class FakeResponse:
+    """aiohttp response stand-in."""
+
+    def __init__(self, status, payload):
+        self.status = status
+        self._body = json.dumps(payload).encode()
+
+    async def read(self):
+        return self._body
+
+    async def text(self):
+        return self._body.decode()
+
+
+class FakeRequest:
+    """Context manager returned by FakeSession.post; the server handles the body on enter."""
+
+    def __init__(self, session, body, position):
+        self.session = session
+        self.body = body
+        self.position = position
+
+    async def __aenter__(self):
+        if self.session.delay:
+            # Later requests are answered faster, so concurrent posts would arrive out of order
+            await asyncio.sleep(self.session.delay / self.position)
+        self.session.received.append(self.body)
+        return FakeResponse(*self.session.server(self.body))
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class FakeSession:
+    """
+    aiohttp.ClientSession stand-in routing posts to an in-memory server.
+
+    The server gets the decoded request body and returns (status, payload), or
+    raises to simulate a transport error. Bodies are recorded in send order
+    (`bodies`) and in the order the server handled them (`received`).
+    """
+
+    def __init__(self, server, delay=0.0):
+        self.server = server
+        self.delay = delay
+        self.bodies = []
+        self.received = []
+        self.closed = False
+
+    def post(self, url, data=None, headers=None):
+        body = json.loads(data)
+        self.bodies.append(body)
+        return FakeRequest(self, body, len(self.bodies))
+
+    async def close(self):
+        self.closed = True
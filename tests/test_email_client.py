@@ -0,0 +1,205 @@
+"""
+Test Suite for Email Agent Client
+
+Tests for single and batched JSON-RPC notifications against the two email
+agent server shapes: EmailAgent only accepts a JSON-RPC object, RealEmailAgent
+also accepts batch arrays. HTTP is replaced by an in-memory session.
+"""
+
+import pytest
+import asyncio
+import sys
+from unittest.mock import Mock
+from pathlib import Path
+
+# Add the project root to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import aiohttp
+from src.client import email_client
+from src.client.email_client import EmailAgentClient
+from tests.helpers import FakeSession
+
+
+def object_only_server(data):
+    """Mirror of EmailAgent._handle_agent_request: calls data.get() on the body."""
+    try:
+        return 200, {"jsonrpc": "2.0", "id": data.get("id"), "result": {"status": "sent", "params": data.get("params")}}
+    except Exception as e:
+        return 200, {"jsonrpc": "2.0", "error": {"code": -32603, "message": f"Internal error: {e}"}}
+
+
+def batch_server(data):
+    """Mirror of RealEmailAgent's /mcp/request: a batch array gets an array of replies."""
+    def reply(item):
+        return {"jsonrpc": "2.0", "id": item["id"], "result": {"status": "sent", "params": item["params"]}}
+
+    if isinstance(data, list):
+        return 200, [reply(item) for item in data]
+    return 200, reply(data)
+
+
+def make_client(server):
+    """EmailAgentClient whose session posts to an in-memory server."""
+    client = EmailAgentClient("http://localhost:8003")
+    client._session = FakeSession(server)
+    return client
+
+
+def notification(n):
+    """Params of one extraction notification."""
+    return {"extracted_data": [{"n": n}], "total_extractions": 1, "extraction_summary": f"run {n}"}
+
+
+class TestSingleNotification:
+    """Test cases for send_extraction_notification."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("server", [object_only_server, batch_server])
+    async def test_single_send_posts_plain_object(self, server):
+        """Test a single notification is a JSON-RPC object both servers accept."""
+        client = make_client(server)
+
+        result = await client.send_extraction_notification([{"n": 1}], 1, "run 1")
+
+        body = client._session.bodies[0]
+        assert isinstance(body, dict)
+        assert body["method"] == "send_extraction_notification"
+        assert result == {"status": "sent", "params": notification(1)}
+
+    @pytest.mark.asyncio
+    async def test_http_error_is_reported(self):
+        """Test a non-retryable HTTP error becomes an error result."""
+        client = make_client(lambda body: (404, {}))
+
+        result = await client.send_extraction_notification([], 0, "empty")
+
+        assert result["status"] == "error"
+        assert "404" in result["message"]
+
+
+class TestBatchNotification:
+    """Test cases for send_batch."""
+
+    @pytest.mark.asyncio
+    async def test_batch_results_follow_item_order(self):
+        """Test a batch is one array request whose replies are matched by id."""
+        def reversed_batch_server(body):
+            status, replies = batch_server(body)
+            return status, list(reversed(replies))
+
+        client = make_client(reversed_batch_server)
+
+        results = await client.send_batch([notification(1), notification(2), notification(3)])
+
+        assert len(client._session.bodies) == 1
+        assert isinstance(client._session.bodies[0], list)
+        assert [result["params"] for result in results] == [notification(1), notification(2), notification(3)]
+
+    @pytest.mark.asyncio
+    async def test_batch_against_object_only_server_reports_errors(self):
+        """Test a server rejecting arrays yields one error per item instead of raising."""
+        client = make_client(object_only_server)
+
+        results = await client.send_batch([notification(1), notification(2)])
+
+        assert [result["status"] for result in results] == ["error", "error"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("reply, message", [
+        ({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}}, "Parse error"),
+        ({"jsonrpc": "2.0", "id": None, "error": "Parse error"}, "Parse error"),
+        ({"jsonrpc": "2.0", "id": None, "error": None}, "Unexpected response to batch request"),
+        ("Parse error", "Unexpected response to batch request"),
+    ])
+    async def test_single_reply_to_batch_fails_every_item(self, reply, message):
+        """Test a non-array reply to a batch becomes one error per item instead of raising."""
+        client = make_client(lambda body: (200, reply))
+
+        results = await client.send_batch([notification(1), notification(2)])
+
+        assert results == [{"status": "error", "message": message}] * 2
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_sends_nothing(self):
+        """Test an empty batch makes no request."""
+        client = make_client(batch_server)
+
+        assert await client.send_batch([]) == []
+        assert client._session.bodies == []
+
+
+def scripted_server(*outcomes):
+    """Server failing with the given outcomes in turn, then answering like batch_server."""
+    remaining = list(outcomes)
+
+    def server(body):
+        if remaining:
+            outcome = remaining.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome, {}
+        return batch_server(body)
+
+    return server
+
+
+def connect_error():
+    """Failure to establish a connection (the request never left the client)."""
+    return aiohttp.ClientConnectorError(Mock(), OSError(111, "Connection refused"))
+
+
+class TestRetries:
+    """Test cases for EmailAgentClient._post retry rules."""
+
+    @pytest.fixture(autouse=True)
+    def no_backoff(self, monkeypatch):
+        """Retry immediately."""
+        monkeypatch.setattr(email_client, "EMAIL_CLIENT_RETRY_BACKOFF", 0)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("failure", [connect_error, lambda: 429, lambda: 503])
+    async def test_unprocessed_requests_are_retried(self, failure):
+        """Test refused connections and explicit 429/503 responses are retried."""
+        client = make_client(scripted_server(failure()))
+
+        result = await client.send_extraction_notification([{"n": 1}], 1, "run 1")
+
+        assert len(client._session.bodies) == 2
+        assert result["status"] == "sent"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("failure", [
+        lambda: aiohttp.ServerDisconnectedError(),
+        lambda: asyncio.TimeoutError(),
+        lambda: 500,
+        lambda: 502,
+    ])
+    async def test_possibly_processed_requests_are_not_replayed(self, failure):
+        """Test disconnects, timeouts and other 5xx responses are never resent."""
+        client = make_client(scripted_server(failure()))
+
+        result = await client.send_extraction_notification([{"n": 1}], 1, "run 1")
+
+        assert len(client._session.bodies) == 1
+        assert result["status"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_batch_is_not_replayed_after_disconnect(self):
+        """Test a batch interrupted after sending is reported failed, not sent twice."""
+        client = make_client(scripted_server(aiohttp.ServerDisconnectedError()))
+
+        results = await client.send_batch([notification(1), notification(2)])
+
+        assert len(client._session.bodies) == 1
+        assert [result["status"] for result in results] == ["error", "error"]
+
+    @pytest.mark.asyncio
+    async def test_retries_stop_after_max_attempts(self):
+        """Test a server that keeps refusing is tried max_retries times."""
+        client = make_client(scripted_server(*(connect_error() for _ in range(5))))
+
+        result = await client.send_extraction_notification([], 0, "empty")
+
+        assert len(client._session.bodies) == client.max_retries
+        assert result["status"] == "error"
@@ -0,0 +1,113 @@
+"""
+Test Suite for LangChain Tools Integration
+
+Tests for toolset loading and caching in MCPLangChainTools and the sync helper.
+The MCP client is mocked and hands out ready-made LangChain tools.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import Mock, AsyncMock
+import sys
+from pathlib import Path
+
+# Add the project root to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_core.tools import BaseTool
+from src.client.langchain_tools import MCPLangChainTools, create_langchain_tools_sync
+
+
+class StubTool(BaseTool):
+    """Minimal concrete LangChain tool handed out by the mocked client."""
+
+    description: str = "Stub tool for testing"
+
+    def _run(self, *args, **kwargs):
+        return "ok"
+
+
+def make_client(count=3):
+    """Mock MCP client whose toolset is `count` LangChain tools."""
+    tools = [StubTool(name=f"tool_{i}") for i in range(count)]
+    client = Mock(spec=["load_langchain_tools", "load_toolset", "test_connection"])
+    client.load_langchain_tools = AsyncMock(return_value=tools)
+    client.load_toolset = AsyncMock(return_value=[])
+    client.test_connection = AsyncMock(return_value=True)
+    return client
+
+
+class TestMCPLangChainTools:
+    """Test cases for toolset loading in MCPLangChainTools."""
+
+    @pytest.mark.asyncio
+    async def test_first_load_goes_straight_to_toolset(self):
+        """Test loading a toolset makes no separate connection round trip first."""
+        client = make_client()
+        factory = MCPLangChainTools(client)
+
+        tools = await factory.create_tools_from_toolset("default")
+
+        assert len(tools) == 3
+        client.test_connection.assert_not_awaited()
+        client.load_langchain_tools.assert_awaited_once_with("default")
+
+    @pytest.mark.asyncio
+    async def test_iterated_toolset_is_cached(self):
+        """Test a fully iterated toolset is reused by later loads."""
+        client = make_client()
+        factory = MCPLangChainTools(client)
+
+        streamed = [tool async for tool in factory.iter_tools_from_toolset("default")]
+        loaded = await factory.create_tools_from_toolset("default")
+
+        assert loaded == streamed
+        client.load_langchain_tools.assert_awaited_once_with("default")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_iteration_and_load_share_one_load(self):
+        """Test a load started during iteration waits for it instead of loading again."""
+        client = make_client()
+        factory = MCPLangChainTools(client)
+
+        async def stream():
+            return [tool async for tool in factory.iter_tools_from_toolset("default")]
+
+        streamed, loaded = await asyncio.gather(stream(), factory.create_tools_from_toolset("default"))
+
+        assert loaded == streamed
+        client.load_langchain_tools.assert_awaited_once_with("default")
+
+    @pytest.mark.asyncio
+    async def test_partial_iteration_is_not_cached(self):
+        """Test stopping iteration early leaves the toolset uncached."""
+        client = make_client()
+        factory = MCPLangChainTools(client)
+
+        iterator = factory.iter_tools_from_toolset("default")
+        await iterator.__anext__()
+        await iterator.aclose()
+        await factory.create_tools_from_toolset("default")
+
+        assert client.load_langchain_tools.await_count == 2
+
+
+class TestCreateLangChainToolsSync:
+    """Test cases for create_langchain_tools_sync."""
+
+    def test_repeated_calls_reuse_cached_toolset(self):
+        """Test the sync helper loads a client's toolset once across calls."""
+        client = make_client()
+
+        first = create_langchain_tools_sync(client, "default")
+        second = create_langchain_tools_sync(client, "default")
+
+        assert [tool.name for tool in second] == [tool.name for tool in first]
+        client.load_langchain_tools.assert_awaited_once_with("default")
+
+    def test_clients_do_not_share_factories(self):
+        """Test each client gets its own toolset cache."""
+        first, second = make_client(1), make_client(2)
+
+        assert len(create_langchain_tools_sync(first)) == 1
+        assert len(create_langchain_tools_sync(second)) == 2
@@ -0,0 +1,140 @@
+"""
+Test Suite for Database Workflow - Step Execution
+
+Tests for the sequential and async step nodes of the LangGraph workflow.
+The LLM and tool executor are mocked; prompts are keyed by step description.
+"""
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+import sys
+from pathlib import Path
+
+# Add the project root to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_core.messages import AIMessage
+from src.agents.legacy_workflow import DatabaseWorkflow
+
+
+STEP_RESPONSES = {
+    "inspect schema": "The schema is known, no tools are needed.",
+    "query sales": '[{"tool": "run_sql", "args": {"sql": "SELECT 1"}}]',
+    "summarize": '[{"tool": "run_sql", "args": {"sql": "SELECT 2"}}]',
+}
+
+
+def make_workflow(responses):
+    """DatabaseWorkflow with scripted step responses and a mocked tool executor."""
+    workflow = DatabaseWorkflow.__new__(DatabaseWorkflow)
+    workflow._tool_names = {"run_sql"}
+    workflow._prewarm_task = None
+    workflow._step_messages = lambda plan, step_count, description: description
+    workflow._tool_invocations = lambda calls: [(call["tool"], call.get("args", {})) for call in calls]
+    workflow._cached_invoke = Mock(side_effect=lambda description: AIMessage(content=responses[description]))
+    workflow._acached_invoke = AsyncMock(side_effect=lambda description: AIMessage(content=responses[description]))
+
+    workflow.tool_executor = Mock()
+    workflow.tool_executor.batch = Mock(side_effect=lambda invocations, return_exceptions: [
+        f"rows for {args['sql']}" for _, args in invocations
+    ])
+    workflow.tool_executor.ainvoke = AsyncMock(side_effect=lambda invocation: f"rows for {invocation[1]['sql']}")
+    return workflow
+
+
+def initial_state(steps):
+    """Workflow state right after planning."""
+    return {
+        "messages": [],
+        "error": None,
+        "intermediate_data": {
+            "step_count": 0,
+            "max_steps": len(steps),
+            "execution_plan": "plan",
+            "remaining_steps": list(steps),
+        },
+    }
+
+
+def merge(state, update):
+    """Apply a node update with the WorkflowState reducers."""
+    assert "error" not in update, update.get("error")
+    state["messages"] = state["messages"] + update.get("messages", [])
+    state["intermediate_data"] = state["intermediate_data"] | update.get("intermediate_data", {})
+
+
+def run_sequential(workflow, steps):
+    """Drive the sync step node until the router stops, as the graph does."""
+    state = initial_state(steps)
+    while True:
+        merge(state, workflow._execute_step(state))
+        if workflow._should_continue_execution(state) != "continue":
+            return state
+
+
+async def run_async(workflow, steps):
+    """Drive the async step node until the router stops, as the graph does."""
+    state = initial_state(steps)
+    while True:
+        merge(state, await workflow._aexecute_step(state))
+        if workflow._should_continue_execution(state) != "continue":
+            return state
+
+
+class TestAsyncStepExecution:
+    """Test cases for DatabaseWorkflow._aexecute_step."""
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_from_later_steps_are_executed(self):
+        """Test tool calls requested by a concurrently prompted later step are run."""
+        workflow = make_workflow(STEP_RESPONSES)
+
+        state = await run_async(workflow, ["inspect schema", "query sales", "summarize"])
+        data = state["intermediate_data"]
+
+        workflow.tool_executor.ainvoke.assert_awaited_once_with(("run_sql", {"sql": "SELECT 1"}))
+        assert data["step_1_results"] == [{"tool": "run_sql", "output": "rows for SELECT 1"}]
+        assert data["tool_calls_done"] is True
+        assert data["remaining_steps"] == ["summarize"]
+
+    @pytest.mark.asyncio
+    async def test_matches_sequential_execution(self):
+        """Test the async path records the same steps and tool results as the sync path."""
+        steps = ["inspect schema", "query sales", "summarize"]
+
+        sequential = run_sequential(make_workflow(STEP_RESPONSES), steps)
+        concurrent = await run_async(make_workflow(STEP_RESPONSES), steps)
+
+        assert concurrent["intermediate_data"] == sequential["intermediate_data"]
+        assert [m.content for m in concurrent["messages"]] == [m.content for m in sequential["messages"]]
+
+    @pytest.mark.asyncio
+    async def test_steps_without_tool_calls_are_all_recorded(self):
+        """Test a plan with no tool calls records every step in one pass."""
+        responses = {"first": "nothing to run", "second": "still nothing"}
+        workflow = make_workflow(responses)
+
+        state = await run_async(workflow, ["first", "second"])
+        data = state["intermediate_data"]
+
+        assert data["step_count"] == 2
+        assert data["step_1_result"] == "still nothing"
+        assert data["remaining_steps"] == []
+        workflow.tool_executor.ainvoke.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_first_step_tool_calls_run_concurrently(self):
+        """Test a first step asking for several tools runs them as one set."""
+        responses = {
+            "query": '[{"tool": "run_sql", "args": {"sql": "A"}}, {"tool": "run_sql", "args": {"sql": "B"}},'
+                     ' {"tool": "unknown_tool", "args": {}}]',
+        }
+        workflow = make_workflow(responses)
+
+        state = await run_async(workflow, ["query"])
+
+        assert workflow.tool_executor.ainvoke.await_count == 2
+        assert state["intermediate_data"]["step_0_results"] == [
+            {"tool": "run_sql", "output": "rows for A"},
+            {"tool": "run_sql", "output": "rows for B"},
+        ]
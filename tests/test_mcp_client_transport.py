@@ -0,0 +1,123 @@
+"""
+Test Suite for MCP Protocol Client - HTTP Transport
+
+Tests for the per-loop HTTP sessions, agent requests and the notification
+writer. HTTP is replaced by in-memory sessions; no server is needed.
+"""
+
+import pytest
+import asyncio
+import threading
+import sys
+from pathlib import Path
+
+# Add the project root to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.client.mcp_client import MCPProtocolClient
+from tests.helpers import FakeSession
+
+
+def make_client(session):
+    """MCPProtocolClient whose HTTP session on the running loop is `session`."""
+    client = MCPProtocolClient("http://localhost:5000")
+    client._sessions[asyncio.get_running_loop()] = session
+    return client
+
+
+@pytest.fixture
+def other_loop():
+    """Event loop running in a background thread, as used by the sync wrappers."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+class TestSessions:
+    """Test cases for the per-loop HTTP sessions."""
+
+    @pytest.mark.asyncio
+    async def test_session_is_reused_on_the_same_loop(self):
+        """Test repeated requests on one loop share a session."""
+        client = MCPProtocolClient("http://localhost:5000")
+
+        assert client._get_session() is client._get_session()
+
+    @pytest.mark.asyncio
+    async def test_close_closes_sessions_of_every_loop(self, other_loop):
+        """Test a session created on another loop is kept and closed, not dropped."""
+        client = MCPProtocolClient("http://localhost:5000")
+
+        async def get_session():
+            return client._get_session()
+
+        other = asyncio.run_coroutine_threadsafe(get_session(), other_loop).result(timeout=1)
+        own = client._get_session()
+
+        assert own is not other
+        assert asyncio.run_coroutine_threadsafe(get_session(), other_loop).result(timeout=1) is other
+
+        await client.close()
+
+        assert own.closed
+        assert other.closed
+
+
+class TestAgentRequests:
+    """Test cases for direct agent-to-agent requests."""
+
+    @pytest.mark.asyncio
+    async def test_null_error_member_is_a_success(self):
+        """Test a reply carrying "error": null returns its result."""
+        session = FakeSession(lambda body: (200, {"jsonrpc": "2.0", "id": body["id"], "result": {"ok": True}, "error": None}))
+        client = make_client(session)
+
+        result = await client._send_agent_request("http://localhost:8003", "ping", {})
+
+        assert result == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_error_reply_raises(self):
+        """Test a reply with an error object raises."""
+        session = FakeSession(lambda body: (200, {"jsonrpc": "2.0", "id": body["id"], "error": {"code": -32601, "message": "no"}}))
+        client = make_client(session)
+
+        with pytest.raises(Exception):
+            await client._send_agent_request("http://localhost:8003", "ping", {})
+
+
+class TestNotifications:
+    """Test cases for queued MCP notifications."""
+
+    @pytest.mark.asyncio
+    async def test_notifications_arrive_in_send_order(self):
+        """Test queued notifications reach the server in the order they were sent."""
+        session = FakeSession(lambda body: (200, {}), delay=0.02)
+        client = make_client(session)
+
+        for i in range(5):
+            await client.send_mcp_notification("progress", {"step": i})
+        await client.close()
+
+        assert [body["params"]["step"] for body in session.received] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_failed_notification_does_not_stop_writer(self):
+        """Test a notification that fails to post is skipped and later ones still go out."""
+        def server(body):
+            if body["params"]["step"] == 0:
+                raise ConnectionError("refused")
+            return 200, {}
+
+        session = FakeSession(server)
+        client = make_client(session)
+
+        await client.send_mcp_notification("progress", {"step": 0})
+        await client.send_mcp_notification("progress", {"step": 1})
+        await client.close()
+
+        assert [body["params"]["step"] for body in session.received] == [0, 1]
@@ -0,0 +1,48 @@
+"""
+Test Suite for PostgreSQL Database Agent
+
+Tests for the storage backend binding used by the HTTP routes.
+"""
+
+import pytest
+import json
+from unittest.mock import Mock, AsyncMock
+import sys
+from pathlib import Path
+
+# Add the project root to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agents.postgresql_database_agent import PostgreSQLDatabaseAgent
+from tests.helpers import get_route
+
+
+class TestPostgreSQLDatabaseAgent:
+    """Test cases for PostgreSQLDatabaseAgent."""
+
+    @pytest.fixture
+    def agent(self):
+        """Create agent instance for testing."""
+        return PostgreSQLDatabaseAgent(Mock(), "http://localhost:5000", 8002)
+
+    @pytest.mark.asyncio
+    async def test_data_route_uses_bound_fetcher(self, agent):
+        """Test /data serves the document from the bound backend without a pool check."""
+        body = '{"data": [], "count": 0}'
+        agent._fetch_all_json = AsyncMock(return_value=body)
+
+        response = await get_route(agent.app, "/data")()
+
+        assert response.body == body.encode()
+        assert response.media_type == "application/json"
+        agent._fetch_all_json.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_sqlite_fetcher_encodes_document(self, agent):
+        """Test the SQLite backend produces the same document shape as PostgreSQL."""
+        rows = [{"id": "a", "source": "test"}, {"id": "b", "source": "test"}]
+        agent._fetch_all_sqlite = AsyncMock(return_value=rows)
+
+        body = await agent._fetch_all_json_sqlite()
+
+        assert json.loads(body) == {"data": rows, "count": 2}
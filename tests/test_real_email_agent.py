@@ -0,0 +1,389 @@
+"""
+Test Suite for Real Email Agent - SMTP Delivery
+
+Tests for the pooled SMTP connections and the send paths built on them.
+SMTP servers are replaced by mocks; no network access is needed.
+"""
+
+import pytest
+import asyncio
+import dataclasses
+from unittest.mock import Mock, AsyncMock
+from fastapi import BackgroundTasks, HTTPException
+import sys
+from pathlib import Path
+
+# Add the project root to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import aiosmtplib
+from src.agents import real_email_agent
+from src.agents.real_email_agent import RealEmailAgent, PooledSMTPConnection
+from tests.helpers import get_route
+
+
+def make_request(body: bytes):
+    """Mock FastAPI request carrying a raw body."""
+    request = Mock()
+    request.body = AsyncMock(return_value=body)
+    return request
+
+
+def make_server():
+    """Mock authenticated aiosmtplib.SMTP connection."""
+    server = Mock()
+    server.send_message = AsyncMock()
+    server.noop = AsyncMock()
+    server.rset = AsyncMock()
+    server.quit = AsyncMock()
+    return server
+
+
+class TestSMTPConnectionPool:
+    """Test cases for SMTP connection reuse."""
+
+    @pytest.fixture
+    def servers(self):
+        """Connections handed out by the mocked connection factory, in order."""
+        return []
+
+    @pytest.fixture
+    def agent(self, servers):
+        """Create an SMTP-configured agent whose connections are mocks."""
+        agent = RealEmailAgent(Mock(), "http://localhost:5000/mcp")
+        agent.smtp_config = dataclasses.replace(
+            agent.smtp_config, provider="test", smtp_server="smtp.test", smtp_port=587,
+            email_user="agent@test", email_password="secret", configured=True
+        )
+
+        async def open_connection():
+            server = make_server()
+            servers.append(server)
+            return PooledSMTPConnection(server)
+
+        agent._open_smtp_connection = AsyncMock(side_effect=open_connection)
+        return agent
+
+    @pytest.mark.asyncio
+    async def test_sequential_sends_reuse_connection(self, agent, servers):
+        """Test consecutive sends share one authenticated connection."""
+        for i in range(3):
+            result = await agent.send_email_smtp(f"user{i}@test", "Subject", "<p>Body</p>")
+            assert result["sent"] is True
+
+        assert agent._open_smtp_connection.await_count == 1
+        assert servers[0].send_message.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_connection_recycled_after_message_limit(self, agent, servers, monkeypatch):
+        """Test a connection is closed once it has carried the per-connection maximum."""
+        monkeypatch.setattr(real_email_agent, "SMTP_MAX_MESSAGES_PER_CONNECTION", 2)
+
+        for i in range(3):
+            await agent.send_email_smtp(f"user{i}@test", "Subject", "<p>Body</p>")
+
+        assert agent._open_smtp_connection.await_count == 2
+        servers[0].quit.assert_awaited_once()
+        assert servers[1].send_message.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_dead_idle_connection_is_replaced(self, agent, servers):
+        """Test an idle connection failing NOOP is dropped instead of reused."""
+        await agent.send_email_smtp("first@test", "Subject", "<p>Body</p>")
+        servers[0].noop.side_effect = aiosmtplib.SMTPServerDisconnected("gone")
+
+        result = await agent.send_email_smtp("second@test", "Subject", "<p>Body</p>")
+
+        assert result["sent"] is True
+        assert agent._open_smtp_connection.await_count == 2
+        assert servers[1].send_message.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_disconnect_during_send_retries_on_fresh_connection(self, agent, servers, monkeypatch):
+        """Test a send dropped by the server is retried once on a new connection."""
+        monkeypatch.setattr(real_email_agent, "SMTP_RECONNECT_BACKOFF", 0)
+        await agent.send_email_smtp("first@test", "Subject", "<p>Body</p>")
+        servers[0].send_message.side_effect = aiosmtplib.SMTPServerDisconnected("dropped")
+
+        result = await agent.send_email_smtp("second@test", "Subject", "<p>Body</p>")
+
+        assert result["sent"] is True
+        assert len(servers) == 2
+        assert servers[1].send_message.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sends_respect_connection_cap(self, agent, servers, monkeypatch):
+        """Test concurrent sends never open more connections than SMTP_WORKERS allows."""
+        agent._smtp_slots = asyncio.Semaphore(2)
+        active = 0
+        peak = 0
+
+        async def slow_send(message):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        async def open_connection():
+            server = make_server()
+            server.send_message = AsyncMock(side_effect=slow_send)
+            servers.append(server)
+            return PooledSMTPConnection(server)
+
+        agent._open_smtp_connection = AsyncMock(side_effect=open_connection)
+
+        results = await asyncio.gather(*(
+            agent.send_email_smtp(f"user{i}@test", "Subject", "<p>Body</p>") for i in range(6)
+        ))
+
+        assert all(result["sent"] for result in results)
+        assert peak <= 2
+        assert len(servers) <= 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_prewarms_open_one_connection(self, agent, servers):
+        """Test a burst of notifications prewarms a single connection."""
+        await asyncio.gather(*(agent._prewarm_smtp() for _ in range(10)))
+
+        assert agent._open_smtp_connection.await_count == 1
+        assert agent._idle_smtp_pool().qsize() == 1
+
+    @pytest.mark.asyncio
+    async def test_prewarm_skipped_when_slots_busy(self, agent):
+        """Test prewarming does not open a connection beyond the SMTP_WORKERS cap."""
+        agent._smtp_slots = asyncio.Semaphore(1)
+
+        async with agent._smtp_slots:
+            await agent._prewarm_smtp()
+
+        agent._open_smtp_connection.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_bulk_send_rejects_empty_recipients(self, agent):
+        """Test a bulk send with no recipients is reported as not sent."""
+        result = await agent.send_bulk([], "Subject", "<p>Body</p>")
+
+        assert result["sent"] is False
+        agent._open_smtp_connection.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_bulk_send_waits_for_send_slot(self, agent, servers):
+        """Test bulk sends count against the in-flight send cap."""
+        agent._send_slots = asyncio.Semaphore(1)
+
+        async with agent._send_slots:
+            task = asyncio.ensure_future(agent.send_bulk(["a@test"], "Subject", "<p>Body</p>"))
+            await asyncio.sleep(0.01)
+            assert not task.done()
+            assert not servers
+
+        result = await task
+        assert result["sent"] is True
+
+    @pytest.mark.asyncio
+    async def test_bulk_send_resumes_after_disconnect(self, agent, servers, monkeypatch):
+        """Test chunks left after a dropped connection are sent once on a new one."""
+        monkeypatch.setattr(real_email_agent, "SMTP_BULK_CHUNK_SIZE", 2)
+        monkeypatch.setattr(real_email_agent, "SMTP_RECONNECT_BACKOFF", 0)
+        calls = []
+
+        async def open_connection():
+            server = make_server()
+            first = not servers
+
+            async def send_message(message, recipients):
+                if first and calls:
+                    raise aiosmtplib.SMTPServerDisconnected("dropped")
+                calls.append(list(recipients))
+
+            server.send_message = AsyncMock(side_effect=send_message)
+            servers.append(server)
+            return PooledSMTPConnection(server)
+
+        agent._open_smtp_connection = AsyncMock(side_effect=open_connection)
+        recipients = [f"user{i}@test" for i in range(5)]
+
+        result = await agent.send_bulk(recipients, "Subject", "<p>Body</p>")
+
+        assert result["sent"] is True
+        assert len(servers) == 2
+        assert calls == [recipients[0:2], recipients[2:4], recipients[4:5]]
+
+    @pytest.mark.asyncio
+    async def test_rejected_message_fails_only_itself(self, agent, servers):
+        """Test a recipient refused mid-batch fails that send and the rest are still delivered."""
+        async def send_message(message):
+            if message["To"] == "bad@test":
+                raise aiosmtplib.SMTPRecipientsRefused(
+                    [aiosmtplib.SMTPRecipientRefused(550, "No such user", "bad@test")]
+                )
+
+        async def open_connection():
+            server = make_server()
+            server.send_message = AsyncMock(side_effect=send_message)
+            servers.append(server)
+            return PooledSMTPConnection(server)
+
+        agent._open_smtp_connection = AsyncMock(side_effect=open_connection)
+        loop = asyncio.get_running_loop()
+        batch = [
+            (recipient, "Subject", agent._build_message(recipient, "Subject", "<p>Body</p>"), loop.create_future())
+            for recipient in ["a@test", "bad@test", "c@test"]
+        ]
+
+        await agent._deliver_batch(batch)
+
+        assert [item[3].result()["sent"] for item in batch] == [True, False, True]
+        assert len(servers) == 1
+        assert servers[0].send_message.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_spooled_sends_use_several_connections(self, agent, servers):
+        """Test the spooler delivers a burst over more than one pooled connection."""
+        async def slow_send(message):
+            await asyncio.sleep(0.01)
+
+        async def open_connection():
+            server = make_server()
+            server.send_message = AsyncMock(side_effect=slow_send)
+            servers.append(server)
+            return PooledSMTPConnection(server)
+
+        agent._open_smtp_connection = AsyncMock(side_effect=open_connection)
+        start = next(h for h in agent.app.router.on_startup if h.__name__ == "start_mail_spooler")
+        stop = next(h for h in agent.app.router.on_shutdown if h.__name__ == "stop_mail_spooler")
+        await start()
+
+        results = await asyncio.gather(*(
+            agent.send_email_smtp(f"user{i}@test", "Subject", "<p>Body</p>") for i in range(20)
+        ))
+        await stop()
+
+        assert all(result["sent"] for result in results)
+        assert 1 < len(servers) <= real_email_agent.SMTP_MAX_ACTIVE_CONNECTIONS
+
+    @pytest.mark.asyncio
+    async def test_spooler_shutdown_fails_waiting_sends(self, agent):
+        """Test stopping the spooler resolves every queued and in-flight send."""
+        delivering = asyncio.Event()
+
+        async def stuck_delivery(batch):
+            delivering.set()
+            await asyncio.Event().wait()
+
+        agent._deliver_batch = stuck_delivery
+        agent._mail_q = asyncio.Queue()
+        agent._mail_workers = [asyncio.ensure_future(agent._mail_worker())]
+
+        in_flight = asyncio.ensure_future(agent._spool_email("first@test", "Subject", "<p>Body</p>"))
+        await asyncio.wait_for(delivering.wait(), timeout=1)
+        queued = [
+            asyncio.ensure_future(agent._spool_email(f"user{i}@test", "Subject", "<p>Body</p>"))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0)
+
+        stop = next(h for h in agent.app.router.on_shutdown if h.__name__ == "stop_mail_spooler")
+        await stop()
+
+        done, pending = await asyncio.wait([in_flight, *queued], timeout=1)
+        assert not pending
+        assert all(isinstance(task.exception(), RuntimeError) for task in done)
+
+
+class TestExtractionNotification:
+    """Test cases for send_extraction_notification."""
+
+    @pytest.fixture
+    def agent(self):
+        """Create an agent whose content generation and sending are mocked."""
+        agent = RealEmailAgent(Mock(), "http://localhost:5000/mcp")
+        agent.generate_email_subject = AsyncMock(return_value="Subject")
+        agent.generate_email_body = AsyncMock(return_value="<p>Generated</p>")
+        agent.generate_fallback_email_body = Mock(return_value="<p>Template</p>")
+        agent._prewarm_smtp = AsyncMock()
+        agent.send_email_smtp = AsyncMock(return_value={"sent": True, "method": "test"})
+        return agent
+
+    @pytest.mark.asyncio
+    async def test_data_uses_generated_body(self, agent):
+        """Test an extraction with data is sent with the generated body."""
+        result = await agent.send_extraction_notification([{"n": 1}], {}, "a@test")
+
+        assert result["status"] == "success"
+        agent.send_email_smtp.assert_awaited_once_with(recipient="a@test", subject="Subject", html_body="<p>Generated</p>")
+        agent.generate_fallback_email_body.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_empty_extraction_uses_template_body(self, agent):
+        """Test an empty extraction is sent with the template body without generating one."""
+        result = await agent.send_extraction_notification([], {}, "a@test")
+
+        assert result["status"] == "success"
+        agent.send_email_smtp.assert_awaited_once_with(recipient="a@test", subject="Subject", html_body="<p>Template</p>")
+        agent.generate_email_body.assert_not_awaited()
+        agent._prewarm_smtp.assert_awaited_once()
+
+
+class TestSendEmailEndpoint:
+    """Test cases for the /send-email route."""
+
+    @pytest.fixture
+    def agent(self):
+        """Create agent instance for testing."""
+        return RealEmailAgent(Mock(), "http://localhost:5000/mcp")
+
+    @pytest.mark.asyncio
+    async def test_valid_request_is_queued(self, agent):
+        """Test a valid request schedules the send and reports it as queued."""
+        background = BackgroundTasks()
+        endpoint = get_route(agent.app, "/send-email")
+
+        result = await endpoint(make_request(b'{"extracted_data": [], "recipient": "a@test"}'), background)
+
+        assert result["status"] == "queued"
+        assert len(background.tasks) == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_is_rejected(self, agent):
+        """Test a malformed body fails with 400 instead of a 202 error payload."""
+        endpoint = get_route(agent.app, "/send-email")
+
+        with pytest.raises(HTTPException) as excinfo:
+            await endpoint(make_request(b"{not json"), BackgroundTasks())
+
+        assert excinfo.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_non_object_body_is_rejected(self, agent):
+        """Test a JSON body that is not an object fails with 400."""
+        endpoint = get_route(agent.app, "/send-email")
+
+        with pytest.raises(HTTPException) as excinfo:
+            await endpoint(make_request(b"[1, 2]"), BackgroundTasks())
+
+        assert excinfo.value.status_code == 400
+
+
+class TestCreateApp:
+    """Test cases for the multi-worker app factory."""
+
+    @pytest.mark.asyncio
+    async def test_startup_does_not_wait_for_hub_registration(self, monkeypatch):
+        """Test worker startup returns while hub registration is still retrying."""
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def register_with_hub(self):
+            started.set()
+            await release.wait()
+            return True
+
+        monkeypatch.setattr(real_email_agent, "_create_llm", lambda api_key=None: Mock())
+        monkeypatch.setattr(RealEmailAgent, "register_with_hub", register_with_hub)
+        app = real_email_agent.create_app()
+
+        await asyncio.wait_for(app.router.on_startup[-1](), timeout=1)
+        await asyncio.wait_for(started.wait(), timeout=1)
+        await app.router.on_shutdown[-1]()